@@ -4,25 +4,120 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN
-from .coordinator import FortniteDataUpdateCoordinator
+from .api import async_get_api_client, async_release_api_client
+from .const import (
+    CONF_API_KEY,
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    CONF_API_KEYS,
+    CONF_DAILY_QUOTA,
+    CONF_ENTITY_BATCH_SIZE,
+    CONF_ENTRY_TYPE,
+    CONF_NEGATIVE_CACHE_TTL,
+    CONF_PLAYER_ID,
+    CONF_PLAYERS,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_SIGNIFICANCE_THRESHOLDS,
+    DATA_DOMAIN_CONFIG,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL,
+    DEFAULT_ENTITY_BATCH_SIZE,
+    DEFAULT_NEGATIVE_CACHE_TTL,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DOMAIN,
+    ENTRY_TYPE_ROSTER,
+    SENSOR_DATA_KEYS,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from .coordinator import FortniteDataUpdateCoordinator, snapshot_storage_key
+from .quota import async_get_quota_accountant
+from .roster import FortniteRoster
+from .scheduler import async_get_poll_scheduler
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+# Optional domain-wide settings shared by every config entry
+DOMAIN_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_RATE_LIMIT, default=DEFAULT_RATE_LIMIT): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1)
+        ),
+        vol.Optional(CONF_RATE_BURST, default=DEFAULT_RATE_BURST): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        # Interval bounds, in seconds, for entries using adaptive polling
+        vol.Optional(
+            CONF_ADAPTIVE_MIN_INTERVAL, default=DEFAULT_ADAPTIVE_MIN_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=30)),
+        vol.Optional(
+            CONF_ADAPTIVE_MAX_INTERVAL, default=DEFAULT_ADAPTIVE_MAX_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+        # Seconds to remember bad key, private stats and unknown player answers
+        vol.Optional(CONF_NEGATIVE_CACHE_TTL, default=DEFAULT_NEGATIVE_CACHE_TTL): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        # Extra keys requests are rotated over, together with the entry keys
+        vol.Optional(CONF_API_KEYS, default=[]): vol.All(cv.ensure_list, [cv.string]),
+        # Requests per API key and UTC day - poll intervals are stretched to fit
+        vol.Optional(CONF_DAILY_QUOTA): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        # Entities registered per batch when a platform is set up
+        vol.Optional(CONF_ENTITY_BATCH_SIZE, default=DEFAULT_ENTITY_BATCH_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        # Minimum change, in sensor units, before a sensor state is written
+        vol.Optional(CONF_SIGNIFICANCE_THRESHOLDS, default={}): {
+            vol.In(list(SENSOR_DATA_KEYS)): vol.All(vol.Coerce(float), vol.Range(min=0))
+        },
+    }
+)
+
+CONFIG_SCHEMA = vol.Schema({DOMAIN: DOMAIN_SCHEMA}, extra=vol.ALLOW_EXTRA)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the domain-wide Fortnite Stats settings."""
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][DATA_DOMAIN_CONFIG] = config.get(DOMAIN) or DOMAIN_SCHEMA({})
+    await async_get_quota_accountant(hass).async_load()
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Fortnite Stats from a config entry."""
-    coordinator = FortniteDataUpdateCoordinator(hass, entry)
-    
-    # Fetch initial data so we have data when entities are added
-    await coordinator.async_config_entry_first_refresh()
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_ROSTER:
+        return await _async_setup_roster_entry(hass, entry)
+
+    # Polls are due at the entry's phase, so entries don't all poll at once
+    coordinator = FortniteDataUpdateCoordinator(
+        hass,
+        entry,
+        async_get_api_client(hass),
+        poll_offset=await async_get_poll_scheduler(hass).async_offset(entry.entry_id),
+    )
+
+    # With a snapshot, the last known data is served until the first poll
+    if not await coordinator.async_load_snapshot():
+        # Fetch initial data so we have data when entities are added
+        await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(coordinator.async_cancel_revalidation)
+    _async_track_quota(hass, entry, 1)
+    if coordinator.long_term_statistics:
+        entry.async_on_unload(coordinator.async_track_statistics())
     
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -33,9 +128,57 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def _async_setup_roster_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up a roster entry tracking many players."""
+    roster = FortniteRoster(hass, entry, async_get_api_client(hass))
+
+    # Never block setup on the API for a whole roster - players without a
+    # snapshot are fetched in the background, a few at a time
+    if missing := await roster.async_load_snapshots():
+        entry.async_create_background_task(
+            hass,
+            roster.async_refresh_players(missing),
+            f"{DOMAIN} roster refresh {entry.entry_id}",
+        )
+    entry.async_on_unload(roster.async_start())
+    _async_track_quota(hass, entry, len(roster.coordinators))
+
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][entry.entry_id] = roster
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    return True
+
+
+@callback
+def _async_track_quota(hass: HomeAssistant, entry: ConfigEntry, players: int) -> None:
+    """Count the players of an entry against the daily quota of its key."""
+    quota = async_get_quota_accountant(hass)
+    quota.track(entry.entry_id, entry.data[CONF_API_KEY], players)
+    entry.async_on_unload(lambda: quota.untrack(entry.entry_id))
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
 
+        # Close the shared connection pool once the last entry is gone
+        if not any(
+            isinstance(value, (FortniteDataUpdateCoordinator, FortniteRoster))
+            for value in hass.data[DOMAIN].values()
+        ):
+            await async_release_api_client(hass)
+
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the data persisted for a config entry."""
+    await async_get_poll_scheduler(hass).async_remove(entry.entry_id)
+    player_ids = entry.data.get(CONF_PLAYERS) or [entry.data[CONF_PLAYER_ID]]
+    for player_id in player_ids:
+        await Store(
+            hass, SNAPSHOT_STORAGE_VERSION, snapshot_storage_key(entry, player_id)
+        ).async_remove()
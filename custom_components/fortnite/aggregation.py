@@ -0,0 +1,88 @@
+"""Aggregated stats for Fortnite Stats, computed once per coordinator refresh."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import AGGREGATED_SELECTIONS, SENSOR_DATA_KEYS
+
+
+def distinct_inputs(platforms: list[str]) -> list[str]:
+    """Return the inputs to sum over, without double counting.
+
+    The "all" input already totals the others, so it only counts when it
+    is the only input configured.
+    """
+    return [platform for platform in platforms if platform != "all"] or list(platforms)
+
+
+def aggregate_stats(
+    data: dict[str, Any], platforms: list[str], game_modes: list[str]
+) -> dict[str, dict[str, float | int]]:
+    """Compute every aggregated sensor value once per refresh.
+
+    Returns a table of aggregated type -> sensor key -> value.
+    """
+    inputs = distinct_inputs(platforms)
+    result = {}
+    for aggregated_type, (bucket_platforms, bucket_modes) in AGGREGATED_SELECTIONS.items():
+        cells = [
+            (data.get(platform) or {}).get(mode) or {}
+            for platform in bucket_platforms or inputs
+            for mode in bucket_modes or game_modes
+        ]
+        totals = {
+            data_key: sum(cell.get(data_key) or 0 for cell in cells)
+            for data_key in SENSOR_DATA_KEYS.values()
+        }
+        values = {
+            sensor_key: totals[data_key] for sensor_key, data_key in SENSOR_DATA_KEYS.items()
+        }
+
+        # Win rate and K/D are weighted averages, not sums
+        matches, wins, kills = totals["matches"], totals["top1"], totals["kills"]
+        # Estimate deaths: matches - wins
+        deaths = matches - wins
+        values["win_rate"] = round((wins / matches) * 100, 1) if matches > 0 else 0.0
+        values["kd"] = round(kills / deaths, 3) if deaths > 0 else 0.0
+        result[aggregated_type] = values
+    return result
+
+
+def mode_sensor_value(mode_data: dict[str, Any], sensor_key: str) -> float | int:
+    """Return the state of a per-mode sensor from its transformed mode data."""
+    value = mode_data.get(SENSOR_DATA_KEYS[sensor_key])
+    if value is None:
+        return 0
+
+    # Handle special cases
+    if sensor_key == "win_rate":
+        # Convert decimal to percentage
+        return round(value * 100, 1)
+    if sensor_key == "kd":
+        return round(value, 3)
+    return value
+
+
+def sensor_states(
+    data: dict[str, Any], platforms: list[str], game_modes: list[str]
+) -> dict[tuple[str, ...], float | int]:
+    """Return every sensor state keyed by the sensor's coordinator context.
+
+    Per-mode sensors use (platform, mode, sensor key), aggregated sensors
+    use (aggregated type, sensor key) and rate sensors use ("rates", key).
+    """
+    states: dict[tuple[str, ...], float | int] = {}
+    for platform in platforms:
+        platform_data = data.get(platform) or {}
+        for mode in game_modes:
+            mode_data = platform_data.get(mode) or {}
+            for sensor_key in SENSOR_DATA_KEYS:
+                states[(platform, mode, sensor_key)] = mode_sensor_value(
+                    mode_data, sensor_key
+                )
+    for aggregated_type, values in data.get("aggregated", {}).items():
+        for sensor_key, value in values.items():
+            states[(aggregated_type, sensor_key)] = value
+    for rate_key, value in data.get("rates", {}).items():
+        states[("rates", rate_key)] = value
+    return states
@@ -0,0 +1,362 @@
+"""Shared fortnite-api.com client for the Fortnite Stats integration."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+import logging
+import time
+from typing import Any
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import aiohttp_client
+
+from .cache import SingleFlightCache
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    API_REQUEST_TIMEOUT,
+    CONF_API_KEYS,
+    CONF_NEGATIVE_CACHE_TTL,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    DATA_API_CLIENT,
+    DATA_DOMAIN_CONFIG,
+    DEFAULT_NEGATIVE_CACHE_TTL,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DOMAIN,
+    KEY_FAILURE_STATUSES,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_TTL,
+)
+from .key_pool import ApiKeyPool
+from .quota import QuotaAccountant, async_get_quota_accountant
+from .rate_limit import TokenBucket
+
+_LOGGER = logging.getLogger(__name__)
+
+STATS_URL = "https://fortnite-api.com/v2/stats/br/v2"
+
+# Bad key, private stats or unknown player - retrying won't help for a while
+NEGATIVE_CACHE_STATUSES = (401, 403, 404)
+
+
+class FortniteApiError(Exception):
+    """Error talking to fortnite-api.com."""
+
+    def __init__(
+        self, message: str, status: int | None = None, retry_after: float | None = None
+    ) -> None:
+        """Initialize the error with the HTTP status and Retry-After, if any."""
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(FortniteApiError):
+    """Request not sent because the endpoint's circuit breaker is open."""
+
+
+@dataclass
+class StatsResponse:
+    """Stats payload plus the HTTP validators needed for conditional requests."""
+
+    data: dict[str, Any] | None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        """Return True if the server answered 304 Not Modified."""
+        return self.data is None
+
+
+class FortniteApiClient:
+    """One pooled keep-alive HTTP client shared by every config entry and the config flow."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rate: float = DEFAULT_RATE_LIMIT,
+        burst: int = DEFAULT_RATE_BURST,
+        negative_cache_ttl: float = DEFAULT_NEGATIVE_CACHE_TTL,
+        quota: QuotaAccountant | None = None,
+        key_pool: ApiKeyPool | None = None,
+    ) -> None:
+        """Initialize the client."""
+        self.hass = hass
+        self.quota = quota
+        self.key_pool = key_pool or ApiKeyPool([], quota)
+        self.rate_limiter = TokenBucket(rate, burst)
+        self.negative_cache_ttl = negative_cache_ttl
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._negative_cache: dict[tuple[str, ...], tuple[float, FortniteApiError]] = {}
+        self._response_cache: SingleFlightCache[StatsResponse] = SingleFlightCache(
+            RESPONSE_CACHE_TTL,
+            RESPONSE_CACHE_SIZE,
+            cache_if=lambda response: not response.not_modified,
+        )
+        self._session: aiohttp.ClientSession | None = None
+        self._unsub_close: CALLBACK_TYPE | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the session, creating it on first use.
+
+        It runs on Home Assistant's shared keep-alive connector, with its
+        user agent and SSL context. The client outlives any one entry, so
+        the session is detached by async_close rather than on entry unload.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp_client.async_create_clientsession(
+                self.hass,
+                auto_cleanup=False,
+                timeout=aiohttp.ClientTimeout(total=API_REQUEST_TIMEOUT),
+            )
+        return self._session
+
+    async def async_get_stats(
+        self,
+        api_key: str,
+        player_id: str,
+        account_type: str = "epic",
+        time_window: str = "lifetime",
+        priority: int = PRIORITY_BACKGROUND,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        pooled: bool = True,
+        newer_than: float | None = None,
+    ) -> StatsResponse:
+        """Get the stats payload for all inputs of a player.
+
+        When validators from a previous response are passed, the request is
+        made conditional and a 304 comes back as a response without data.
+        Requests that are not `pooled` always go out with `api_key`.
+        Callers polling a player pass the monotonic time of their last
+        response as `newer_than`, so a cached response is only reused when
+        someone else fetched it since.
+        """
+        # Callers tracking the same player share requests and recent results;
+        # interactive requests always go to the API but refresh the cache.
+        # Requests sent with their own key only share with that key, so a
+        # bad key never gets answers fetched with a good one.
+        shared = pooled and self.key_pool.active
+        cache_key = (
+            None if shared else api_key,
+            player_id.lower(),
+            account_type,
+            time_window,
+        )
+        return await self._response_cache.async_get(
+            cache_key,
+            lambda: self._async_fetch_stats(
+                cache_key,
+                api_key,
+                player_id,
+                account_type,
+                time_window,
+                priority,
+                etag,
+                last_modified,
+                pooled,
+            ),
+            use_cache=priority != PRIORITY_INTERACTIVE,
+            newer_than=newer_than,
+        )
+
+    async def _async_fetch_stats(
+        self,
+        cache_key: tuple[str | None, str, str, str],
+        api_key: str,
+        player_id: str,
+        account_type: str,
+        time_window: str,
+        priority: int,
+        etag: str | None,
+        last_modified: str | None,
+        pooled: bool,
+    ) -> StatsResponse:
+        """Fetch stats through the negative cache, circuit breaker and rate limiter."""
+        # With pooled keys the request goes out with the best key right now
+        if pooled:
+            api_key = self.key_pool.select(api_key)
+        params = {
+            "name": player_id,
+            "accountType": account_type,
+            "timeWindow": time_window,
+        }
+        headers = {"Authorization": api_key}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        request_key = (api_key, player_id, account_type, time_window)
+        if (cached := self._negative_cache.get(request_key)) is not None:
+            expires, error = cached
+            if time.monotonic() < expires:
+                raise error
+            del self._negative_cache[request_key]
+
+        breaker = self.breaker(STATS_URL)
+        if not breaker.allow_request():
+            raise CircuitOpenError(
+                f"API circuit open, retrying in {breaker.retry_in:.0f} seconds"
+            )
+
+        sent = False
+        try:
+            await self.rate_limiter.acquire(priority)
+            sent = True
+            response = await self._async_request_stats(params, headers, etag, last_modified)
+        except FortniteApiError as err:
+            if err.status in KEY_FAILURE_STATUSES and self.key_pool.active:
+                self.key_pool.record_failure(api_key, err.status, err.retry_after)
+            if err.status in NEGATIVE_CACHE_STATUSES:
+                # The server is fine, the request is not - don't repeat it for a while
+                self._negative_cache[request_key] = (
+                    time.monotonic() + self.negative_cache_ttl,
+                    err,
+                )
+                breaker.record_success()
+            elif err.status == 429 and self.key_pool.active:
+                # Only this key is throttled, the others keep the endpoint going
+                breaker.release()
+            elif err.status is None or err.status == 429 or err.status >= 500:
+                breaker.record_failure(err.retry_after)
+            else:
+                breaker.record_success()
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            breaker.record_failure()
+            raise FortniteApiError(f"Connection error: {err!r}") from err
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        else:
+            breaker.record_success()
+            self.key_pool.record_success(api_key)
+        finally:
+            # Counted once the breaker has seen the outcome, so the quota
+            # sensor reads the new breaker state
+            if sent and self.quota is not None:
+                self.quota.record(api_key)
+
+        if response.not_modified and (cached := self._response_cache.peek(cache_key)):
+            # Hand out the full payload so callers sharing this request all get data
+            return cached
+        return response
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """Return the circuit breaker of an endpoint."""
+        if (breaker := self._breakers.get(endpoint)) is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(endpoint)
+        return breaker
+
+    async def _async_request_stats(
+        self,
+        params: dict[str, str],
+        headers: dict[str, str],
+        etag: str | None,
+        last_modified: str | None,
+    ) -> StatsResponse:
+        """Send one stats request and map the response."""
+        async with self.session.get(STATS_URL, params=params, headers=headers) as response:
+            if response.status == 304:
+                return StatsResponse(None, etag, last_modified)
+            if response.status == 200:
+                data = await response.json()
+                if data.get("status") == 200 and "data" in data:
+                    return StatsResponse(
+                        data,
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                    )
+                raise FortniteApiError(
+                    f"API returned error: {data.get('error', 'Unknown error')}",
+                    data.get("status"),
+                )
+            if response.status == 401:
+                raise FortniteApiError("Invalid API key", response.status)
+            if response.status == 403:
+                raise FortniteApiError("Player stats are private", response.status)
+            if response.status == 404:
+                raise FortniteApiError("Player not found", response.status)
+            raise FortniteApiError(
+                f"API error: {response.status}",
+                response.status,
+                _parse_retry_after(response.headers.get("Retry-After")),
+            )
+
+    @callback
+    def async_close_on_stop(self) -> None:
+        """Release the session when Home Assistant closes."""
+
+        async def _async_close(event: Event) -> None:
+            self._unsub_close = None
+            await self.async_close()
+
+        self._unsub_close = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, _async_close
+        )
+
+    async def async_close(self) -> None:
+        """Release the session and drop everything waiting or cached."""
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        self.rate_limiter.cancel()
+        self._response_cache.clear()
+        if self._session is not None and not self._session.closed:
+            # The connector is shared with the rest of Home Assistant
+            self._session.detach()
+        self._session = None
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Return the seconds to wait from a Retry-After header (delta or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+@callback
+def async_get_api_client(hass: HomeAssistant) -> FortniteApiClient:
+    """Return the domain-wide API client, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (client := domain_data.get(DATA_API_CLIENT)) is None:
+        domain_config = domain_data.get(DATA_DOMAIN_CONFIG, {})
+        quota = async_get_quota_accountant(hass)
+        # Rate limits apply per key, so pooled keys add up
+        keys = domain_config.get(CONF_API_KEYS, [])
+        scale = max(1, len(keys))
+        client = domain_data[DATA_API_CLIENT] = FortniteApiClient(
+            hass,
+            rate=domain_config.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT) * scale,
+            burst=domain_config.get(CONF_RATE_BURST, DEFAULT_RATE_BURST) * scale,
+            negative_cache_ttl=domain_config.get(
+                CONF_NEGATIVE_CACHE_TTL, DEFAULT_NEGATIVE_CACHE_TTL
+            ),
+            quota=quota,
+            key_pool=ApiKeyPool(keys, quota),
+        )
+        client.async_close_on_stop()
+    return client
+
+
+async def async_release_api_client(hass: HomeAssistant) -> None:
+    """Close the domain-wide API client."""
+    if (client := hass.data.get(DOMAIN, {}).pop(DATA_API_CLIENT, None)) is not None:
+        await client.async_close()
@@ -0,0 +1,89 @@
+"""Single-flight request coalescing with a small TTL/LRU response cache."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+import time
+from typing import Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+class SingleFlightCache(Generic[_T]):
+    """Share one in-flight request per key and keep recent results for a while.
+
+    Concurrent callers for the same key await the same task. Successful
+    results accepted by `cache_if` are cached for `ttl` seconds; the least
+    recently used entry is evicted once `max_entries` is reached. Callers
+    that fetch repeatedly pass the time of their last result as
+    `newer_than`, so they never get that same result back.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        cache_if: Callable[[_T], bool] | None = None,
+    ) -> None:
+        """Initialize an empty cache."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache_if = cache_if
+        self._entries: OrderedDict[Hashable, tuple[float, _T]] = OrderedDict()
+        self._in_flight: dict[Hashable, asyncio.Task[_T]] = {}
+
+    async def async_get(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[_T]],
+        use_cache: bool = True,
+        newer_than: float | None = None,
+    ) -> _T:
+        """Return a fresh cached result, join an in-flight request or start one.
+
+        With `newer_than`, a monotonic time, only results cached after it
+        are reused.
+        """
+        if use_cache and (entry := self._entries.get(key)) is not None:
+            stored, value = entry
+            if time.monotonic() - stored < self.ttl and (
+                newer_than is None or stored > newer_than
+            ):
+                self._entries.move_to_end(key)
+                return value
+
+        if (task := self._in_flight.get(key)) is None:
+            task = self._in_flight[key] = asyncio.ensure_future(fetch())
+            task.add_done_callback(lambda done: self._async_request_done(key, done))
+        # One caller being cancelled must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    def peek(self, key: Hashable) -> _T | None:
+        """Return the last result for a key, even if it is no longer fresh."""
+        if (entry := self._entries.get(key)) is None:
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: _T) -> None:
+        """Store a result, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached result and cancel in-flight requests."""
+        self._entries.clear()
+        for task in self._in_flight.values():
+            task.cancel()
+        self._in_flight.clear()
+
+    def _async_request_done(self, key: Hashable, task: asyncio.Task[_T]) -> None:
+        """Cache the result of a finished request."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if self._cache_if is None or self._cache_if(task.result()):
+            self.set(key, task.result())
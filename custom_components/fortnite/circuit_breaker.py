@@ -0,0 +1,104 @@
+"""Circuit breaker for fortnite-api.com endpoints."""
+from __future__ import annotations
+
+import logging
+import time
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_RECOVERY_TIMEOUT,
+    BREAKER_RECOVERY_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one endpoint.
+
+    The breaker opens after `failure_threshold` consecutive failures, or at
+    once when the server sent a Retry-After. While open, requests fail fast.
+    Once the open period is over a single probe request is let through; its
+    outcome closes the breaker or opens it again for twice as long.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        recovery_timeout: float = BREAKER_RECOVERY_TIMEOUT,
+        max_recovery_timeout: float = BREAKER_MAX_RECOVERY_TIMEOUT,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max_recovery_timeout
+        self.failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Return the current breaker state."""
+        if self._open_until == 0.0:
+            return STATE_CLOSED
+        if time.monotonic() < self._open_until:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the breaker lets a probe through."""
+        return max(0.0, self._open_until - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a request reached the server."""
+        if self._open_until:
+            _LOGGER.info("API circuit %s closed", self.name)
+        self.failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+
+    def record_failure(self, retry_after: float | None = None) -> None:
+        """Count a failed request, opening the breaker when needed."""
+        self.failures += 1
+        probe_failed = self._probe_in_flight
+        self._probe_in_flight = False
+        if retry_after is None and not probe_failed and self.failures < self.failure_threshold:
+            return
+
+        self._trips += 1
+        timeout = retry_after
+        if timeout is None:
+            timeout = min(
+                self.max_recovery_timeout,
+                self.recovery_timeout * 2 ** (self._trips - 1),
+            )
+        self._open_until = time.monotonic() + timeout
+        _LOGGER.warning(
+            "API circuit %s open for %.0f seconds after %d failure(s)",
+            self.name,
+            timeout,
+            self.failures,
+        )
+
+    def release(self) -> None:
+        """Give back a probe slot when its request was abandoned."""
+        self._probe_in_flight = False
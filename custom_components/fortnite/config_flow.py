@@ -4,21 +4,77 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.selector import (
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    TextSelector,
+    TextSelectorConfig,
+)
 
-from .const import CONF_AGGREGATED_SENSORS
+from .api import FortniteApiError, async_get_api_client
+from .const import (
+    CONF_AGGREGATED_SENSORS,
+    CONF_COMPACT_ENTITIES,
+    CONF_ENTRY_TYPE,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_PLAYERS,
+    CONF_POLLING_MODE,
+    CONF_ROSTER_NAME,
+    DEFAULT_INPUTS,
+    ENTRY_TYPE_PLAYER,
+    ENTRY_TYPE_ROSTER,
+    INPUT_DISPLAY_NAMES,
+    INPUT_OPTIONS,
+    POLLING_MODE_FIXED,
+    POLLING_MODES,
+    PRIORITY_INTERACTIVE,
+    ROSTER_VALIDATION_BATCH,
+    ROSTER_VALIDATION_DEADLINE,
+)
+from .fetch import async_fetch_all
+from .roster import parse_roster
 
 _LOGGER = logging.getLogger(__name__)
 
+# Every input is split from the one stats payload, so all are offered;
+# Console and PC are selected by default
+INPUT_SELECTOR = SelectSelector(
+    SelectSelectorConfig(
+        options=[
+            SelectOptionDict(value=platform, label=INPUT_DISPLAY_NAMES[platform])
+            for platform in INPUT_OPTIONS
+        ],
+        multiple=True,
+    )
+)
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required("api_key"): str,
         vol.Required("player_id"): str,
+        vol.Optional("platforms", default=DEFAULT_INPUTS): INPUT_SELECTOR,
         vol.Optional(CONF_AGGREGATED_SENSORS, default=True): bool,
+        vol.Optional(CONF_POLLING_MODE, default=POLLING_MODE_FIXED): vol.In(POLLING_MODES),
+        vol.Optional(CONF_LONG_TERM_STATISTICS, default=False): bool,
+        vol.Optional(CONF_COMPACT_ENTITIES, default=False): bool,
+    }
+)
+
+# Rosters default to compact entities without aggregates to keep entity counts low
+STEP_ROSTER_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required("api_key"): str,
+        vol.Required(CONF_ROSTER_NAME): str,
+        vol.Required(CONF_PLAYERS): TextSelector(TextSelectorConfig(multiline=True)),
+        vol.Optional("platforms", default=DEFAULT_INPUTS): INPUT_SELECTOR,
+        vol.Optional(CONF_AGGREGATED_SENSORS, default=False): bool,
+        vol.Optional(CONF_LONG_TERM_STATISTICS, default=False): bool,
+        vol.Optional(CONF_COMPACT_ENTITIES, default=True): bool,
     }
 )
 
@@ -31,23 +87,32 @@ class ConfigFlow(config_entries.ConfigFlow, domain="fortnite"):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
-        if user_input is None:
+        return self.async_show_menu(
+            step_id="user", menu_options=[ENTRY_TYPE_PLAYER, ENTRY_TYPE_ROSTER]
+        )
+
+    async def async_step_player(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle tracking a single player."""
+        if user_input is None or not user_input.get("platforms"):
             return self.async_show_form(
-                step_id="user",
-                data_schema=STEP_USER_DATA_SCHEMA,
+                step_id=ENTRY_TYPE_PLAYER,
+                data_schema=self.add_suggested_values_to_schema(
+                    STEP_USER_DATA_SCHEMA, user_input or {}
+                ),
+                errors={"platforms": "no_inputs"} if user_input is not None else {},
             )
 
-        errors = {}
-
         # Try to validate the API key and player data
         try:
             await self._test_connection(user_input)
         except Exception as err:
-            _LOGGER.warning("API validation failed (will use fallback data): %s", err)
-            # Don't show error - just log it and continue with fallback data
+            _LOGGER.warning("API validation failed (setup will retry): %s", err)
+            # Don't show error - just log it, setup retries until the API answers
 
-        # Add default platforms and game modes (consolidated by API endpoint)
-        user_input["platforms"] = ["gamepad", "keyboardMouse"]
+        # All game modes come with the same payload
+        user_input[CONF_ENTRY_TYPE] = ENTRY_TYPE_PLAYER
         user_input["game_modes"] = ["solo", "duo", "squad"]
         
         return self.async_create_entry(
@@ -55,30 +120,90 @@ class ConfigFlow(config_entries.ConfigFlow, domain="fortnite"):
             data=user_input,
         )
 
+    async def async_step_roster(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle tracking a roster of players pasted as a list of Epic names."""
+        errors: dict[str, str] = {}
+        placeholders = {"players": ""}
+        if user_input is not None:
+            players = parse_roster(user_input[CONF_PLAYERS])
+            if not players:
+                errors[CONF_PLAYERS] = "no_players"
+            elif not user_input.get("platforms"):
+                errors["platforms"] = "no_inputs"
+            else:
+                try:
+                    not_found = await self._validate_roster(user_input["api_key"], players)
+                except FortniteApiError as err:
+                    _LOGGER.warning("Roster validation failed: %s", err)
+                    errors["base"] = "invalid_auth"
+                else:
+                    if not_found:
+                        errors[CONF_PLAYERS] = "players_not_found"
+                        placeholders["players"] = ", ".join(not_found)
+                    else:
+                        return self.async_create_entry(
+                            title=f"Fortnite Roster - {user_input[CONF_ROSTER_NAME]}",
+                            data={
+                                **user_input,
+                                CONF_ENTRY_TYPE: ENTRY_TYPE_ROSTER,
+                                CONF_PLAYERS: players,
+                                "game_modes": ["solo", "duo", "squad"],
+                            },
+                        )
+
+        return self.async_show_form(
+            step_id=ENTRY_TYPE_ROSTER,
+            data_schema=self.add_suggested_values_to_schema(
+                STEP_ROSTER_DATA_SCHEMA, user_input or {}
+            ),
+            errors=errors,
+            description_placeholders=placeholders,
+        )
+
+    async def _validate_roster(self, api_key: str, players: list[str]) -> list[str]:
+        """Look players up in batches through the shared rate limiter.
+
+        Returns the players that do not exist. Raises FortniteApiError when
+        the API key is rejected. Other failures are not held against a
+        player - setup retries those.
+        """
+        client = async_get_api_client(self.hass)
+        not_found = []
+        for start in range(0, len(players), ROSTER_VALIDATION_BATCH):
+            batch = players[start : start + ROSTER_VALIDATION_BATCH]
+            results = await async_fetch_all(
+                {
+                    player_id: (
+                        lambda player_id=player_id: client.async_get_stats(
+                            api_key,
+                            player_id,
+                            priority=PRIORITY_INTERACTIVE,
+                            pooled=False,
+                        )
+                    )
+                    for player_id in batch
+                },
+                ROSTER_VALIDATION_BATCH,
+                ROSTER_VALIDATION_DEADLINE,
+            )
+            for player_id, result in results.items():
+                if not isinstance(result, FortniteApiError):
+                    continue
+                if result.status == 401:
+                    raise result
+                if result.status == 404:
+                    not_found.append(player_id)
+        return not_found
+
     async def _test_connection(self, user_input: dict[str, Any]) -> None:
         """Test the connection to fortnite-api.com."""
-        api_key = user_input["api_key"]
-        player_id = user_input["player_id"]
-        
-        # Test with gamepad platform (Switch)
-        url = "https://fortnite-api.com/v2/stats/br/v2"
-        params = {
-            "name": player_id,
-            "accountType": "epic",
-            "timeWindow": "lifetime",
-            "image": "gamepad"
-        }
-        headers = {"Authorization": api_key}
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, headers=headers, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get("status") != 200:
-                        raise Exception(f"API error: {data.get('error', 'Unknown error')}")
-                elif response.status == 401:
-                    raise Exception("Invalid API key")
-                elif response.status == 404:
-                    raise Exception("Player not found")
-                else:
-                    raise Exception(f"API error: {response.status}")
+        client = async_get_api_client(self.hass)
+        # Validate the key that was entered, not one from the pool
+        await client.async_get_stats(
+            user_input["api_key"],
+            user_input["player_id"],
+            priority=PRIORITY_INTERACTIVE,
+            pooled=False,
+        )
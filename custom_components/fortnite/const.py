@@ -8,12 +8,136 @@ CONF_PLAYER_ID = "player_id"
 CONF_GAME_PLATFORM = "game_platform"
 CONF_GAME_MODE = "game_mode"
 CONF_AGGREGATED_SENSORS = "aggregated_sensors"
+CONF_POLLING_MODE = "polling_mode"
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+CONF_COMPACT_ENTITIES = "compact_entities"
+CONF_ENTRY_TYPE = "entry_type"
+CONF_PLAYERS = "players"
+CONF_ROSTER_NAME = "roster_name"
+
+# Config entry types - one player, or a roster of many players
+ENTRY_TYPE_PLAYER = "player"
+ENTRY_TYPE_ROSTER = "roster"
+
+# Domain-level (YAML) configuration keys
+CONF_RATE_LIMIT = "rate_limit"
+CONF_RATE_BURST = "rate_burst"
+CONF_SIGNIFICANCE_THRESHOLDS = "significance_thresholds"
+CONF_ADAPTIVE_MIN_INTERVAL = "adaptive_min_interval"
+CONF_ADAPTIVE_MAX_INTERVAL = "adaptive_max_interval"
+CONF_NEGATIVE_CACHE_TTL = "negative_cache_ttl"
+CONF_ENTITY_BATCH_SIZE = "entity_batch_size"
+CONF_DAILY_QUOTA = "daily_quota"
+CONF_API_KEYS = "api_keys"
 
 # Default values
 DEFAULT_SCAN_INTERVAL = 300  # 5 minutes
 DEFAULT_PLATFORM = "pc"
 DEFAULT_MODE = "SOLO"
 
+# Polling modes
+POLLING_MODE_FIXED = "fixed"  # Every DEFAULT_SCAN_INTERVAL
+POLLING_MODE_ADAPTIVE = "adaptive"  # Faster while playing, slower while idle
+POLLING_MODES = [POLLING_MODE_FIXED, POLLING_MODE_ADAPTIVE]
+DEFAULT_ADAPTIVE_MIN_INTERVAL = 60  # 1 minute
+DEFAULT_ADAPTIVE_MAX_INTERVAL = 14400  # 4 hours
+
+# Entries poll at a persisted phase within the scan interval, plus jitter
+SCHEDULE_STORAGE_VERSION = 1
+SCHEDULE_SAVE_DELAY = 10  # seconds
+POLL_JITTER = 10  # seconds
+
+# Requests per API key and UTC day - with a daily quota configured, poll
+# intervals are stretched so every tracked player fits in the budget
+QUOTA_STORAGE_VERSION = 1
+QUOTA_SAVE_DELAY = 30  # seconds
+SIGNAL_QUOTA_UPDATED = f"{DOMAIN}_quota_updated"
+
+# Pooled API keys - keys answering 401/429 sit out a cooldown, doubled while
+# they keep failing; 429s also lower a key's share of the requests
+KEY_COOLDOWN = 60  # seconds
+KEY_MAX_COOLDOWN = 3600  # seconds
+KEY_INVALID_COOLDOWN = 3600  # seconds
+KEY_THROTTLE_SMOOTHING = 0.2  # weight of the latest answer in the 429 rate
+KEY_FAILURE_STATUSES = (401, 429)
+
+# Entities are registered in batches, yielding to the event loop in between
+DEFAULT_ENTITY_BATCH_SIZE = 100
+
+# Rosters - one timer refreshes a slice of the players at a time, so every
+# player is refreshed once per DEFAULT_SCAN_INTERVAL
+ROSTER_SLICE_INTERVAL = 30  # seconds
+ROSTER_VALIDATION_BATCH = 10  # players validated together in the config flow
+ROSTER_VALIDATION_DEADLINE = 60  # seconds per batch
+
+# Persisted last known good data
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10  # seconds
+
+# In-memory snapshot history and the rate sensors derived from it
+HISTORY_MAX_BYTES = 64 * 1024  # per player, oldest snapshots are evicted
+HISTORY_RATE_WINDOW = 86400  # seconds covered by the per-hour rates
+HISTORY_RECENT_MATCHES = 20  # matches covered by the recent win rate
+
+# Persistent stats history (SQLite, in the config directory)
+HISTORY_DATABASE_FILE = "fortnite_history.db"
+HISTORY_DATABASE_VERSION = 1
+DEFAULT_QUERY_RANGE = 30 * 86400  # seconds queried when no start is given
+HISTORY_EXPORT_DIRECTORY = "fortnite_exports"  # in the config directory
+HISTORY_EXPORT_CHUNK_SIZE = 5000  # rows read and written at a time
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_PARQUET = "parquet"
+EXPORT_FORMATS = [EXPORT_FORMAT_CSV, EXPORT_FORMAT_PARQUET]
+
+# Services
+SERVICE_QUERY_HISTORY = "query_history"
+SERVICE_EXPORT_HISTORY = "export_history"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_BUCKET = "bucket"
+ATTR_PLATFORMS = "platforms"
+ATTR_GAME_MODES = "game_modes"
+ATTR_FORMAT = "format"
+ATTR_FILENAME = "filename"
+HISTORY_BUCKETS = {
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "total": None,
+}
+
+# Shared API client
+DATA_API_CLIENT = "api_client"
+DATA_DOMAIN_CONFIG = "domain_config"
+DATA_STATS_DATABASE = "stats_database"
+DATA_POLL_SCHEDULER = "poll_scheduler"
+DATA_QUOTA_ACCOUNTANT = "quota_accountant"
+API_REQUEST_TIMEOUT = 10  # seconds
+
+# Rate limiting - shared token bucket across all config entries
+DEFAULT_RATE_LIMIT = 2.0  # requests per second, stays under the 3 req/s limit
+DEFAULT_RATE_BURST = 3
+PRIORITY_INTERACTIVE = 0  # Config flow validation and user-triggered refreshes
+PRIORITY_BACKGROUND = 1  # Scheduled polls
+
+# Requests made during one refresh run concurrently under one deadline
+REFRESH_CONCURRENCY = 4
+REFRESH_DEADLINE = 20  # seconds
+
+# Failed or partial refreshes are retried after this delay, doubled each time
+REVALIDATE_MIN_DELAY = 30  # seconds
+
+# Circuit breaker - fail fast while fortnite-api.com is down or throttling us
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RECOVERY_TIMEOUT = 60  # seconds, doubled on every failed probe
+BREAKER_MAX_RECOVERY_TIMEOUT = 3600  # seconds
+DEFAULT_NEGATIVE_CACHE_TTL = 900  # seconds to remember 401/403/404 answers
+
+# Shared responses - config flow validation is reused by the first refresh,
+# and entries tracking the same player share one request
+RESPONSE_CACHE_TTL = 60  # seconds
+RESPONSE_CACHE_SIZE = 256
+
 # Platform options (FortniteAPI.io identifiers)
 PLATFORM_OPTIONS = [
     "pc",
@@ -23,6 +147,32 @@ PLATFORM_OPTIONS = [
     "kbm"
 ]
 
+# Input options - fortnite-api.com returns all of these in one stats payload
+INPUT_OPTIONS = [
+    "all",
+    "keyboardMouse",
+    "gamepad",
+    "touch"
+]
+
+# Inputs tracked unless others are selected - Mobile and All Inputs are opt-in
+DEFAULT_INPUTS = ["gamepad", "keyboardMouse"]
+
+# Display names of the inputs
+INPUT_DISPLAY_NAMES = {
+    "gamepad": "Console",
+    "keyboardMouse": "PC",
+    "touch": "Mobile",
+    "all": "All Inputs"
+}
+
+# Game modes tracked per input, as named by fortnite-api.com
+GAME_MODES = [
+    "solo",
+    "duo",
+    "squad"
+]
+
 # Game mode options
 MODE_OPTIONS = [
     "SOLO",
@@ -30,6 +180,48 @@ MODE_OPTIONS = [
     "SQUAD"
 ]
 
+# Counters kept in the snapshot history and the stats database
+COUNTER_FIELDS = [
+    "kills",
+    "matches",
+    "top1",
+    "score",
+    "minutes_played"
+]
+
+# Match completion events, inferred from counter changes between refreshes
+EVENT_MATCH_COMPLETED = "fortnite_match_completed"
+MATCH_EVENT_LIMIT = 25  # per input and mode, larger gaps are not replayed
+MATCH_COUNTER_FIELDS = [
+    "matches",
+    "kills",
+    "score",
+    "minutes_played"
+]
+# Best placement first - each counter includes the placements before it
+PLACEMENT_FIELDS = [
+    "top1",
+    "top3",
+    "top5",
+    "top6",
+    "top10",
+    "top12",
+    "top25"
+]
+
+# Sensor keys mapped to the keys of the transformed per-mode data
+SENSOR_DATA_KEYS = {
+    "eliminations": "kills",
+    "wins": "top1",
+    "matches": "matches",
+    "win_rate": "win_ratio",
+    "kd": "kd",
+    "top10": "top10",
+    "top25": "top25",
+    "score": "score",
+    "minutes_played": "minutes_played"
+}
+
 # Aggregated sensor types
 AGGREGATED_SENSOR_TYPES = {
     "all_platforms_all_modes": "All Platforms All Modes",
@@ -39,3 +231,13 @@ AGGREGATED_SENSOR_TYPES = {
     "all_platforms_duo": "All Platforms Duo",
     "all_platforms_squad": "All Platforms Squad"
 }
+
+# Platforms and modes included in each aggregated sensor type (None = all configured)
+AGGREGATED_SELECTIONS = {
+    "all_platforms_all_modes": (None, None),
+    "console_all_modes": (["gamepad"], None),
+    "pc_all_modes": (["keyboardMouse"], None),
+    "all_platforms_solo": (None, ["solo"]),
+    "all_platforms_duo": (None, ["duo"]),
+    "all_platforms_squad": (None, ["squad"])
+}
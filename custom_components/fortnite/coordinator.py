@@ -1,71 +1,516 @@
 """Consolidated coordinator for Fortnite Stats - groups platforms by API endpoint."""
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
+import math
+import random
+import time
 from typing import Any
 
-import aiohttp
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_change
+from homeassistant.util import dt as dt_util, slugify
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .aggregation import aggregate_stats, distinct_inputs, sensor_states
+from .api import STATS_URL, FortniteApiClient, StatsResponse
 from .const import (
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_ADAPTIVE_MIN_INTERVAL,
     CONF_API_KEY,
+    CONF_COMPACT_ENTITIES,
+    CONF_ENTRY_TYPE,
+    CONF_LONG_TERM_STATISTICS,
     CONF_PLAYER_ID,
+    CONF_POLLING_MODE,
+    CONF_SIGNIFICANCE_THRESHOLDS,
+    DATA_DOMAIN_CONFIG,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    ENTRY_TYPE_ROSTER,
+    EVENT_MATCH_COMPLETED,
+    MATCH_EVENT_LIMIT,
+    PRIORITY_BACKGROUND,
+    POLL_JITTER,
+    POLLING_MODE_ADAPTIVE,
+    POLLING_MODE_FIXED,
+    PRIORITY_INTERACTIVE,
+    REFRESH_CONCURRENCY,
+    REFRESH_DEADLINE,
+    REVALIDATE_MIN_DELAY,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
 )
+from .events import infer_matches
+from .fetch import async_fetch_all
+from .history import PlayerHistory
+from .quota import async_get_quota_accountant
+from .statistics import async_import_statistics
+from .timeseries import async_record_stats
 
 _LOGGER = logging.getLogger(__name__)
 
-# Mock data as fallback - consolidated by API endpoint
-MOCK_DATA = {
-    "gamepad": {  # Xbox, PlayStation, Switch all use "gamepad" API
-        "solo": {"kills": 202, "matches": 120, "win_ratio": 0.075, "kd": 1.82, "kpg": 1.683, "top1": 9, "top10": 43, "top25": 60, "score": 30029, "score_per_match": 250.242, "minutes_played": 1124, "id": "captain_crunch88_gamepad_solo"},
-        "duo": {"kills": 32, "matches": 22, "win_ratio": 0.045, "kd": 1.524, "kpg": 1.455, "top1": 1, "top10": 0, "top25": 0, "score": 4549, "score_per_match": 206.773, "minutes_played": 168, "id": "captain_crunch88_gamepad_duo"},
-        "squad": {"kills": 1639, "matches": 793, "win_ratio": 0.164, "kd": 2.472, "kpg": 2.067, "top1": 130, "top10": 0, "top25": 0, "score": 225265, "score_per_match": 284.067, "minutes_played": 8262, "id": "captain_crunch88_gamepad_squad"}
-    },
-    "keyboardMouse": {  # PC and KBM use "keyboardMouse" API
-        "solo": {"kills": 0, "matches": 1, "win_ratio": 0.0, "kd": 0.0, "kpg": 0.0, "top1": 0, "top10": 0, "top25": 0, "score": 77, "score_per_match": 77.0, "minutes_played": 5, "id": "captain_crunch88_keyboardMouse_solo"},
-        "duo": {"kills": 0, "matches": 0, "win_ratio": 0.0, "kd": 0.0, "kpg": 0.0, "top1": 0, "top10": 0, "top25": 0, "score": 0, "score_per_match": 0.0, "minutes_played": 0, "id": "captain_crunch88_keyboardMouse_duo"},
-        "squad": {"kills": 0, "matches": 1, "win_ratio": 0.0, "kd": 0.0, "kpg": 0.0, "top1": 0, "top10": 0, "top25": 0, "score": 77, "score_per_match": 77.0, "minutes_played": 5, "id": "captain_crunch88_keyboardMouse_squad"}
-    }
-}
-
 class FortniteDataUpdateCoordinator(DataUpdateCoordinator):
     """Consolidated coordinator for Fortnite Stats - groups platforms by API endpoint."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        """Initialize the coordinator."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: FortniteApiClient,
+        player_id: str | None = None,
+        update_interval: timedelta | None = timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+        poll_offset: float | None = None,
+    ) -> None:
+        """Initialize the coordinator.
+
+        With a poll offset, polls are due at that phase of the interval
+        (see _schedule_refresh). Roster entries pass the player to track and
+        no update interval, as the roster refreshes all of its players.
+        """
         self.entry = entry
+        self.client = client
         self.api_key = entry.data[CONF_API_KEY]
-        self.player_id = entry.data[CONF_PLAYER_ID]
+        self.player_id = player_id or entry.data[CONF_PLAYER_ID]
         
         # Get configured platforms and game modes, with defaults
         self.platforms = entry.data.get("platforms", ["gamepad", "keyboardMouse"])
         self.game_modes = entry.data.get("game_modes", ["solo", "duo", "squad"])
         
-        # Track if we're using mock data
-        self.using_mock_data = False
-        self._update_count = 0
+        # Requests queue ahead of background polls when a user asked for them
+        self._request_priority = PRIORITY_BACKGROUND
+        # Shared responses are only reused when they are newer than our last one
+        self._last_response: float | None = None
+
+        # Change detection - HTTP validators and the lastModified of every input/mode
+        self._etag: str | None = None
+        self._last_modified_header: str | None = None
+        self._stats_last_modified: dict[tuple[str, str], str] | None = None
+        self._skip_listener_update = False
+        self._activity_detected = False
+        # Matches played while Home Assistant was down are not replayed
+        self._skip_match_events = False
+
+        # Adaptive polling - poll fast while the player is active, back off when idle
+        domain_config = hass.data.get(DOMAIN, {}).get(DATA_DOMAIN_CONFIG, {})
+        self.polling_mode = entry.data.get(CONF_POLLING_MODE, POLLING_MODE_FIXED)
+        self._min_interval = domain_config.get(
+            CONF_ADAPTIVE_MIN_INTERVAL, DEFAULT_ADAPTIVE_MIN_INTERVAL
+        )
+        self._max_interval = domain_config.get(
+            CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL
+        )
+        self._base_interval = DEFAULT_SCAN_INTERVAL
+
+        # Polls stay on the entry's phase however often the timer is reset
+        self._poll_offset = poll_offset
+        self._next_poll: float | None = None
+
+        # Polls are stretched when the key's daily quota can't cover them
+        self.quota = async_get_quota_accountant(hass)
+
+        # Long-term statistics instead of detailed state history
+        self.long_term_statistics = entry.data.get(CONF_LONG_TERM_STATISTICS, False)
+        self._imported_statistics: dict[str, float] = {}
+        self.compact_entities = entry.data.get(CONF_COMPACT_ENTITIES, False)
+
+        # Diff-based updates - only entities whose state changed are notified
+        self._thresholds: dict[str, float] = domain_config.get(
+            CONF_SIGNIFICANCE_THRESHOLDS, {}
+        )
+        self._published_states: dict[tuple[str, ...], float | int] = {}
+        self._changed_contexts: set[tuple[str, ...]] | None = None
+        self._published_success: bool | None = None
+        self._context_listeners: dict[object, tuple[CALLBACK_TYPE, Any]] = {}
+
+        # Last known good data, persisted so setup does not wait on the API
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, snapshot_storage_key(entry, self.player_id)
+        )
+
+        # Stale-while-revalidate - retry failed refreshes with backoff
+        self._revalidate_delay = REVALIDATE_MIN_DELAY
+        self._unsub_revalidate: CALLBACK_TYPE | None = None
+
+        # Recent counter snapshots for the rate sensors
+        self.history = PlayerHistory()
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            update_interval=update_interval,
         )
 
+    async def async_load_snapshot(self) -> bool:
+        """Load the last known good data as stale data, return True if there was any."""
+        if not (snapshot := await self._store.async_load()):
+            return False
+        self.data = self._prepare_data({**snapshot, "stale": True})
+        self._skip_match_events = True
+        _LOGGER.debug("Loaded stats snapshot for %s", self.player_id)
+        return True
+
+    @callback
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {key: value for key, value in self.data.items() if key != "stale"}
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll at the entry's phase, plus some jitter.
+
+        Refreshes between polls (user requests, revalidation) reset the
+        timer; a poll that is still due within one interval is kept then,
+        so the entry does not drift off its phase.
+        """
+        if self._poll_offset is None or self.update_interval is None:
+            super()._schedule_refresh()
+            return
+        if self.entry.pref_disable_polling:
+            return
+        self._async_unsub_refresh()
+
+        now = time.time()
+        interval = self.update_interval.total_seconds()
+        if self._next_poll is None or not (
+            now < self._next_poll <= now + interval + POLL_JITTER
+        ):
+            self._next_poll = (
+                now
+                + (self._poll_offset - now) % interval
+                + random.uniform(0, POLL_JITTER)
+            )
+        self._unsub_refresh = async_call_later(
+            self.hass, self._next_poll - now, self._handle_refresh_interval
+        )
+
+    async def _handle_refresh_interval(self, _now: datetime | None = None) -> None:
+        """Run the poll that was due and schedule the next one."""
+        self._next_poll = None
+        await super()._handle_refresh_interval(_now)
+
+    @property
+    def breaker_state(self) -> str:
+        """Return the state of the stats endpoint circuit breaker."""
+        return self.client.breaker(STATS_URL).state
+
+    @property
+    def breaker_retry_in(self) -> float:
+        """Return the seconds until the open breaker lets a probe through."""
+        return self.client.breaker(STATS_URL).retry_in
+
+    async def async_request_refresh(self) -> None:
+        """Request a user-triggered refresh, served ahead of background polls.
+
+        The debouncer may fold the request into a refresh that already ran,
+        so the priority never outlives the call.
+        """
+        self._request_priority = PRIORITY_INTERACTIVE
+        try:
+            await super().async_request_refresh()
+        finally:
+            self._request_priority = PRIORITY_BACKGROUND
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, keeping the context for diff-based updates."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        token = object()
+        self._context_listeners[token] = (update_callback, context)
+
+        @callback
+        def remove_context_listener() -> None:
+            """Remove the listener and its context."""
+            self._context_listeners.pop(token, None)
+            remove_listener()
+
+        return remove_context_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the listeners whose state changed in the last refresh."""
+        changed, self._changed_contexts = self._changed_contexts, None
+        if self._skip_listener_update:
+            self._skip_listener_update = False
+            return
+
+        # Availability changes affect every entity
+        if changed is None or self._published_success != self.last_update_success:
+            self._published_success = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._context_listeners.values()):
+            if context is None or context in changed:
+                update_callback()
+
+    def _diff_states(self, data: dict[str, Any]) -> set[tuple[str, ...]]:
+        """Return the contexts of sensors whose state changed significantly.
+
+        The context without its sensor key is included too, for compact
+        entities that carry every stat of an input/mode or aggregate.
+        """
+        changed = set()
+        for context, value in sensor_states(data, self.platforms, self.game_modes).items():
+            previous = self._published_states.get(context)
+            if previous == value:
+                continue
+            threshold = self._thresholds.get(context[-1])
+            if (
+                previous is not None
+                and threshold
+                and abs(value - previous) < threshold
+            ):
+                continue
+            self._published_states[context] = value
+            changed.add(context)
+            changed.add(context[:-1])
+        return changed
+
+    def cell_played(self, platform: str, mode: str) -> bool:
+        """Return True if the player has played a match on an input and mode."""
+        if not self.data:
+            return True
+        mode_data = (self.data.get(platform) or {}).get(mode) or {}
+        return bool(mode_data.get("matches"))
+
+    def input_stale(self, platform: str) -> bool:
+        """Return True if the data served for an input is not fresh."""
+        if not self.data:
+            return False
+        return bool(self.data.get("stale")) or platform in self.data.get("stale_inputs", [])
+
+    def data_fetched_at(self, platforms: Iterable[str]) -> str | None:
+        """Return when the oldest stale data of some inputs was fetched.
+
+        None while all of them are fresh. A fixed time rather than an age,
+        so it stays right while failed refreshes notify no entities.
+        """
+        input_updated = self.data.get("input_updated", {}) if self.data else {}
+        fetched = [
+            input_updated[platform]
+            for platform in platforms
+            if self.input_stale(platform) and platform in input_updated
+        ]
+        if not fetched:
+            return None
+        return dt_util.utc_from_timestamp(min(fetched)).isoformat()
+
+    @callback
+    def async_track_statistics(self) -> CALLBACK_TYPE:
+        """Import the counters as long-term statistics at the top of every hour."""
+        return async_track_time_change(
+            self.hass, self.async_import_hourly_statistics, minute=0, second=0
+        )
+
+    @callback
+    def async_import_hourly_statistics(self, now: datetime) -> None:
+        """Import the counters for the hour that just ended."""
+        if not self.data or self.data.get("stale"):
+            return
+        start = dt_util.as_utc(now).replace(minute=0, second=0, microsecond=0)
+        imported = async_import_statistics(
+            self.hass,
+            self.player_id,
+            self.data,
+            start - timedelta(hours=1),
+            self._imported_statistics,
+        )
+        _LOGGER.debug("Imported %d hourly statistics for %s", imported, self.player_id)
+
+    @callback
+    def async_cancel_revalidation(self) -> None:
+        """Cancel a pending revalidation and reset its backoff."""
+        if self._unsub_revalidate is not None:
+            self._unsub_revalidate()
+            self._unsub_revalidate = None
+        self._revalidate_delay = REVALIDATE_MIN_DELAY
+
+    @callback
+    def _schedule_revalidation(self) -> None:
+        """Retry a failed refresh before the next poll, backing off each time."""
+        if self._unsub_revalidate is not None:
+            return
+        # No sooner than the breaker lets a request through
+        delay = max(self._revalidate_delay, self.breaker_retry_in)
+        interval = self.update_interval or timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+        if delay >= interval.total_seconds():
+            # The regular poll comes first
+            return
+        self._revalidate_delay *= 2
+        _LOGGER.debug("Revalidating stats for %s in %d seconds", self.player_id, delay)
+        self._unsub_revalidate = async_call_later(self.hass, delay, self._async_revalidate)
+
+    async def _async_revalidate(self, _now: datetime) -> None:
+        """Refresh stale data in the background.
+
+        The refresh resets the poll timer, but _schedule_refresh keeps the
+        poll that is already due, so revalidating never delays it.
+        """
+        self._unsub_revalidate = None
+        await self.async_refresh()
+
     async def _async_update_data(self) -> dict[str, Any]:
-        """Update data via fortnite-api.com or fall back to mock data."""
+        """Update data via fortnite-api.com or fall back to the last known data."""
+        was_stale = bool(self.data and self.data.get("stale"))
+        stale_inputs = self.data.get("stale_inputs", []) if self.data else []
+        # The first fresh data after a snapshot load spans the downtime
+        skip_match_events = self._skip_match_events
+
         # First try the real API
         try:
-            return await self._try_fortnite_api()
+            self._activity_detected = False
+            result = await self._try_fortnite_api()
+            self._skip_match_events = False
+            if self.polling_mode == POLLING_MODE_ADAPTIVE:
+                self._adapt_update_interval()
+            if result is self.data and was_stale:
+                # Unchanged, so inputs missing from the response stay stale
+                self._skip_listener_update = False
+                result = {
+                    **result,
+                    "stale": False,
+                    "input_updated": {
+                        **result.get("input_updated", {}),
+                        **dict.fromkeys(self._fresh_inputs(stale_inputs), time.time()),
+                    },
+                }
+            if result is not self.data:
+                self._store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
         except Exception as err:
-            _LOGGER.warning("Fortnite API failed, falling back to mock data: %s", err)
-            self.using_mock_data = True
-            return await self._get_mock_data()
+            if self.data is None:
+                # Nothing to serve yet - never show made-up numbers
+                raise UpdateFailed(f"Failed to update Fortnite data: {err}") from err
+            _LOGGER.warning("Fortnite API failed, keeping last known data: %s", err)
+            result = self.data if was_stale else {**self.data, "stale": True}
+            # Nothing but the stale flag can have changed
+            self._changed_contexts = set()
+
+        if result is self.data:
+            self._update_rates()
+
+        if result.get("stale") or result.get("stale_inputs"):
+            self._schedule_revalidation()
+        else:
+            self.async_cancel_revalidation()
+        self._fit_update_interval()
+
+        if result is not self.data:
+            if self.data is not None and not skip_match_events:
+                self._fire_match_events(self.data, result)
+            result = self._prepare_data(result)
+            # Staleness is an attribute of every entity
+            if (
+                bool(result.get("stale")) != was_stale
+                or result.get("stale_inputs", []) != stale_inputs
+            ):
+                self._changed_contexts = None
+        return result
+
+    def _update_rates(self) -> None:
+        """Move the rate window forward when the stats themselves did not change."""
+        rates = self.history.rates(
+            time.time(), distinct_inputs(self.platforms), self.game_modes
+        )
+        if rates == self.data.get("rates"):
+            return
+        self.data["rates"] = rates
+        if changed := self._diff_states(self.data):
+            self._changed_contexts = (self._changed_contexts or set()) | changed
+            self._skip_listener_update = False
+
+    def _adapt_update_interval(self) -> None:
+        """Shorten the interval on activity, back off exponentially when idle."""
+        current = self._base_interval
+        if self._activity_detected:
+            interval = self._min_interval
+        else:
+            interval = min(self._max_interval, max(current, self._min_interval) * 2)
+        if interval != current:
+            _LOGGER.debug(
+                "Polling %s every %d seconds (%s)",
+                self.player_id,
+                interval,
+                "active" if self._activity_detected else "idle",
+            )
+            self._base_interval = interval
+
+    def _fit_update_interval(self) -> None:
+        """Poll at the wanted interval, or less often if the daily quota requires it."""
+        if self.update_interval is None:
+            # Not polling on a timer of its own
+            return
+        floor = math.ceil(self.quota.interval_floor(self.api_key))
+        interval = max(self._base_interval, floor)
+        if interval == self.update_interval.total_seconds():
+            return
+        if floor > self._base_interval:
+            _LOGGER.debug(
+                "Polling %s every %d seconds to stay within the daily quota",
+                self.player_id,
+                interval,
+            )
+        self.update_interval = timedelta(seconds=interval)
+
+    @callback
+    def _fire_match_events(self, previous: dict[str, Any], current: dict[str, Any]) -> None:
+        """Fire one event per match inferred from the counters of two refreshes."""
+        # A match also shows up in the "all" input, report it once
+        for platform in distinct_inputs(self.platforms):
+            if platform in current.get("stale_inputs", []):
+                continue
+            for mode in self.game_modes:
+                matches = infer_matches(
+                    (previous.get(platform) or {}).get(mode) or {},
+                    (current.get(platform) or {}).get(mode) or {},
+                )
+                if len(matches) > MATCH_EVENT_LIMIT:
+                    _LOGGER.debug(
+                        "Not replaying %d %s %s matches of %s",
+                        len(matches),
+                        platform,
+                        mode,
+                        self.player_id,
+                    )
+                    continue
+                for match in matches:
+                    self.hass.bus.async_fire(
+                        EVENT_MATCH_COMPLETED,
+                        {
+                            "entry_id": self.entry.entry_id,
+                            "player_id": self.player_id,
+                            "input": platform,
+                            "game_mode": mode,
+                            **match,
+                        },
+                    )
+
+    def _prepare_data(self, result: dict[str, Any]) -> dict[str, Any]:
+        """Derive the aggregates, rates and changed entities from new data."""
+        # Aggregated sensors read from this table instead of walking the data
+        result["aggregated"] = aggregate_stats(result, self.platforms, self.game_modes)
+        # Snapshots are taken when the data was fetched, not when it was loaded
+        fetched = max(result.get("input_updated", {}).values(), default=time.time())
+        if self.history.record(fetched, result):
+            self.entry.async_create_background_task(
+                self.hass,
+                async_record_stats(self.hass, self.player_id, fetched, result),
+                f"{DOMAIN} record stats {self.player_id}",
+            )
+        result["rates"] = self.history.rates(
+            time.time(), distinct_inputs(self.platforms), self.game_modes
+        )
+        self._changed_contexts = self._diff_states(result)
+        return result
 
     async def _try_fortnite_api(self) -> dict[str, Any]:
         """Try to get data from fortnite-api.com for all configured platforms."""
@@ -75,49 +520,124 @@ class FortniteDataUpdateCoordinator(DataUpdateCoordinator):
             "game_modes": self.game_modes
         }
         
-        # Get data for each API endpoint
+        # One request returns every input, so fetch once and split it up.
+        # The whole refresh shares one deadline; on a miss the last known
+        # data is kept instead of blocking the update.
+        responses = await async_fetch_all(
+            {self.player_id: self._get_player_stats},
+            REFRESH_CONCURRENCY,
+            REFRESH_DEADLINE,
+        )
+        if isinstance(response := responses[self.player_id], BaseException):
+            raise response
+        if (unchanged := self._unchanged_data(response)) is not None:
+            return unchanged
+
+        data = response.data
+        now = time.time()
+        previous = self.data or {}
+        input_updated = dict(previous.get("input_updated", {}))
+        stale_inputs = []
         for api_platform in self.platforms:
-            try:
-                platform_data = await self._get_platform_data(api_platform)
-                result[api_platform] = platform_data
-            except Exception as e:
-                _LOGGER.warning("Failed to get data for platform %s: %s", api_platform, e)
-                # Use mock data for this platform
-                result[api_platform] = self._get_mock_platform_data(api_platform)
+            if self._input_dropped(data, api_platform, previous):
+                _LOGGER.warning(
+                    "No %s stats for %s in the response, keeping the last known data",
+                    api_platform,
+                    self.player_id,
+                )
+                # Serve the last good data for this input until it revalidates
+                result[api_platform] = previous[api_platform]
+                stale_inputs.append(api_platform)
+                continue
+            result[api_platform] = self._transform_platform_data(data, api_platform)
+            input_updated[api_platform] = now
+        result["input_updated"] = input_updated
+        result["stale_inputs"] = stale_inputs
         
         return result
 
-    async def _get_platform_data(self, api_platform: str) -> dict[str, Any]:
-        """Get data for a specific platform from the API."""
-        url = "https://fortnite-api.com/v2/stats/br/v2"
-        params = {
-            "name": self.player_id,
-            "accountType": "epic",
-            "timeWindow": "lifetime",
-            "image": api_platform
-        }
-        
-        headers = {"Authorization": self.api_key}
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, headers=headers, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get("status") == 200 and "data" in data:
-                        return self._transform_platform_data(data, api_platform)
-                    else:
-                        raise Exception(f"API returned error: {data.get('error', 'Unknown error')}")
-                else:
-                    raise Exception(f"API error: {response.status}")
+    async def _get_player_stats(self) -> StatsResponse:
+        """Get the stats payload for all inputs from the API."""
+        priority, self._request_priority = self._request_priority, PRIORITY_BACKGROUND
+        response = await self.client.async_get_stats(
+            self.api_key,
+            self.player_id,
+            priority=priority,
+            etag=self._etag,
+            last_modified=self._last_modified_header,
+            newer_than=self._last_response,
+        )
+        self._last_response = time.monotonic()
+        self._etag = response.etag
+        self._last_modified_header = response.last_modified
+        return response
+
+    def _unchanged_data(self, response: StatsResponse) -> dict[str, Any] | None:
+        """Return the current data if the response holds nothing new, else None.
+
+        Also flags the refresh so listeners are not called for identical data.
+        """
+        if response.not_modified:
+            if self.data is None:
+                # Nothing to reuse, fetch unconditionally next time
+                self._etag = self._last_modified_header = None
+                raise Exception("API returned 304 Not Modified without cached data")
+            changed = False
+        else:
+            stats_data = response.data["data"]["stats"]
+            stats_last_modified = {
+                (platform, mode): ((stats_data.get(platform) or {}).get(mode) or {}).get(
+                    "lastModified", ""
+                )
+                for platform in self.platforms
+                for mode in self.game_modes
+            }
+            changed = stats_last_modified != self._stats_last_modified
+            # The first response after startup is not evidence of a match
+            self._activity_detected = changed and self._stats_last_modified is not None
+            self._stats_last_modified = stats_last_modified
+
+        if changed or self.data is None:
+            return None
+
+        _LOGGER.debug("Stats for %s unchanged, skipping update", self.player_id)
+        self.data.setdefault("input_updated", {}).update(
+            dict.fromkeys(self._fresh_inputs(self.data.get("stale_inputs", [])), time.time())
+        )
+        # Still notify listeners when recovering from a failed update
+        self._skip_listener_update = self.last_update_success
+        return self.data
+
+    def _fresh_inputs(self, stale_inputs: list[str]) -> list[str]:
+        """Return the configured inputs that are not stale."""
+        return [platform for platform in self.platforms if platform not in stale_inputs]
+
+    def _input_dropped(
+        self, data: dict, platform: str, previous: dict[str, Any]
+    ) -> bool:
+        """Return True if a mode that had matches came back missing or empty.
+
+        Counters never go away, so this is a partial response rather than
+        the player's real stats.
+        """
+        if not (previous_input := previous.get(platform)):
+            return False
+        platform_stats = data["data"]["stats"].get(platform) or {}
+        return any(
+            (previous_input.get(mode) or {}).get("matches")
+            and not platform_stats.get(mode)
+            for mode in self.game_modes
+        )
 
     def _transform_platform_data(self, data: dict, platform: str) -> dict[str, Any]:
-        """Transform API response for a specific platform."""
+        """Transform API response for a specific input (all, keyboardMouse, gamepad, touch)."""
         stats_data = data["data"]["stats"]
-        platform_stats = stats_data.get(platform, {})
+        # Inputs the player has never used come back as null
+        platform_stats = stats_data.get(platform) or {}
         
         result = {}
         for mode in self.game_modes:
-            mode_stats = platform_stats.get(mode, {})
+            mode_stats = platform_stats.get(mode) or {}
             
             # Calculate win ratio as decimal
             win_rate = mode_stats.get("winRate", 0) / 100 if mode_stats.get("winRate") else 0
@@ -144,38 +664,9 @@ class FortniteDataUpdateCoordinator(DataUpdateCoordinator):
         
         return result
 
-    def _get_mock_platform_data(self, platform: str) -> dict[str, Any]:
-        """Get mock data for a specific platform."""
-        return MOCK_DATA.get(platform, MOCK_DATA["gamepad"])
 
-    async def _get_mock_data(self) -> dict[str, Any]:
-        """Get mock data for all platforms."""
-        result = {
-            "player_id": self.player_id,
-            "platforms": self.platforms,
-            "game_modes": self.game_modes
-        }
-        
-        # Add some variation to make it feel more realistic
-        import random
-        variation = random.uniform(0.95, 1.05)
-        
-        for platform in self.platforms:
-            platform_data = {}
-            for mode in self.game_modes:
-                base_data = MOCK_DATA.get(platform, MOCK_DATA["gamepad"]).get(mode, {}).copy()
-                
-                # Update some stats with variation
-                base_data["kills"] = int(base_data["kills"] * variation)
-                base_data["matches"] = int(base_data["matches"] * variation)
-                base_data["score"] = int(base_data["score"] * variation)
-                
-                platform_data[mode] = base_data
-            
-            result[platform] = platform_data
-        
-        # Increment update count
-        self._update_count += 1
-        result["update_count"] = self._update_count
-        
-        return result
+def snapshot_storage_key(entry: ConfigEntry, player_id: str) -> str:
+    """Return the storage key of a player's persisted snapshot."""
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_ROSTER:
+        return f"{DOMAIN}.{entry.entry_id}.{slugify(player_id)}"
+    return f"{DOMAIN}.{entry.entry_id}"
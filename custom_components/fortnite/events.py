@@ -0,0 +1,49 @@
+"""Match inference from the counter changes between two refreshes."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import MATCH_COUNTER_FIELDS, PLACEMENT_FIELDS
+
+
+def infer_matches(
+    previous: dict[str, Any], current: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """Return one dict per match played between two snapshots of one input/mode.
+
+    The API only exposes lifetime counters, so matches within one interval
+    are indistinguishable: they are ordered best placement first, and kills,
+    score and minutes are split as evenly as possible between them. A
+    counter going down (a stats reset) yields no matches.
+    """
+    deltas = {
+        field: int(current.get(field) or 0) - int(previous.get(field) or 0)
+        for field in (*MATCH_COUNTER_FIELDS, *PLACEMENT_FIELDS)
+    }
+    if (played := deltas["matches"]) <= 0 or min(deltas.values()) < 0:
+        return []
+
+    matches = []
+    for index in range(played):
+        # Placement counters include better placements (top10 counts wins),
+        # so a counter that went up by n covers the n best matches
+        placement = next(
+            (field for field in PLACEMENT_FIELDS if deltas[field] > index), None
+        )
+        matches.append(
+            {
+                "match_index": index,
+                "matches_in_interval": played,
+                "won": placement == "top1",
+                "placement": placement,
+                "kills": _share(deltas["kills"], played, index),
+                "score": _share(deltas["score"], played, index),
+                "minutes_played": _share(deltas["minutes_played"], played, index),
+            }
+        )
+    return matches
+
+
+def _share(total: int, parts: int, index: int) -> int:
+    """Return part `index` of `total` split into `parts` near-equal integers."""
+    return total // parts + (1 if index < total % parts else 0)
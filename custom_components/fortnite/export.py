@@ -0,0 +1,103 @@
+"""Streaming export of the stats history to CSV or Parquet files."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import csv
+from datetime import datetime, timezone
+import os
+from typing import Any
+
+from .const import EXPORT_FORMAT_PARQUET
+from .timeseries import StatsDatabase
+
+
+def export_history(
+    database: StatsDatabase,
+    path: str,
+    file_format: str,
+    start: float,
+    end: float,
+    players: Iterable[str] | None = None,
+    inputs: Iterable[str] | None = None,
+    modes: Iterable[str] | None = None,
+) -> int:
+    """Write the stored changes in [start, end) to a file, return the row count.
+
+    Rows are read and written one chunk at a time, so memory use does not
+    depend on the amount of history. The file is written next to its final
+    path and moved into place once complete. Blocks; run it in the executor.
+    """
+    columns = ["player", "input", "mode", "timestamp", *database.counters]
+    chunks = database.iter_changes(start, end, players, inputs, modes)
+    temporary_path = f"{path}.partial"
+    try:
+        if file_format == EXPORT_FORMAT_PARQUET:
+            rows = _write_parquet(temporary_path, columns, chunks)
+        else:
+            rows = _write_csv(temporary_path, columns, _iso_timestamps(chunks))
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+    return rows
+
+
+def _iso_timestamps(
+    chunks: Iterator[list[tuple[Any, ...]]]
+) -> Iterator[list[tuple[Any, ...]]]:
+    """Replace the epoch timestamp of every row with a UTC ISO 8601 string."""
+    for chunk in chunks:
+        yield [
+            (
+                *row[:3],
+                datetime.fromtimestamp(row[3], timezone.utc).isoformat(),
+                *row[4:],
+            )
+            for row in chunk
+        ]
+
+
+def _write_csv(
+    path: str, columns: list[str], chunks: Iterator[list[tuple[Any, ...]]]
+) -> int:
+    """Write chunks of rows to a CSV file."""
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        for chunk in chunks:
+            writer.writerows(chunk)
+            rows += len(chunk)
+    return rows
+
+
+def _write_parquet(
+    path: str, columns: list[str], chunks: Iterator[list[tuple[Any, ...]]]
+) -> int:
+    """Write chunks of rows to a Parquet file, one row group per chunk."""
+    # Optional - only needed for Parquet exports
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+    import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+    schema = pa.schema(
+        [(column, pa.string()) for column in columns[:3]]
+        + [(columns[3], pa.timestamp("ms", tz="UTC"))]
+        + [(column, pa.int64()) for column in columns[4:]]
+    )
+    rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            values = [list(column) for column in zip(*chunk)]
+            values[3] = [round(timestamp * 1000) for timestamp in values[3]]
+            writer.write_table(
+                pa.Table.from_arrays(
+                    [
+                        pa.array(column, type=field.type)
+                        for column, field in zip(values, schema)
+                    ],
+                    schema=schema,
+                )
+            )
+            rows += len(chunk)
+    return rows
@@ -0,0 +1,55 @@
+"""Bounded, deadline-limited fan-out of API requests."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import logging
+from typing import TypeVar
+
+_LOGGER = logging.getLogger(__name__)
+
+_K = TypeVar("_K", bound=Hashable)
+_T = TypeVar("_T")
+
+
+async def async_fetch_all(
+    fetchers: dict[_K, Callable[[], Awaitable[_T]]],
+    limit: int,
+    deadline: float,
+) -> dict[_K, _T | BaseException]:
+    """Run fetchers with at most `limit` in flight, all under one deadline.
+
+    Every key gets either its result or the exception it raised. Fetchers
+    still running when the deadline passes are cancelled and get a
+    TimeoutError, so callers can fall back to cached values for them.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _async_fetch(fetch: Callable[[], Awaitable[_T]]) -> _T:
+        async with semaphore:
+            return await fetch()
+
+    tasks = {key: asyncio.ensure_future(_async_fetch(fetch)) for key, fetch in fetchers.items()}
+    if not tasks:
+        return {}
+    _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    for task in pending:
+        task.cancel()
+    if pending:
+        _LOGGER.debug(
+            "%d of %d request(s) missed the %.0f second refresh deadline",
+            len(pending),
+            len(tasks),
+            deadline,
+        )
+        await asyncio.wait(pending)
+
+    results: dict[_K, _T | BaseException] = {}
+    for key, task in tasks.items():
+        if task.cancelled():
+            results[key] = asyncio.TimeoutError(f"Refresh deadline passed for {key}")
+        elif (err := task.exception()) is not None:
+            results[key] = err
+        else:
+            results[key] = task.result()
+    return results
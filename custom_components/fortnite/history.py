@@ -0,0 +1,186 @@
+"""In-memory ring buffer of stat snapshots and the rates derived from it."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from typing import Any
+
+from .const import (
+    COUNTER_FIELDS,
+    GAME_MODES,
+    HISTORY_MAX_BYTES,
+    HISTORY_RATE_WINDOW,
+    HISTORY_RECENT_MATCHES,
+    INPUT_OPTIONS,
+)
+
+
+class SnapshotRing:
+    """Fixed-capacity ring of timestamped integer counter rows.
+
+    Rows are stored in two flat arrays, so memory is bounded and known up
+    front; appending to a full ring overwrites the oldest row. Indexes are
+    logical: 0 is the oldest row and len - 1 the newest.
+    """
+
+    def __init__(self, width: int, capacity: int) -> None:
+        """Initialize an empty ring of `capacity` rows of `width` counters."""
+        self.width = width
+        self.capacity = capacity
+        self._timestamps = array("d", [0.0]) * capacity
+        self._values = array("q", [0]) * (capacity * width)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored rows."""
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory held by the ring's arrays."""
+        return (
+            self._timestamps.itemsize * len(self._timestamps)
+            + self._values.itemsize * len(self._values)
+        )
+
+    def append(self, timestamp: float, values: Sequence[int]) -> None:
+        """Append a row, evicting the oldest one when full."""
+        if self._size < self.capacity:
+            slot = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._timestamps[slot] = timestamp
+        offset = slot * self.width
+        self._values[offset : offset + self.width] = array("q", values)
+
+    def timestamp(self, index: int) -> float:
+        """Return the timestamp of a row."""
+        return self._timestamps[self._slot(index)]
+
+    def row(self, index: int) -> array:
+        """Return a copy of a row."""
+        offset = self._slot(index) * self.width
+        return self._values[offset : offset + self.width]
+
+    def value(self, index: int, column: int) -> int:
+        """Return one counter of a row."""
+        return self._values[self._slot(index) * self.width + column]
+
+    def index_at(self, timestamp: float) -> int | None:
+        """Return the newest row taken at or before `timestamp`, if any."""
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamp(middle) <= timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low - 1 if low else None
+
+    def _slot(self, index: int) -> int:
+        """Return the physical slot of a logical index."""
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return (self._start + index) % self.capacity
+
+
+class PlayerHistory:
+    """Counter history of one player, per input x mode, with derived rates."""
+
+    def __init__(
+        self,
+        inputs: list[str] = INPUT_OPTIONS,
+        modes: list[str] = GAME_MODES,
+        counters: list[str] = COUNTER_FIELDS,
+        max_bytes: int = HISTORY_MAX_BYTES,
+    ) -> None:
+        """Initialize an empty history sized to fit in `max_bytes`."""
+        self.inputs = list(inputs)
+        self.modes = list(modes)
+        self.counters = list(counters)
+        self._columns: dict[tuple[str, str, str], int] = {}
+        for platform in self.inputs:
+            for mode in self.modes:
+                for counter in self.counters:
+                    self._columns[(platform, mode, counter)] = len(self._columns)
+        width = len(self._columns)
+        row_bytes = 8 * (width + 1)
+        self.ring = SnapshotRing(width, max(2, max_bytes // row_bytes))
+
+    def column(self, platform: str, mode: str, counter: str) -> int:
+        """Return the ring column of a counter."""
+        return self._columns[(platform, mode, counter)]
+
+    def record(self, timestamp: float, data: dict[str, Any]) -> bool:
+        """Append a snapshot of transformed data if any counter changed."""
+        values = array(
+            "q",
+            [
+                int(((data.get(platform) or {}).get(mode) or {}).get(counter) or 0)
+                for platform in self.inputs
+                for mode in self.modes
+                for counter in self.counters
+            ],
+        )
+        if len(self.ring) and self.ring.row(len(self.ring) - 1) == values:
+            return False
+        self.ring.append(timestamp, values)
+        return True
+
+    def rates(
+        self,
+        now: float,
+        platforms: list[str],
+        modes: list[str],
+        window: float = HISTORY_RATE_WINDOW,
+        recent_matches: int = HISTORY_RECENT_MATCHES,
+    ) -> dict[str, float | int]:
+        """Return rates derived from the history of the given inputs and modes.
+
+        Kills and matches per hour cover the last `window` seconds; the recent
+        win rate covers the last `recent_matches` matches.
+        """
+        if not (size := len(self.ring)):
+            return {}
+        platforms = [platform for platform in platforms if platform in self.inputs]
+        modes = [mode for mode in modes if mode in self.modes]
+
+        def total(index: int, counter: str) -> int:
+            return sum(
+                self.ring.value(index, self.column(platform, mode, counter))
+                for platform in platforms
+                for mode in modes
+            )
+
+        latest = size - 1
+        # Counters are constant between snapshots, so the newest row at or
+        # before the window start is the value at the window start
+        if (base := self.ring.index_at(now - window)) is not None:
+            hours = window / 3600
+        else:
+            base = 0
+            hours = (now - self.ring.timestamp(0)) / 3600
+
+        def per_hour(counter: str) -> float:
+            if hours <= 0:
+                return 0.0
+            return round(max(0, total(latest, counter) - total(base, counter)) / hours, 2)
+
+        # Walk back until the last `recent_matches` matches are covered
+        latest_matches = total(latest, "matches")
+        latest_wins = total(latest, "top1")
+        index = latest
+        while index > 0 and latest_matches - total(index, "matches") < recent_matches:
+            index -= 1
+        matches = max(0, latest_matches - total(index, "matches"))
+        wins = max(0, latest_wins - total(index, "top1"))
+
+        return {
+            "kills_per_hour": per_hour("kills"),
+            "matches_per_hour": per_hour("matches"),
+            "recent_win_rate": round(wins / matches * 100, 1) if matches else 0.0,
+            "recent_matches": matches,
+        }
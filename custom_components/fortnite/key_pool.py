@@ -0,0 +1,113 @@
+"""Pool of fortnite-api.com keys that requests are spread across."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import time
+
+from .const import (
+    KEY_COOLDOWN,
+    KEY_INVALID_COOLDOWN,
+    KEY_MAX_COOLDOWN,
+    KEY_THROTTLE_SMOOTHING,
+)
+from .quota import QuotaAccountant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class KeyHealth:
+    """Recent outcome of the requests sent with one key."""
+
+    throttled: float = 0.0  # smoothed share of requests answered with 429
+    failures: int = 0  # consecutive 401/429 answers
+    available_at: float = 0.0  # monotonic time the key is back in rotation
+    last_used: float = 0.0
+
+
+class ApiKeyPool:
+    """Pick the key for every request from the domain-wide pool.
+
+    Without pooled keys every request keeps the key of its config entry.
+    Once keys are pooled, entry keys join the pool and each request goes
+    out with the key that has the most quota left, discounted by its recent
+    share of 429 answers; the least recently used key wins ties. Keys
+    answering 401 or 429 sit out a cooldown that doubles while they keep
+    failing.
+    """
+
+    def __init__(self, keys: list[str], quota: QuotaAccountant | None = None) -> None:
+        """Initialize the pool with the keys of the domain configuration."""
+        self.quota = quota
+        self._health: dict[str, KeyHealth] = {key: KeyHealth() for key in keys}
+        if quota is not None:
+            quota.pool(self._health)
+
+    @property
+    def active(self) -> bool:
+        """Return True if requests rotate over pooled keys."""
+        return bool(self._health)
+
+    @property
+    def keys(self) -> list[str]:
+        """Return the pooled keys."""
+        return list(self._health)
+
+    def select(self, api_key: str) -> str:
+        """Return the key to send a request with instead of `api_key`."""
+        if not self.active:
+            return api_key
+        if api_key not in self._health:
+            self._health[api_key] = KeyHealth()
+            if self.quota is not None:
+                self.quota.pool(self._health)
+
+        now = time.monotonic()
+        available = [key for key, health in self._health.items() if health.available_at <= now]
+        if not available:
+            # Every key is cooling down - use the one that recovers first
+            key = min(self._health, key=lambda key: self._health[key].available_at)
+        else:
+            key = max(
+                available,
+                key=lambda key: (self._score(key), -self._health[key].last_used),
+            )
+        self._health[key].last_used = now
+        return key
+
+    def record_success(self, api_key: str) -> None:
+        """Note a request the key was accepted for."""
+        if (health := self._health.get(api_key)) is None:
+            return
+        health.throttled *= 1 - KEY_THROTTLE_SMOOTHING
+        health.failures = 0
+
+    def record_failure(
+        self, api_key: str, status: int, retry_after: float | None = None
+    ) -> None:
+        """Take a key out of rotation after a 401 or 429 answer."""
+        if (health := self._health.get(api_key)) is None:
+            return
+        health.throttled *= 1 - KEY_THROTTLE_SMOOTHING
+        if status == 429:
+            health.throttled += KEY_THROTTLE_SMOOTHING
+            cooldown = min(KEY_MAX_COOLDOWN, KEY_COOLDOWN * 2**health.failures)
+            cooldown = max(cooldown, retry_after or 0.0)
+        else:
+            cooldown = KEY_INVALID_COOLDOWN
+        health.failures += 1
+        health.available_at = time.monotonic() + cooldown
+        _LOGGER.warning(
+            "API key #%d answered %d, out of rotation for %.0f seconds",
+            list(self._health).index(api_key) + 1,
+            status,
+            cooldown,
+        )
+
+    def _score(self, api_key: str) -> float:
+        """Return how much a key should be preferred, higher is better."""
+        remaining = 1.0
+        if self.quota is not None and self.quota.daily_quota is not None:
+            remaining = float(self.quota.key_remaining(api_key))
+        return remaining * (1 - self._health[api_key].throttled)
@@ -0,0 +1,157 @@
+"""Daily request budget of the fortnite-api.com keys in use."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+import hashlib
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_DAILY_QUOTA,
+    DATA_DOMAIN_CONFIG,
+    DATA_QUOTA_ACCOUNTANT,
+    DOMAIN,
+    QUOTA_SAVE_DELAY,
+    QUOTA_STORAGE_VERSION,
+    SIGNAL_QUOTA_UPDATED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def quota_key(api_key: str) -> str:
+    """Return the id a key is counted under, so keys are never stored."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+class QuotaAccountant:
+    """Count the requests sent with every API key per UTC day.
+
+    Counts are persisted, so a restart does not forget the requests already
+    spent today. With a daily quota configured, the accountant also works
+    out how often each player may be polled for the rest of the day to stay
+    within the budget. Pooled keys share one budget, the sum of their quotas.
+    """
+
+    def __init__(self, hass: HomeAssistant, daily_quota: int | None = None) -> None:
+        """Initialize the accountant; counts are loaded with async_load."""
+        self.hass = hass
+        self.daily_quota = daily_quota
+        self._store: Store[dict] = Store(hass, QUOTA_STORAGE_VERSION, f"{DOMAIN}.quota")
+        self._day = dt_util.utcnow().date().isoformat()
+        self._counts: dict[str, int] = {}
+        self._players: dict[str, tuple[str, int]] = {}
+        self._pool: set[str] = set()
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Add today's persisted counts to the requests counted so far."""
+        if self._loaded:
+            return
+        self._loaded = True
+        stored = await self._store.async_load() or {}
+        self._roll_over()
+        if stored.get("day") == self._day:
+            for key, count in stored.get("counts", {}).items():
+                self._counts[key] = self._counts.get(key, 0) + count
+
+    @callback
+    def record(self, api_key: str) -> None:
+        """Count one request sent with a key."""
+        self._roll_over()
+        key = quota_key(api_key)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        self._store.async_delay_save(
+            lambda: {"day": self._day, "counts": dict(self._counts)}, QUOTA_SAVE_DELAY
+        )
+        async_dispatcher_send(self.hass, SIGNAL_QUOTA_UPDATED, key)
+
+    @callback
+    def pool(self, api_keys: Iterable[str]) -> None:
+        """Share one budget between the keys requests are rotated over."""
+        self._pool = {quota_key(api_key) for api_key in api_keys}
+
+    def budget_keys(self, api_key: str) -> set[str]:
+        """Return the ids of the keys sharing a budget with a key."""
+        if (key := quota_key(api_key)) in self._pool:
+            return self._pool
+        return {key}
+
+    @callback
+    def track(self, entry_id: str, api_key: str, players: int) -> None:
+        """Count the players an entry polls with a key."""
+        self._players[entry_id] = (quota_key(api_key), players)
+
+    @callback
+    def untrack(self, entry_id: str) -> None:
+        """Stop counting the players of an unloaded entry."""
+        self._players.pop(entry_id, None)
+
+    def used(self, api_key: str) -> int:
+        """Return the requests sent today with a key and the keys pooled with it."""
+        self._roll_over()
+        return sum(self._counts.get(key, 0) for key in self.budget_keys(api_key))
+
+    def remaining(self, api_key: str) -> int | None:
+        """Return the requests left today on a key's budget, None without a quota."""
+        if self.daily_quota is None:
+            return None
+        keys = self.budget_keys(api_key)
+        return max(0, self.daily_quota * len(keys) - self.used(api_key))
+
+    def key_remaining(self, api_key: str) -> int | None:
+        """Return the requests left today on one key alone, None without a quota."""
+        if self.daily_quota is None:
+            return None
+        self._roll_over()
+        return max(0, self.daily_quota - self._counts.get(quota_key(api_key), 0))
+
+    def players(self, api_key: str) -> int:
+        """Return the players polled on a key's budget across all entries."""
+        keys = self.budget_keys(api_key)
+        return sum(count for owner, count in self._players.values() if owner in keys)
+
+    def resets_at(self) -> datetime:
+        """Return when the counts start over."""
+        return datetime.fromisoformat(self._day).replace(
+            tzinfo=dt_util.UTC
+        ) + timedelta(days=1)
+
+    def interval_floor(self, api_key: str) -> float:
+        """Return the shortest per-player poll interval the budget allows.
+
+        The remaining budget is spread over the rest of the day, so the
+        floor drops again when fewer requests than planned were spent and
+        rises after bursts of manual refreshes. Zero without a quota.
+        """
+        if self.daily_quota is None or not (players := self.players(api_key)):
+            return 0.0
+        seconds_left = (self.resets_at() - dt_util.utcnow()).total_seconds()
+        if not (remaining := self.remaining(api_key)):
+            # Spent - wait for the reset
+            return max(seconds_left, 0.0)
+        return players * seconds_left / remaining
+
+    def _roll_over(self) -> None:
+        """Start counting from zero on a new UTC day."""
+        if (today := dt_util.utcnow().date().isoformat()) != self._day:
+            _LOGGER.debug("New quota day %s, resetting request counts", today)
+            self._day = today
+            self._counts = {}
+
+
+@callback
+def async_get_quota_accountant(hass: HomeAssistant) -> QuotaAccountant:
+    """Return the domain-wide quota accountant, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (accountant := domain_data.get(DATA_QUOTA_ACCOUNTANT)) is None:
+        domain_config = domain_data.get(DATA_DOMAIN_CONFIG, {})
+        accountant = domain_data[DATA_QUOTA_ACCOUNTANT] = QuotaAccountant(
+            hass, domain_config.get(CONF_DAILY_QUOTA)
+        )
+    return accountant
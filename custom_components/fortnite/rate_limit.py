@@ -0,0 +1,86 @@
+"""Domain-wide token bucket rate limiter for fortnite-api.com requests."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from .const import PRIORITY_BACKGROUND
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket shared by every coordinator, serving waiters by priority.
+
+    Lower priority values are served first; waiters with the same priority
+    are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize the bucket with `rate` tokens per second and `burst` capacity."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    @property
+    def pending(self) -> int:
+        """Return the number of requests waiting for a token."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int = PRIORITY_BACKGROUND) -> None:
+        """Wait until a token is available for a request of the given priority."""
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        _LOGGER.debug(
+            "Rate limiting: %d request(s) queued, priority %d", len(self._waiters), priority
+        )
+        self._schedule()
+        # Cancelled waiters are skipped by _dispatch
+        await future
+
+    def cancel(self) -> None:
+        """Cancel the wakeup timer and fail every waiter."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.cancel()
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _dispatch(self) -> None:
+        """Hand out available tokens to the highest priority waiters."""
+        self._wakeup = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        """Schedule the next dispatch for when a token will be available."""
+        if not self._waiters or self._wakeup is not None:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
@@ -0,0 +1,160 @@
+"""Roster of many players in one config entry, refreshed in staggered slices."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import logging
+import math
+import re
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change, async_track_time_interval
+
+from .api import FortniteApiClient
+from .const import (
+    CONF_API_KEY,
+    CONF_PLAYERS,
+    DEFAULT_SCAN_INTERVAL,
+    REFRESH_CONCURRENCY,
+    ROSTER_SLICE_INTERVAL,
+)
+from .coordinator import FortniteDataUpdateCoordinator
+from .fetch import async_fetch_all
+from .quota import async_get_quota_accountant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_roster(text: str) -> list[str]:
+    """Return the unique Epic names of a pasted list, one per line or comma separated."""
+    players: dict[str, str] = {}
+    for name in re.split(r"[\n,;]+", text):
+        if (name := name.strip()) and name.lower() not in players:
+            players[name.lower()] = name
+    return list(players.values())
+
+
+class FortniteRoster:
+    """Players of a roster entry, refreshed by one timer in staggered slices.
+
+    Every player has its own coordinator, without a timer of its own. Each
+    tick refreshes the next slice of players, so the whole roster is
+    refreshed once per DEFAULT_SCAN_INTERVAL and requests are spread evenly
+    instead of all being due at once. When the daily quota of the key can't
+    cover that, ticks are skipped so the roster cycle stretches to fit.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, client: FortniteApiClient
+    ) -> None:
+        """Initialize the roster."""
+        self.hass = hass
+        self.entry = entry
+        self.coordinators = {
+            player_id: FortniteDataUpdateCoordinator(
+                hass, entry, client, player_id=player_id, update_interval=None
+            )
+            for player_id in entry.data[CONF_PLAYERS]
+        }
+        self.slices = max(1, DEFAULT_SCAN_INTERVAL // ROSTER_SLICE_INTERVAL)
+        self._next_slice = 0
+        self._skip_ticks = 0
+        self.quota = async_get_quota_accountant(hass)
+
+    @property
+    def long_term_statistics(self) -> bool:
+        """Return True if the roster records long-term statistics."""
+        return any(
+            coordinator.long_term_statistics for coordinator in self.coordinators.values()
+        )
+
+    async def async_load_snapshots(self) -> list[str]:
+        """Load every persisted snapshot, return the players without one."""
+        missing = []
+        for player_id, coordinator in self.coordinators.items():
+            if not await coordinator.async_load_snapshot():
+                missing.append(player_id)
+        return missing
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start refreshing the roster, return a callback that stops it."""
+        unsubscribers = [
+            async_track_time_interval(
+                self.hass,
+                self._async_refresh_slice,
+                timedelta(seconds=ROSTER_SLICE_INTERVAL),
+            )
+        ]
+        if self.long_term_statistics:
+            unsubscribers.append(
+                async_track_time_change(
+                    self.hass, self._async_import_statistics, minute=0, second=0
+                )
+            )
+
+        @callback
+        def _async_stop() -> None:
+            for unsubscribe in unsubscribers:
+                unsubscribe()
+            for coordinator in self.coordinators.values():
+                coordinator.async_cancel_revalidation()
+
+        return _async_stop
+
+    async def async_refresh_players(self, player_ids: list[str]) -> None:
+        """Refresh some players now, a few at a time."""
+        await async_fetch_all(
+            {
+                player_id: self.coordinators[player_id].async_refresh
+                for player_id in player_ids
+            },
+            REFRESH_CONCURRENCY,
+            ROSTER_SLICE_INTERVAL * self.slices,
+        )
+
+    async def _async_refresh_slice(self, _now: datetime) -> None:
+        """Refresh the next slice of players."""
+        if self._skip_ticks:
+            self._skip_ticks -= 1
+            return
+        floor = self.quota.interval_floor(self.entry.data[CONF_API_KEY])
+        self._skip_ticks = max(
+            0, math.ceil(floor / self.slices / ROSTER_SLICE_INTERVAL) - 1
+        )
+        players = list(self.coordinators)
+        size = math.ceil(len(players) / self.slices)
+        index, self._next_slice = self._next_slice, (self._next_slice + 1) % self.slices
+        if not (player_ids := players[index * size : (index + 1) * size]):
+            return
+        _LOGGER.debug(
+            "Refreshing roster slice %d/%d (%d players)",
+            index + 1,
+            self.slices,
+            len(player_ids),
+        )
+        results = await async_fetch_all(
+            {
+                player_id: self.coordinators[player_id].async_refresh
+                for player_id in player_ids
+            },
+            REFRESH_CONCURRENCY,
+            ROSTER_SLICE_INTERVAL,
+        )
+        timed_out = [
+            player_id
+            for player_id, result in results.items()
+            if isinstance(result, asyncio.TimeoutError)
+        ]
+        if timed_out:
+            _LOGGER.warning(
+                "Roster refresh of %d player(s) did not finish in time", len(timed_out)
+            )
+
+    @callback
+    def _async_import_statistics(self, now: datetime) -> None:
+        """Import the hourly statistics of every player."""
+        for coordinator in self.coordinators.values():
+            coordinator.async_import_hourly_statistics(now)
+
@@ -0,0 +1,76 @@
+"""Domain-wide poll scheduler spreading config entries over the scan interval."""
+from __future__ import annotations
+
+import asyncio
+import zlib
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DATA_POLL_SCHEDULER,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    SCHEDULE_SAVE_DELAY,
+    SCHEDULE_STORAGE_VERSION,
+)
+
+
+class PollScheduler:
+    """Give every entry a fixed phase within the scan interval.
+
+    A new entry takes the middle of the largest gap between the phases
+    already handed out, so entries stay evenly spread as they are added.
+    Phases are relative to the wall clock and persisted, so entries keep
+    their slot across restarts instead of all polling at startup. The
+    coordinators schedule their polls at these phases themselves.
+    """
+
+    def __init__(self, hass: HomeAssistant, interval: float = DEFAULT_SCAN_INTERVAL) -> None:
+        """Initialize the scheduler; offsets are loaded on first use."""
+        self.hass = hass
+        self.interval = interval
+        self._store: Store[dict[str, float]] = Store(
+            hass, SCHEDULE_STORAGE_VERSION, f"{DOMAIN}.schedule"
+        )
+        self._offsets: dict[str, float] | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_offset(self, entry_id: str) -> float:
+        """Return the phase of an entry, assigning one if it has none."""
+        async with self._lock:
+            if self._offsets is None:
+                self._offsets = await self._store.async_load() or {}
+            if (offset := self._offsets.get(entry_id)) is None:
+                offset = self._offsets[entry_id] = self._free_offset(entry_id)
+                self._store.async_delay_save(lambda: dict(self._offsets), SCHEDULE_SAVE_DELAY)
+            return offset
+
+    async def async_remove(self, entry_id: str) -> None:
+        """Release the phase of a removed entry."""
+        async with self._lock:
+            if self._offsets is None:
+                self._offsets = await self._store.async_load() or {}
+            if self._offsets.pop(entry_id, None) is not None:
+                self._store.async_delay_save(lambda: dict(self._offsets), SCHEDULE_SAVE_DELAY)
+
+    def _free_offset(self, entry_id: str) -> float:
+        """Return the middle of the largest gap between the assigned phases."""
+        offsets = sorted(self._offsets.values())
+        if not offsets:
+            # Deterministic for the first entry too
+            return float(zlib.crc32(entry_id.encode()) % int(self.interval))
+        best_start, best_gap = offsets[-1], offsets[0] + self.interval - offsets[-1]
+        for previous, current in zip(offsets, offsets[1:]):
+            if current - previous > best_gap:
+                best_start, best_gap = previous, current - previous
+        return round((best_start + best_gap / 2) % self.interval, 3)
+
+
+@callback
+def async_get_poll_scheduler(hass: HomeAssistant) -> PollScheduler:
+    """Return the domain-wide poll scheduler, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (scheduler := domain_data.get(DATA_POLL_SCHEDULER)) is None:
+        scheduler = domain_data[DATA_POLL_SCHEDULER] = PollScheduler(hass)
+    return scheduler
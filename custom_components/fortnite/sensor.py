@@ -1,43 +1,131 @@
 """Consolidated sensor platform for Fortnite Stats - groups platforms by API endpoint."""
 from __future__ import annotations
 
+from datetime import datetime
 import logging
+import time
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_platform, entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, CONF_AGGREGATED_SENSORS, AGGREGATED_SENSOR_TYPES
+from .aggregation import distinct_inputs, mode_sensor_value
+from .api import STATS_URL, FortniteApiClient, async_get_api_client
+from .circuit_breaker import STATE_OPEN
+from .const import (
+    AGGREGATED_SELECTIONS,
+    AGGREGATED_SENSOR_TYPES,
+    CONF_AGGREGATED_SENSORS,
+    CONF_API_KEY,
+    CONF_ENTITY_BATCH_SIZE,
+    CONF_PLAYER_ID,
+    CONF_ROSTER_NAME,
+    DATA_DOMAIN_CONFIG,
+    DEFAULT_ENTITY_BATCH_SIZE,
+    DOMAIN,
+    INPUT_DISPLAY_NAMES,
+    SENSOR_DATA_KEYS,
+    SIGNAL_QUOTA_UPDATED,
+)
 from .coordinator import FortniteDataUpdateCoordinator
+from .quota import QuotaAccountant, async_get_quota_accountant
+from .roster import FortniteRoster
 
 _LOGGER = logging.getLogger(__name__)
 
 # Define all the sensors we want to create
+# (state classes only apply with long-term statistics enabled)
 SENSOR_TYPES = {
-    "eliminations": {"name": "Eliminations", "unit": "eliminations", "icon": "mdi:target"},
-    "wins": {"name": "Wins", "unit": "wins", "icon": "mdi:trophy"},
-    "matches": {"name": "Matches", "unit": "matches", "icon": "mdi:gamepad-variant"},
-    "win_rate": {"name": "Win Rate", "unit": "%", "icon": "mdi:percent"},
-    "kd": {"name": "K/D Ratio", "unit": "ratio", "icon": "mdi:sword-cross"},
-    "top10": {"name": "Top 10 Finishes", "unit": "finishes", "icon": "mdi:medal"},
-    "top25": {"name": "Top 25 Finishes", "unit": "finishes", "icon": "mdi:medal"},
-    "score": {"name": "Score", "unit": "points", "icon": "mdi:scoreboard"},
-    "minutes_played": {"name": "Minutes Played", "unit": "min", "icon": "mdi:clock"},
+    "eliminations": {"name": "Eliminations", "unit": "eliminations", "icon": "mdi:target", "state_class": SensorStateClass.TOTAL_INCREASING},
+    "wins": {"name": "Wins", "unit": "wins", "icon": "mdi:trophy", "state_class": SensorStateClass.TOTAL_INCREASING},
+    "matches": {"name": "Matches", "unit": "matches", "icon": "mdi:gamepad-variant", "state_class": SensorStateClass.TOTAL_INCREASING},
+    "win_rate": {"name": "Win Rate", "unit": "%", "icon": "mdi:percent", "state_class": SensorStateClass.MEASUREMENT},
+    "kd": {"name": "K/D Ratio", "unit": "ratio", "icon": "mdi:sword-cross", "state_class": SensorStateClass.MEASUREMENT},
+    "top10": {"name": "Top 10 Finishes", "unit": "finishes", "icon": "mdi:medal", "state_class": SensorStateClass.TOTAL_INCREASING},
+    "top25": {"name": "Top 25 Finishes", "unit": "finishes", "icon": "mdi:medal", "state_class": SensorStateClass.TOTAL_INCREASING},
+    "score": {"name": "Score", "unit": "points", "icon": "mdi:scoreboard", "state_class": SensorStateClass.TOTAL_INCREASING},
+    "minutes_played": {"name": "Minutes Played", "unit": "min", "icon": "mdi:clock", "state_class": SensorStateClass.TOTAL_INCREASING},
 }
 
+# Rates derived from the coordinator's recent snapshot history
+RATE_SENSOR_TYPES = {
+    "kills_per_hour": {"name": "Kills Per Hour", "unit": "kills/h", "icon": "mdi:target", "state_class": SensorStateClass.MEASUREMENT},
+    "matches_per_hour": {"name": "Matches Per Hour", "unit": "matches/h", "icon": "mdi:gamepad-variant", "state_class": SensorStateClass.MEASUREMENT},
+    "recent_win_rate": {"name": "Recent Win Rate", "unit": "%", "icon": "mdi:percent", "state_class": SensorStateClass.MEASUREMENT},
+}
+
+# Compact entities show matches as their state and every stat as attributes
+COMPACT_STATE_KEY = "matches"
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Fortnite Stats sensors based on a config entry."""
-    coordinator: FortniteDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    tracker = hass.data[DOMAIN][config_entry.entry_id]
+
+    # A roster entry has one coordinator per player
+    if isinstance(tracker, FortniteRoster):
+        coordinators = list(tracker.coordinators.values())
+    else:
+        coordinators = [tracker]
+
+    # Register in batches and wait for each one, so thousands of entities
+    # don't hold the event loop in one go
+    batch_size = (
+        hass.data[DOMAIN]
+        .get(DATA_DOMAIN_CONFIG, {})
+        .get(CONF_ENTITY_BATCH_SIZE, DEFAULT_ENTITY_BATCH_SIZE)
+    )
+    platform = entity_platform.async_get_current_platform()
+    started = time.monotonic()
+    pending: list[SensorEntity] = []
+    added = 0
+    for coordinator in coordinators:
+        pending.extend(_create_player_entities(hass, config_entry, coordinator))
+        while len(pending) >= batch_size:
+            batch, pending = pending[:batch_size], pending[batch_size:]
+            await platform.async_add_entities(batch)
+            added += len(batch)
+    # Fewer than batch_size are left, so the quota sensor joins the last batch
+    pending.append(
+        FortniteQuotaSensor(
+            async_get_quota_accountant(hass), async_get_api_client(hass), config_entry
+        )
+    )
+    await platform.async_add_entities(pending)
+    added += len(pending)
 
+    _LOGGER.debug(
+        "Set up %d sensors for %s in %.2f seconds",
+        added,
+        config_entry.title,
+        time.monotonic() - started,
+    )
+
+
+def _create_player_entities(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    coordinator: FortniteDataUpdateCoordinator,
+) -> list[SensorEntity]:
+    """Create the sensors of one player."""
     # Create sensors for consolidated platforms and game modes
     entities = []
+
+    def sensor_class(cls: type[SensorEntity]) -> type[SensorEntity]:
+        """Return the class to create, its statistics variant if recording them."""
+        if coordinator.long_term_statistics:
+            return STATISTICS_SENSOR_CLASSES[cls]
+        return cls
     
     # Get configured platforms and game modes
     platforms = config_entry.data.get("platforms", ["gamepad", "keyboardMouse"])
@@ -46,9 +134,16 @@ async def async_setup_entry(
     # Create individual platform/mode sensors
     for platform in platforms:
         for game_mode in game_modes:
+            if coordinator.compact_entities:
+                entities.append(
+                    sensor_class(FortniteCompactSensor)(
+                        coordinator, config_entry, platform, game_mode
+                    )
+                )
+                continue
             for sensor_key, sensor_info in SENSOR_TYPES.items():
                 entities.append(
-                    FortniteSensor(
+                    sensor_class(FortniteSensor)(
                         coordinator, 
                         config_entry, 
                         sensor_key, 
@@ -61,9 +156,16 @@ async def async_setup_entry(
     # Create aggregated sensors if enabled
     if config_entry.data.get(CONF_AGGREGATED_SENSORS, True):
         for aggregated_type in AGGREGATED_SENSOR_TYPES.keys():
+            if coordinator.compact_entities:
+                entities.append(
+                    sensor_class(FortniteCompactAggregatedSensor)(
+                        coordinator, config_entry, aggregated_type
+                    )
+                )
+                continue
             for sensor_key, sensor_info in SENSOR_TYPES.items():
                 entities.append(
-                    FortniteAggregatedSensor(
+                    sensor_class(FortniteAggregatedSensor)(
                         coordinator,
                         config_entry,
                         sensor_key,
@@ -72,10 +174,84 @@ async def async_setup_entry(
                     )
                 )
     
-    async_add_entities(entities)
+    # Create rate sensors over all configured platforms and modes
+    for sensor_key, sensor_info in RATE_SENSOR_TYPES.items():
+        entities.append(
+            sensor_class(FortniteRateSensor)(
+                coordinator, config_entry, sensor_key, sensor_info
+            )
+        )
+    
+    # Cells never played start disabled and are enabled once played
+    unplayed: dict[tuple[str, str], list[str]] = {}
+    for entity in entities:
+        if (cell := getattr(entity, "cell", None)) and not entity.entity_registry_enabled_default:
+            unplayed.setdefault(cell, []).append(entity.unique_id)
+    if unplayed:
+        config_entry.async_on_unload(
+            _async_enable_played_cells(hass, coordinator, unplayed)
+        )
 
+    return entities
 
-class FortniteSensor(CoordinatorEntity, SensorEntity):
+
+@callback
+def _async_enable_played_cells(
+    hass: HomeAssistant,
+    coordinator: FortniteDataUpdateCoordinator,
+    unplayed: dict[tuple[str, str], list[str]],
+) -> CALLBACK_TYPE:
+    """Enable the entities of unplayed cells we disabled once a match is played."""
+    registry = er.async_get(hass)
+
+    @callback
+    def _async_check_cells() -> None:
+        for cell in [cell for cell in unplayed if coordinator.cell_played(*cell)]:
+            for unique_id in unplayed.pop(cell):
+                entity_id = registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+                if entity_id is None:
+                    continue
+                # Entities the user disabled stay disabled
+                if (
+                    registry.async_get(entity_id).disabled_by
+                    is er.RegistryEntryDisabler.INTEGRATION
+                ):
+                    _LOGGER.debug("Enabling %s, its first match was played", entity_id)
+                    registry.async_update_entity(entity_id, disabled_by=None)
+
+    return coordinator.async_add_listener(_async_check_cells)
+
+
+class _CachedCoordinatorEntity(CoordinatorEntity, SensorEntity):
+    """Coordinator sensor computing its state once per coordinator update.
+
+    Subclasses implement _compute_state.
+    """
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Cache the new state before it is written."""
+        self._update_from_coordinator()
+        super()._handle_coordinator_update()
+
+    def _update_from_coordinator(self) -> None:
+        """Compute the state and attributes once per coordinator update."""
+        if not self.coordinator.data:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+
+        (
+            self._attr_native_value,
+            self._attr_extra_state_attributes,
+        ) = self._compute_state()
+
+    def _compute_state(self) -> tuple[Any, dict[str, Any]]:
+        """Return the state and attributes for the coordinator's current data."""
+        raise NotImplementedError
+
+
+class FortniteSensor(_CachedCoordinatorEntity):
     """Representation of a Fortnite Stats sensor."""
 
     def __init__(
@@ -88,30 +264,49 @@ class FortniteSensor(CoordinatorEntity, SensorEntity):
         game_mode: str
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        # The coordinator only notifies sensors whose context changed
+        super().__init__(coordinator, context=(platform, game_mode, sensor_key))
         self._config_entry = config_entry
         self._sensor_key = sensor_key
         self._sensor_info = sensor_info
         self._platform = platform
         self._game_mode = game_mode
+        self.cell = (platform, game_mode)
+        self._attr_entity_registry_enabled_default = coordinator.cell_played(*self.cell)
         
         # Set up the sensor properties
         platform_display = self._get_platform_display_name(platform)
-        self._attr_name = f"Fortnite {config_entry.data['player_id']} {platform_display} {game_mode.title()} {sensor_info['name']}"
-        self._attr_unique_id = f"{config_entry.entry_id}_{config_entry.data['player_id']}_{platform}_{game_mode}_{sensor_key}"
+        self._attr_name = f"Fortnite {coordinator.player_id} {platform_display} {game_mode.title()} {sensor_info['name']}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{coordinator.player_id}_{platform}_{game_mode}_{sensor_key}"
         self._attr_icon = sensor_info["icon"]
         self._attr_native_unit_of_measurement = sensor_info["unit"]
+        if coordinator.long_term_statistics:
+            self._attr_state_class = sensor_info["state_class"]
+
+        # Attributes that never change, shared by every cached attributes dict
+        self._static_attributes = {
+            "player_id": coordinator.player_id,
+            "platform": platform,
+            "game_mode": game_mode,
+        }
+        self._update_from_coordinator()
 
     def _get_platform_display_name(self, platform: str) -> str:
         """Get a user-friendly display name for the platform."""
-        platform_names = {
-            "gamepad": "Console",
-            "keyboardMouse": "PC"
+        return INPUT_DISPLAY_NAMES.get(platform, platform.title())
+
+    def _compute_state(self) -> tuple[Any, dict[str, Any]]:
+        """Return the stat of this input and mode."""
+        platform_data = self.coordinator.data.get(self._platform, {})
+        value = mode_sensor_value(platform_data.get(self._game_mode, {}), self._sensor_key)
+        return value, {
+            **self._static_attributes,
+            "stale": self.coordinator.input_stale(self._platform),
+            "data_fetched_at": self.coordinator.data_fetched_at([self._platform]),
         }
-        return platform_names.get(platform, platform.title())
 
 
-class FortniteAggregatedSensor(CoordinatorEntity, SensorEntity):
+class FortniteAggregatedSensor(_CachedCoordinatorEntity):
     """Representation of an aggregated Fortnite Stats sensor."""
 
     def __init__(
@@ -123,7 +318,7 @@ class FortniteAggregatedSensor(CoordinatorEntity, SensorEntity):
         aggregated_type: str
     ) -> None:
         """Initialize the aggregated sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=(aggregated_type, sensor_key))
         self._config_entry = config_entry
         self._sensor_key = sensor_key
         self._sensor_info = sensor_info
@@ -131,148 +326,319 @@ class FortniteAggregatedSensor(CoordinatorEntity, SensorEntity):
         
         # Set up the sensor properties
         aggregated_display = AGGREGATED_SENSOR_TYPES[aggregated_type]
-        self._attr_name = f"Fortnite {config_entry.data['player_id']} {aggregated_display} {sensor_info['name']}"
-        self._attr_unique_id = f"{config_entry.entry_id}_{config_entry.data['player_id']}_{aggregated_type}_{sensor_key}"
+        self._attr_name = f"Fortnite {coordinator.player_id} {aggregated_display} {sensor_info['name']}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{coordinator.player_id}_{aggregated_type}_{sensor_key}"
         self._attr_icon = sensor_info["icon"]
         self._attr_native_unit_of_measurement = sensor_info["unit"]
+        if coordinator.long_term_statistics:
+            self._attr_state_class = sensor_info["state_class"]
 
-    @property
-    def native_value(self) -> float | int | None:
-        """Return the aggregated state of the sensor."""
-        if not self.coordinator.data:
-            return None
-            
-        # Calculate aggregated value based on type
-        total_value = 0
-        platforms = self.coordinator.data.get("platforms", ["gamepad", "keyboardMouse"])
-        game_modes = self.coordinator.data.get("game_modes", ["solo", "duo", "squad"])
-        
-        # Map sensor keys to data keys
-        data_mapping = {
-            "eliminations": "kills",
-            "wins": "top1",
-            "matches": "matches",
-            "win_rate": "win_ratio",
-            "kd": "kd",
-            "top10": "top10",
-            "top25": "top25",
-            "score": "score",
-            "minutes_played": "minutes_played"
+        # The selection is fixed for the lifetime of the entity
+        self._platforms_included = self._get_platforms_included()
+        self._static_attributes = {
+            "player_id": coordinator.player_id,
+            "aggregated_type": aggregated_type,
+            "aggregated_display": aggregated_display,
+            "platforms_included": self._platforms_included,
+            "modes_included": self._get_modes_included(),
         }
-        
-        data_key = data_mapping.get(self._sensor_key)
-        if not data_key:
-            return None
-            
-        # Determine which platforms and modes to aggregate
-        platforms_to_aggregate = []
-        modes_to_aggregate = []
-        
-        if self._aggregated_type == "all_platforms_all_modes":
-            platforms_to_aggregate = platforms
-            modes_to_aggregate = game_modes
-        elif self._aggregated_type == "console_all_modes":
-            platforms_to_aggregate = ["gamepad"]
-            modes_to_aggregate = game_modes
-        elif self._aggregated_type == "pc_all_modes":
-            platforms_to_aggregate = ["keyboardMouse"]
-            modes_to_aggregate = game_modes
-        elif self._aggregated_type == "all_platforms_solo":
-            platforms_to_aggregate = platforms
-            modes_to_aggregate = ["solo"]
-        elif self._aggregated_type == "all_platforms_duo":
-            platforms_to_aggregate = platforms
-            modes_to_aggregate = ["duo"]
-        elif self._aggregated_type == "all_platforms_squad":
-            platforms_to_aggregate = platforms
-            modes_to_aggregate = ["squad"]
-        
-        # Sum up values from selected platforms and modes
-        for platform in platforms_to_aggregate:
-            platform_data = self.coordinator.data.get(platform, {})
-            for mode in modes_to_aggregate:
-                mode_data = platform_data.get(mode, {})
-                value = mode_data.get(data_key, 0)
-                if value is not None:
-                    total_value += value
-        
-        # Handle special cases
-        if self._sensor_key == "win_rate" and total_value > 0:
-            # For win rate, we need to calculate the weighted average
-            total_matches = 0
-            weighted_wins = 0
-            for platform in platforms_to_aggregate:
-                platform_data = self.coordinator.data.get(platform, {})
-                for mode in modes_to_aggregate:
-                    mode_data = platform_data.get(mode, {})
-                    matches = mode_data.get("matches", 0)
-                    wins = mode_data.get("top1", 0)
-                    if matches > 0:
-                        total_matches += matches
-                        weighted_wins += wins
-            
-            if total_matches > 0:
-                return round((weighted_wins / total_matches) * 100, 1)
-            return 0.0
-        elif self._sensor_key == "kd" and total_value > 0:
-            # For K/D ratio, calculate weighted average
-            total_eliminations = 0
-            total_deaths = 0
-            for platform in platforms_to_aggregate:
-                platform_data = self.coordinator.data.get(platform, {})
-                for mode in modes_to_aggregate:
-                    mode_data = platform_data.get(mode, {})
-                    eliminations = mode_data.get("kills", 0)
-                    matches = mode_data.get("matches", 0)
-                    if matches > 0:
-                        # Estimate deaths: matches - wins
-                        wins = mode_data.get("top1", 0)
-                        deaths = matches - wins
-                        total_eliminations += eliminations
-                        total_deaths += deaths
-            
-            if total_deaths > 0:
-                return round(total_eliminations / total_deaths, 3)
-            return 0.0
-        
-        return total_value
+        self._update_from_coordinator()
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
-        if not self.coordinator.data:
-            return {}
-        
-        return {
-            "player_id": self._config_entry.data["player_id"],
-            "aggregated_type": self._aggregated_type,
-            "aggregated_display": AGGREGATED_SENSOR_TYPES[self._aggregated_type],
-            "platforms_included": self._get_platforms_included(),
-            "modes_included": self._get_modes_included(),
+    def _compute_state(self) -> tuple[Any, dict[str, Any]]:
+        """Return the aggregated stat."""
+        # Aggregates are precomputed by the coordinator once per refresh
+        aggregated = self.coordinator.data.get("aggregated", {})
+        value = aggregated.get(self._aggregated_type, {}).get(self._sensor_key)
+        return value, {
+            **self._static_attributes,
+            "stale": any(map(self.coordinator.input_stale, self._platforms_included)),
+            "data_fetched_at": self.coordinator.data_fetched_at(self._platforms_included),
         }
     
     def _get_platforms_included(self) -> list[str]:
         """Get list of platforms included in this aggregation."""
-        platforms = self.coordinator.data.get("platforms", ["gamepad", "keyboardMouse"])
-        
-        if self._aggregated_type in ["all_platforms_all_modes", "all_platforms_solo", "all_platforms_duo", "all_platforms_squad"]:
-            return platforms
-        elif self._aggregated_type == "console_all_modes":
-            return ["gamepad"]
-        elif self._aggregated_type == "pc_all_modes":
-            return ["keyboardMouse"]
-        return []
+        return AGGREGATED_SELECTIONS[self._aggregated_type][0] or distinct_inputs(
+            self.coordinator.platforms
+        )
     
     def _get_modes_included(self) -> list[str]:
         """Get list of game modes included in this aggregation."""
-        game_modes = self.coordinator.data.get("game_modes", ["solo", "duo", "squad"])
-        
-        if self._aggregated_type in ["all_platforms_all_modes", "console_all_modes", "pc_all_modes"]:
-            return game_modes
-        elif self._aggregated_type == "all_platforms_solo":
-            return ["solo"]
-        elif self._aggregated_type == "all_platforms_duo":
-            return ["duo"]
-        elif self._aggregated_type == "all_platforms_squad":
-            return ["squad"]
-        return []
+        return AGGREGATED_SELECTIONS[self._aggregated_type][1] or self.coordinator.game_modes
+
+
+class FortniteRateSensor(_CachedCoordinatorEntity):
+    """Representation of a Fortnite Stats rate sensor."""
+
+    def __init__(
+        self,
+        coordinator: FortniteDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+        sensor_key: str,
+        sensor_info: dict,
+    ) -> None:
+        """Initialize the rate sensor."""
+        super().__init__(coordinator, context=("rates", sensor_key))
+        self._config_entry = config_entry
+        self._sensor_key = sensor_key
+        self._sensor_info = sensor_info
+
+        # Set up the sensor properties
+        self._attr_name = f"Fortnite {coordinator.player_id} {sensor_info['name']}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{coordinator.player_id}_rates_{sensor_key}"
+        self._attr_icon = sensor_info["icon"]
+        self._attr_native_unit_of_measurement = sensor_info["unit"]
+        if coordinator.long_term_statistics:
+            self._attr_state_class = sensor_info["state_class"]
+        self._update_from_coordinator()
+
+    def _compute_state(self) -> tuple[Any, dict[str, Any]]:
+        """Return the rate."""
+        rates = self.coordinator.data.get("rates", {})
+        attributes = {"player_id": self.coordinator.player_id}
+        if self._sensor_key == "recent_win_rate":
+            attributes["matches_counted"] = rates.get("recent_matches", 0)
+        return rates.get(self._sensor_key), attributes
+
+
+class FortniteCompactSensor(_CachedCoordinatorEntity):
+    """One Fortnite Stats entity per input and mode, with every stat as attributes."""
+
+    def __init__(
+        self,
+        coordinator: FortniteDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+        platform: str,
+        game_mode: str,
+    ) -> None:
+        """Initialize the compact sensor."""
+        # Notified when any stat of this input/mode changed
+        super().__init__(coordinator, context=(platform, game_mode))
+        self._config_entry = config_entry
+        self._platform = platform
+        self._game_mode = game_mode
+        self.cell = (platform, game_mode)
+        self._attr_entity_registry_enabled_default = coordinator.cell_played(*self.cell)
+
+        # Set up the sensor properties
+        sensor_info = SENSOR_TYPES[COMPACT_STATE_KEY]
+        platform_display = INPUT_DISPLAY_NAMES.get(platform, platform.title())
+        self._attr_name = f"Fortnite {coordinator.player_id} {platform_display} {game_mode.title()}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{coordinator.player_id}_{platform}_{game_mode}"
+        self._attr_icon = sensor_info["icon"]
+        self._attr_native_unit_of_measurement = sensor_info["unit"]
+        if coordinator.long_term_statistics:
+            self._attr_state_class = sensor_info["state_class"]
+
+        self._static_attributes = {
+            "player_id": coordinator.player_id,
+            "platform": platform,
+            "game_mode": game_mode,
+        }
+        self._update_from_coordinator()
+
+    def _compute_state(self) -> tuple[Any, dict[str, Any]]:
+        """Return the matches of this input and mode, with every stat."""
+        mode_data = self.coordinator.data.get(self._platform, {}).get(self._game_mode, {})
+        stats = {
+            sensor_key: mode_sensor_value(mode_data, sensor_key)
+            for sensor_key in SENSOR_TYPES
+        }
+        return stats[COMPACT_STATE_KEY], {
+            **self._static_attributes,
+            **stats,
+            "stale": self.coordinator.input_stale(self._platform),
+            "data_fetched_at": self.coordinator.data_fetched_at([self._platform]),
+        }
+
+
+class FortniteCompactAggregatedSensor(_CachedCoordinatorEntity):
+    """One Fortnite Stats entity per aggregate, with every stat as attributes."""
+
+    def __init__(
+        self,
+        coordinator: FortniteDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+        aggregated_type: str,
+    ) -> None:
+        """Initialize the compact aggregated sensor."""
+        super().__init__(coordinator, context=(aggregated_type,))
+        self._config_entry = config_entry
+        self._aggregated_type = aggregated_type
+
+        # Set up the sensor properties
+        sensor_info = SENSOR_TYPES[COMPACT_STATE_KEY]
+        aggregated_display = AGGREGATED_SENSOR_TYPES[aggregated_type]
+        self._attr_name = f"Fortnite {coordinator.player_id} {aggregated_display}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{coordinator.player_id}_{aggregated_type}"
+        self._attr_icon = sensor_info["icon"]
+        self._attr_native_unit_of_measurement = sensor_info["unit"]
+        if coordinator.long_term_statistics:
+            self._attr_state_class = sensor_info["state_class"]
+
+        platforms, modes = AGGREGATED_SELECTIONS[aggregated_type]
+        self._platforms_included = platforms or distinct_inputs(coordinator.platforms)
+        self._static_attributes = {
+            "player_id": coordinator.player_id,
+            "aggregated_type": aggregated_type,
+            "aggregated_display": aggregated_display,
+            "platforms_included": self._platforms_included,
+            "modes_included": modes or coordinator.game_modes,
+        }
+        self._update_from_coordinator()
+
+    def _compute_state(self) -> tuple[Any, dict[str, Any]]:
+        """Return the aggregated matches, with every aggregated stat."""
+        stats = self.coordinator.data.get("aggregated", {}).get(self._aggregated_type, {})
+        return stats.get(COMPACT_STATE_KEY), {
+            **self._static_attributes,
+            **stats,
+            "stale": any(map(self.coordinator.input_stale, self._platforms_included)),
+            "data_fetched_at": self.coordinator.data_fetched_at(self._platforms_included),
+        }
+
+
+class _StatisticsEntity:
+    """Sensor recording long-term statistics, keeping its attributes out of the recorder.
+
+    The entity still shows every attribute; only the state rows written by
+    the recorder leave them out, so the database stays small.
+    """
+
+    _unrecorded_attributes = frozenset(
+        {
+            "player_id",
+            "platform",
+            "game_mode",
+            "data_fetched_at",
+            "aggregated_type",
+            "aggregated_display",
+            "platforms_included",
+            "modes_included",
+            "matches_counted",
+            # Compact entities carry every stat
+            *SENSOR_DATA_KEYS,
+        }
+    )
+
+
+class FortniteStatisticsSensor(_StatisticsEntity, FortniteSensor):
+    """Fortnite Stats sensor recording long-term statistics."""
+
+
+class FortniteStatisticsAggregatedSensor(_StatisticsEntity, FortniteAggregatedSensor):
+    """Aggregated Fortnite Stats sensor recording long-term statistics."""
+
+
+class FortniteStatisticsRateSensor(_StatisticsEntity, FortniteRateSensor):
+    """Fortnite Stats rate sensor recording long-term statistics."""
+
+
+class FortniteStatisticsCompactSensor(_StatisticsEntity, FortniteCompactSensor):
+    """Compact Fortnite Stats sensor recording long-term statistics."""
+
+
+class FortniteStatisticsCompactAggregatedSensor(
+    _StatisticsEntity, FortniteCompactAggregatedSensor
+):
+    """Compact aggregated Fortnite Stats sensor recording long-term statistics."""
+
+
+# The variant of every sensor class used with long-term statistics
+STATISTICS_SENSOR_CLASSES: dict[type[SensorEntity], type[SensorEntity]] = {
+    FortniteSensor: FortniteStatisticsSensor,
+    FortniteAggregatedSensor: FortniteStatisticsAggregatedSensor,
+    FortniteRateSensor: FortniteStatisticsRateSensor,
+    FortniteCompactSensor: FortniteStatisticsCompactSensor,
+    FortniteCompactAggregatedSensor: FortniteStatisticsCompactAggregatedSensor,
+}
+
+
+class FortniteQuotaSensor(SensorEntity):
+    """Diagnostic sensor with the requests left today on the entry's API key."""
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:counter"
+    _attr_native_unit_of_measurement = "requests"
+
+    def __init__(
+        self,
+        quota: QuotaAccountant,
+        client: FortniteApiClient,
+        config_entry: ConfigEntry,
+    ) -> None:
+        """Initialize the quota sensor."""
+        self._quota = quota
+        self._client = client
+        self._api_key = config_entry.data[CONF_API_KEY]
+        name = config_entry.data.get(CONF_ROSTER_NAME) or config_entry.data[CONF_PLAYER_ID]
+        self._attr_name = f"Fortnite {name} API Quota Remaining"
+        self._attr_unique_id = f"{config_entry.entry_id}_api_quota"
+        self._unsub_retry: CALLBACK_TYPE | None = None
+        self._update_from_quota()
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the request counts of the key and the API status."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_QUOTA_UPDATED, self._async_quota_updated
+            )
+        )
+        self.async_on_remove(self._async_cancel_retry)
+        self._async_track_retry()
+
+    @callback
+    def _async_quota_updated(self, key: str) -> None:
+        """Write the new count when a request was sent on our key's budget."""
+        if key not in self._quota.budget_keys(self._api_key):
+            return
+        self._update_from_quota()
+        self.async_write_ha_state()
+        self._async_track_retry()
+
+    @callback
+    def _async_track_retry(self) -> None:
+        """Write the state again once the open breaker lets a probe through.
+
+        No requests are counted while the breaker is open, so nothing else
+        would show it turning half open.
+        """
+        self._async_cancel_retry()
+        breaker = self._client.breaker(STATS_URL)
+        if breaker.state == STATE_OPEN:
+            self._unsub_retry = async_call_later(
+                self.hass, breaker.retry_in, self._async_retry_due
+            )
+
+    @callback
+    def _async_retry_due(self, _now: datetime) -> None:
+        """Show the breaker state after the open period."""
+        self._unsub_retry = None
+        self._update_from_quota()
+        self.async_write_ha_state()
+        self._async_track_retry()
+
+    @callback
+    def _async_cancel_retry(self) -> None:
+        """Cancel a pending breaker state write."""
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+
+    def _update_from_quota(self) -> None:
+        """Cache the remaining budget, the counts behind it and the API status."""
+        breaker = self._client.breaker(STATS_URL)
+        self._attr_native_value = self._quota.remaining(self._api_key)
+        self._attr_extra_state_attributes = {
+            "requests_today": self._quota.used(self._api_key),
+            "daily_quota": self._quota.daily_quota,
+            "players": self._quota.players(self._api_key),
+            "keys": len(self._quota.budget_keys(self._api_key)),
+            "min_poll_interval": round(self._quota.interval_floor(self._api_key)),
+            "resets_at": self._quota.resets_at().isoformat(),
+            "api_status": breaker.state,
+            "api_retry_in": (
+                round(breaker.retry_in) if breaker.state == STATE_OPEN else None
+            ),
+        }
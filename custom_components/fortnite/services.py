@@ -0,0 +1,187 @@
+"""Services for the Fortnite Stats integration."""
+from __future__ import annotations
+
+from datetime import datetime
+from importlib.util import find_spec
+import os
+import sqlite3
+import time
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_BUCKET,
+    ATTR_END,
+    ATTR_FILENAME,
+    ATTR_FORMAT,
+    ATTR_GAME_MODES,
+    ATTR_PLATFORMS,
+    ATTR_START,
+    CONF_PLAYER_ID,
+    DEFAULT_QUERY_RANGE,
+    DOMAIN,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_PARQUET,
+    EXPORT_FORMATS,
+    GAME_MODES,
+    HISTORY_BUCKETS,
+    HISTORY_EXPORT_DIRECTORY,
+    INPUT_OPTIONS,
+    SERVICE_EXPORT_HISTORY,
+    SERVICE_QUERY_HISTORY,
+)
+from .export import export_history
+from .timeseries import async_get_stats_database
+
+# Selection shared by the history services
+HISTORY_SELECTION = {
+    vol.Optional(CONF_PLAYER_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_START): cv.datetime,
+    vol.Optional(ATTR_END): cv.datetime,
+    vol.Optional(ATTR_PLATFORMS): vol.All(cv.ensure_list, [vol.In(INPUT_OPTIONS)]),
+    vol.Optional(ATTR_GAME_MODES): vol.All(cv.ensure_list, [vol.In(GAME_MODES)]),
+}
+
+QUERY_HISTORY_SCHEMA = vol.Schema(
+    {
+        **HISTORY_SELECTION,
+        vol.Optional(ATTR_BUCKET, default="day"): vol.In(list(HISTORY_BUCKETS)),
+    }
+)
+
+EXPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        **HISTORY_SELECTION,
+        vol.Optional(ATTR_FORMAT, default=EXPORT_FORMAT_CSV): vol.In(EXPORT_FORMATS),
+        # A bare file name, always written to the export directory
+        vol.Optional(ATTR_FILENAME): vol.All(
+            cv.string, vol.Match(r"^[\w.-]+$"), vol.Match(r"^[^.]")
+        ),
+    }
+)
+
+
+def _timestamp(value: datetime) -> float:
+    """Return the timestamp of a datetime, reading naive ones as local time."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return value.timestamp()
+
+
+def _isoformat(timestamp: float) -> str:
+    """Return a timestamp as a local ISO 8601 string."""
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).isoformat()
+
+
+def _time_range(
+    data: dict, default_range: float | None = DEFAULT_QUERY_RANGE
+) -> tuple[float, float]:
+    """Return the (start, end) timestamps selected by a service call."""
+    end = _timestamp(data[ATTR_END]) if ATTR_END in data else time.time()
+    if ATTR_START in data:
+        start = _timestamp(data[ATTR_START])
+    else:
+        start = end - default_range if default_range is not None else 0.0
+    if start >= end:
+        raise HomeAssistantError("start must be before end")
+    return start, end
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Fortnite Stats services."""
+
+    async def async_query_history(call: ServiceCall) -> ServiceResponse:
+        """Return counter increases per player over a time range."""
+        start, end = _time_range(call.data)
+        database = async_get_stats_database(hass)
+        try:
+            players = await hass.async_add_executor_job(
+                database.query,
+                start,
+                end,
+                HISTORY_BUCKETS[call.data[ATTR_BUCKET]],
+                call.data.get(CONF_PLAYER_ID),
+                call.data.get(ATTR_PLATFORMS),
+                call.data.get(ATTR_GAME_MODES),
+            )
+        except sqlite3.Error as err:
+            raise HomeAssistantError(f"Failed to query stats history: {err}") from err
+
+        return {
+            "start": _isoformat(start),
+            "end": _isoformat(end),
+            "players": {
+                player: [
+                    {
+                        **bucket,
+                        "start": _isoformat(bucket["start"]),
+                        "end": _isoformat(bucket["end"]),
+                    }
+                    for bucket in buckets
+                ]
+                for player, buckets in players.items()
+            },
+        }
+
+    async def async_export_history(call: ServiceCall) -> ServiceResponse:
+        """Write the stored changes over a time range to a file."""
+        start, end = _time_range(call.data, default_range=None)
+        file_format = call.data[ATTR_FORMAT]
+        # pyarrow is optional, so refuse before touching the database or files
+        if file_format == EXPORT_FORMAT_PARQUET and find_spec("pyarrow") is None:
+            raise HomeAssistantError(
+                "Parquet export needs the pyarrow package to be installed"
+            )
+        filename = call.data.get(ATTR_FILENAME) or (
+            f"fortnite_history_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.{file_format}"
+        )
+        directory = hass.config.path(HISTORY_EXPORT_DIRECTORY)
+        path = os.path.join(directory, filename)
+        # Looked up on the event loop, the job only runs the blocking export
+        database = async_get_stats_database(hass)
+
+        def _export() -> int:
+            os.makedirs(directory, exist_ok=True)
+            return export_history(
+                database,
+                path,
+                file_format,
+                start,
+                end,
+                call.data.get(CONF_PLAYER_ID),
+                call.data.get(ATTR_PLATFORMS),
+                call.data.get(ATTR_GAME_MODES),
+            )
+
+        try:
+            rows = await hass.async_add_executor_job(_export)
+        except (OSError, sqlite3.Error) as err:
+            raise HomeAssistantError(f"Failed to export stats history: {err}") from err
+
+        return {"path": path, "rows": rows}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        async_export_history,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_HISTORY,
+        async_query_history,
+        schema=QUERY_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,65 @@
+"""Hourly long-term statistics import for the Fortnite Stats counters."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+
+from .const import COUNTER_FIELDS, DOMAIN, INPUT_DISPLAY_NAMES
+
+
+def statistic_id(player_id: str, platform: str, mode: str, counter: str) -> str:
+    """Return the external statistic id of a player's input/mode counter."""
+    return f"{DOMAIN}:{slugify(f'{player_id}_{platform}_{mode}_{counter}')}"
+
+
+@callback
+def async_import_statistics(
+    hass: HomeAssistant,
+    player_id: str,
+    data: dict[str, Any],
+    start: datetime,
+    last_imported: dict[str, float],
+) -> int:
+    """Import the counters of every input and mode for the hour starting at `start`.
+
+    Counters are lifetime totals, so the total is both the state and the
+    running sum. The recorder takes one statistic id per call, so only the
+    counters that changed since the values in `last_imported` are written;
+    the dict is updated with them. Returns the number of statistics written.
+    """
+    if "recorder" not in hass.config.components:
+        return 0
+
+    imported = 0
+    for platform in data.get("platforms", []):
+        platform_display = INPUT_DISPLAY_NAMES.get(platform, platform.title())
+        for mode in data.get("game_modes", []):
+            if not (mode_data := (data.get(platform) or {}).get(mode)):
+                continue
+            for counter in COUNTER_FIELDS:
+                value = float(mode_data.get(counter) or 0)
+                external_id = statistic_id(player_id, platform, mode, counter)
+                if last_imported.get(external_id) == value:
+                    continue
+                metadata = StatisticMetaData(
+                    has_mean=False,
+                    has_sum=True,
+                    name=(
+                        f"Fortnite {player_id} {platform_display} {mode.title()} "
+                        f"{counter.replace('_', ' ').title()}"
+                    ),
+                    source=DOMAIN,
+                    statistic_id=external_id,
+                    unit_of_measurement=None,
+                )
+                async_add_external_statistics(
+                    hass, metadata, [StatisticData(start=start, state=value, sum=value)]
+                )
+                last_imported[external_id] = value
+                imported += 1
+    return imported
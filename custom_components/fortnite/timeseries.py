@@ -0,0 +1,258 @@
+"""Persistent, delta-encoded time series of Fortnite counters in SQLite."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import (
+    COUNTER_FIELDS,
+    DATA_STATS_DATABASE,
+    DOMAIN,
+    HISTORY_DATABASE_FILE,
+    HISTORY_DATABASE_VERSION,
+    HISTORY_EXPORT_CHUNK_SIZE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StatsDatabase:
+    """Counter changes per player x input x mode, indexed by time.
+
+    `latest` holds the last absolute counters of every cell and `deltas` one
+    row per change holding only the increase since the previous row, so the
+    total over any time range is a plain SUM over an index range. Both
+    tables are clustered on (player, input, mode, ts).
+
+    Every method blocks and must run in the executor; a lock serializes the
+    single connection.
+    """
+
+    def __init__(self, path: str, counters: list[str] = COUNTER_FIELDS) -> None:
+        """Initialize the database; the file is opened on first use."""
+        self.path = path
+        self.counters = list(counters)
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the connection, creating the schema on first use."""
+        if self._connection is not None:
+            return self._connection
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        counters = ", ".join(f"{counter} INTEGER NOT NULL" for counter in self.counters)
+        for table, key in (
+            ("latest", "player, input, mode"),
+            ("deltas", "player, input, mode, ts"),
+        ):
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "player TEXT NOT NULL, input TEXT NOT NULL, mode TEXT NOT NULL, "
+                f"ts REAL NOT NULL, {counters}, PRIMARY KEY ({key})) WITHOUT ROWID"
+            )
+        connection.execute(f"PRAGMA user_version = {HISTORY_DATABASE_VERSION}")
+        connection.commit()
+        self._connection = connection
+        return connection
+
+    def record(
+        self,
+        player: str,
+        timestamp: float,
+        rows: dict[tuple[str, str], Sequence[int]],
+    ) -> int:
+        """Store the counters of a player's (input, mode) cells, return the rows written.
+
+        Unchanged cells are skipped. A counter going down (a stats reset)
+        starts a new baseline instead of writing a negative delta.
+        """
+        player = player.lower()
+        columns = ", ".join(self.counters)
+        placeholders = ", ".join("?" * (len(self.counters) + 4))
+        accumulate = ", ".join(
+            f"{counter} = {counter} + excluded.{counter}" for counter in self.counters
+        )
+        written = 0
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                for (platform, mode), values in rows.items():
+                    values = [int(value) for value in values]
+                    previous = connection.execute(
+                        f"SELECT ts, {columns} FROM latest "
+                        "WHERE player = ? AND input = ? AND mode = ?",
+                        (player, platform, mode),
+                    ).fetchone()
+                    if previous is not None:
+                        if timestamp < previous[0] or list(previous[1:]) == values:
+                            continue
+                        deltas = [new - old for new, old in zip(values, previous[1:])]
+                        if min(deltas) >= 0:
+                            connection.execute(
+                                f"INSERT INTO deltas (player, input, mode, ts, {columns}) "
+                                f"VALUES ({placeholders}) "
+                                f"ON CONFLICT (player, input, mode, ts) DO UPDATE SET {accumulate}",
+                                (player, platform, mode, timestamp, *deltas),
+                            )
+                            written += 1
+                    connection.execute(
+                        f"INSERT OR REPLACE INTO latest (player, input, mode, ts, {columns}) "
+                        f"VALUES ({placeholders})",
+                        (player, platform, mode, timestamp, *values),
+                    )
+        return written
+
+    def query(
+        self,
+        start: float,
+        end: float,
+        bucket: float | None = None,
+        players: Iterable[str] | None = None,
+        inputs: Iterable[str] | None = None,
+        modes: Iterable[str] | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Return the counter increases in [start, end) per player and bucket.
+
+        Buckets are `bucket` seconds long and aligned to `start`; without a
+        bucket size the whole range is one bucket. Empty buckets are left out.
+        The "all" input already totals the others, so it is only summed for
+        players without another selected input on record.
+        """
+        where, parameters = self._where(start, end, players, inputs, modes)
+        other_inputs = "other.input != 'all'"
+        if inputs is not None:
+            inputs = list(inputs)
+            other_inputs += f" AND other.input IN ({', '.join('?' * len(inputs))})"
+            parameters.extend(inputs)
+        where += (
+            " AND (input != 'all' OR NOT EXISTS (SELECT 1 FROM latest AS other "
+            f"WHERE other.player = deltas.player AND {other_inputs}))"
+        )
+        bucket_expression = "CAST((ts - ?) / ? AS INTEGER)" if bucket else "0"
+        if bucket:
+            parameters = [start, bucket, *parameters]
+        sums = ", ".join(f"SUM({counter})" for counter in self.counters)
+
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT player, {bucket_expression} AS bucket, {sums} FROM deltas "
+                f"WHERE {where} GROUP BY player, bucket ORDER BY player, bucket",
+                parameters,
+            ).fetchall()
+
+        result: dict[str, list[dict[str, Any]]] = {}
+        for player, index, *totals in rows:
+            bucket_start = start + index * bucket if bucket else start
+            result.setdefault(player, []).append(
+                {
+                    "start": bucket_start,
+                    "end": min(end, bucket_start + bucket) if bucket else end,
+                    **dict(zip(self.counters, totals)),
+                }
+            )
+        return result
+
+    def iter_changes(
+        self,
+        start: float,
+        end: float,
+        players: Iterable[str] | None = None,
+        inputs: Iterable[str] | None = None,
+        modes: Iterable[str] | None = None,
+        chunk_size: int = HISTORY_EXPORT_CHUNK_SIZE,
+    ) -> Iterator[list[tuple[Any, ...]]]:
+        """Yield the stored changes in [start, end) in chunks of rows.
+
+        Rows are (player, input, mode, ts, *counter increases) in index
+        order. A separate read-only connection is used, so writes are not
+        blocked while the caller consumes the chunks.
+        """
+        # Make sure the schema exists before reading
+        with self._lock:
+            self._connect()
+        where, parameters = self._where(start, end, players, inputs, modes)
+        # as_uri escapes characters like ? and # that a plain file: URI would misread
+        uri = f"{Path(self.path).absolute().as_uri()}?mode=ro"
+        connection = sqlite3.connect(uri, uri=True)
+        try:
+            cursor = connection.execute(
+                f"SELECT player, input, mode, ts, {', '.join(self.counters)} "
+                f"FROM deltas WHERE {where} ORDER BY player, input, mode, ts",
+                parameters,
+            )
+            while rows := cursor.fetchmany(chunk_size):
+                yield rows
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _where(
+        start: float,
+        end: float,
+        players: Iterable[str] | None,
+        inputs: Iterable[str] | None,
+        modes: Iterable[str] | None,
+    ) -> tuple[str, list[Any]]:
+        """Return the WHERE clause and parameters selecting a range of rows."""
+        conditions = ["ts >= ?", "ts < ?"]
+        parameters: list[Any] = [start, end]
+        for column, values in (("player", players), ("input", inputs), ("mode", modes)):
+            if values is None:
+                continue
+            values = [value.lower() for value in values] if column == "player" else list(values)
+            conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+            parameters.extend(values)
+        return " AND ".join(conditions), parameters
+
+    def close(self) -> None:
+        """Close the connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+@callback
+def async_get_stats_database(hass: HomeAssistant) -> StatsDatabase:
+    """Return the domain-wide stats database, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (database := domain_data.get(DATA_STATS_DATABASE)) is None:
+        database = domain_data[DATA_STATS_DATABASE] = StatsDatabase(
+            hass.config.path(HISTORY_DATABASE_FILE)
+        )
+
+        async def _async_close_database(event: Event) -> None:
+            await hass.async_add_executor_job(database.close)
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close_database)
+    return database
+
+
+async def async_record_stats(
+    hass: HomeAssistant, player: str, timestamp: float, data: dict[str, Any]
+) -> None:
+    """Write a player's transformed data to the stats database."""
+    database = async_get_stats_database(hass)
+    rows = {
+        (platform, mode): [mode_data.get(counter) or 0 for counter in database.counters]
+        for platform in data.get("platforms", [])
+        for mode in data.get("game_modes", [])
+        if (mode_data := (data.get(platform) or {}).get(mode))
+    }
+    try:
+        written = await hass.async_add_executor_job(
+            database.record, player, timestamp, rows
+        )
+    except sqlite3.Error as err:
+        _LOGGER.warning("Failed to write stats history for %s: %s", player, err)
+        return
+    if written:
+        _LOGGER.debug("Stored %d stats change(s) for %s", written, player)
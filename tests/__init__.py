@@ -0,0 +1 @@
+"""Tests for the Fortnite Stats integration."""
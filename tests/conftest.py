@@ -0,0 +1,113 @@
+"""Fixtures for the Fortnite Stats tests."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from copy import deepcopy
+import time
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.fortnite.api import StatsResponse
+from custom_components.fortnite.const import CONF_API_KEY, CONF_PLAYER_ID, DOMAIN
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+PLAYER_ID = "Captain_Crunch88"
+API_KEY = "test-api-key"
+
+ENTRY_DATA = {
+    CONF_API_KEY: API_KEY,
+    CONF_PLAYER_ID: PLAYER_ID,
+    "aggregated_sensors": True,
+    "platforms": ["gamepad", "keyboardMouse"],
+    "game_modes": ["solo", "duo", "squad"],
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components in every test."""
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Return a settable monotonic clock for the cache, breakers and key pool."""
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def mode_stats(matches: int = 0, **stats: Any) -> dict[str, Any]:
+    """Return the API stats of one mode."""
+    return {
+        "matches": matches,
+        "kills": 0,
+        "wins": 0,
+        "top3": 0,
+        "top5": 0,
+        "top6": 0,
+        "top10": 0,
+        "top12": 0,
+        "top25": 0,
+        "score": 0,
+        "minutesPlayed": 0,
+        "kd": 0.0,
+        "winRate": 0.0,
+        "killsPerMatch": 0.0,
+        "scorePerMatch": 0.0,
+        "lastModified": f"2026-01-01T00:00:{matches % 60:02d}Z",
+        **stats,
+    }
+
+
+def stats_payload(**inputs: dict[str, dict[str, Any]] | None) -> dict[str, Any]:
+    """Return a stats API response with the given inputs."""
+    return {
+        "status": 200,
+        "data": {
+            "account": {"id": "abc", "name": PLAYER_ID},
+            "stats": {"all": None, "keyboardMouse": None, "gamepad": None, "touch": None, **inputs},
+        },
+    }
+
+
+@pytest.fixture
+def payload() -> dict[str, Any]:
+    """Return a stats response with matches on both default inputs."""
+    return deepcopy(
+        stats_payload(
+            gamepad={
+                "solo": mode_stats(10, kills=20, wins=1, top10=3, top25=5, score=1000, minutesPlayed=100),
+                "duo": mode_stats(4, kills=5, score=400, minutesPlayed=40),
+                "squad": None,
+            },
+            keyboardMouse={
+                "solo": mode_stats(6, kills=9, wins=2, top10=2, top25=4, score=700, minutesPlayed=60),
+                "duo": None,
+                "squad": mode_stats(2, kills=1, score=100, minutesPlayed=20),
+            },
+        )
+    )
+
+
+@pytest.fixture
+def mock_stats(payload: dict[str, Any]) -> Iterator[AsyncMock]:
+    """Answer every stats request of the shared client with the payload fixture."""
+    with patch(
+        "custom_components.fortnite.api.FortniteApiClient.async_get_stats",
+        AsyncMock(return_value=StatsResponse(payload)),
+    ) as mock:
+        yield mock
+
+
+async def setup_entry(hass: HomeAssistant, **data: Any) -> MockConfigEntry:
+    """Set up a player entry, with entry data overridden by `data`."""
+    entry = MockConfigEntry(domain=DOMAIN, data={**ENTRY_DATA, **data}, title=PLAYER_ID)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
@@ -0,0 +1,46 @@
+"""Tests for the aggregated stats."""
+from __future__ import annotations
+
+from custom_components.fortnite.aggregation import (
+    aggregate_stats,
+    distinct_inputs,
+    mode_sensor_value,
+)
+
+
+def _mode(matches: int, kills: int, wins: int) -> dict:
+    return {"matches": matches, "kills": kills, "top1": wins}
+
+
+def test_distinct_inputs() -> None:
+    """The "all" input only counts on its own."""
+    assert distinct_inputs(["all", "gamepad", "touch"]) == ["gamepad", "touch"]
+    assert distinct_inputs(["all"]) == ["all"]
+    assert distinct_inputs(["gamepad"]) == ["gamepad"]
+
+
+def test_aggregates_do_not_double_count_all() -> None:
+    """Totals sum the individual inputs, not the "all" totals on top."""
+    data = {
+        "all": {"solo": _mode(15, 30, 3)},
+        "gamepad": {"solo": _mode(10, 20, 1)},
+        "touch": {"solo": _mode(5, 10, 2)},
+    }
+    aggregated = aggregate_stats(data, ["all", "gamepad", "touch"], ["solo", "duo", "squad"])
+
+    totals = aggregated["all_platforms_all_modes"]
+    assert totals["matches"] == 15
+    assert totals["eliminations"] == 30
+    assert totals["win_rate"] == 20.0
+    assert totals["kd"] == round(30 / 12, 3)
+    assert aggregated["console_all_modes"]["matches"] == 10
+
+    only_all = aggregate_stats(data, ["all"], ["solo"])
+    assert only_all["all_platforms_solo"]["matches"] == 15
+
+
+def test_mode_sensor_value() -> None:
+    """Ratios are converted for display, missing stats read as zero."""
+    assert mode_sensor_value({"win_ratio": 0.125}, "win_rate") == 12.5
+    assert mode_sensor_value({"kd": 1.23456}, "kd") == 1.235
+    assert mode_sensor_value({}, "wins") == 0
@@ -0,0 +1,188 @@
+"""Tests for the shared fortnite-api.com client."""
+from __future__ import annotations
+
+from http import HTTPStatus
+
+import pytest
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.fortnite.api import (
+    STATS_URL,
+    CircuitOpenError,
+    FortniteApiError,
+    _parse_retry_after,
+    async_get_api_client,
+    async_release_api_client,
+)
+from custom_components.fortnite.circuit_breaker import STATE_CLOSED, STATE_OPEN
+from custom_components.fortnite.const import (
+    CONF_API_KEYS,
+    DATA_DOMAIN_CONFIG,
+    DOMAIN,
+    PRIORITY_INTERACTIVE,
+    SIGNAL_QUOTA_UPDATED,
+)
+
+from .conftest import API_KEY, PLAYER_ID
+
+
+async def test_get_stats(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, payload: dict
+) -> None:
+    """Stats are fetched through the Home Assistant client session."""
+    aioclient_mock.get(STATS_URL, json=payload, headers={"ETag": '"v1"'})
+    client = async_get_api_client(hass)
+
+    response = await client.async_get_stats(API_KEY, PLAYER_ID)
+
+    assert response.data == payload
+    assert response.etag == '"v1"'
+    assert aioclient_mock.call_count == 1
+    _, url, _, headers = aioclient_mock.mock_calls[0]
+    assert url.query["name"] == PLAYER_ID
+    assert headers["Authorization"] == API_KEY
+    await async_release_api_client(hass)
+
+
+@pytest.mark.parametrize(
+    ("status", "message"),
+    [
+        (HTTPStatus.UNAUTHORIZED, "Invalid API key"),
+        (HTTPStatus.FORBIDDEN, "Player stats are private"),
+        (HTTPStatus.NOT_FOUND, "Player not found"),
+    ],
+)
+async def test_negative_answers_are_cached(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    status: HTTPStatus,
+    message: str,
+) -> None:
+    """Bad key, private stats and unknown players are not asked again for a while."""
+    aioclient_mock.get(STATS_URL, status=status)
+    client = async_get_api_client(hass)
+
+    for _ in range(2):
+        with pytest.raises(FortniteApiError, match=message) as err:
+            await client.async_get_stats(API_KEY, PLAYER_ID, priority=PRIORITY_INTERACTIVE)
+        assert err.value.status == status
+
+    assert aioclient_mock.call_count == 1
+    await async_release_api_client(hass)
+
+
+async def test_throttled_answer_carries_retry_after(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """A 429 comes back with the server's Retry-After."""
+    aioclient_mock.get(
+        STATS_URL, status=HTTPStatus.TOO_MANY_REQUESTS, headers={"Retry-After": "30"}
+    )
+    client = async_get_api_client(hass)
+
+    with pytest.raises(FortniteApiError) as err:
+        await client.async_get_stats(API_KEY, PLAYER_ID)
+
+    assert err.value.status == HTTPStatus.TOO_MANY_REQUESTS
+    assert err.value.retry_after == 30
+    await async_release_api_client(hass)
+
+
+def test_parse_retry_after() -> None:
+    """Retry-After is either a delay in seconds or an HTTP date."""
+    assert _parse_retry_after("12") == 12
+    assert _parse_retry_after("-5") == 0
+    assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert _parse_retry_after("soon") is None
+    assert _parse_retry_after(None) is None
+
+
+async def test_release_removes_close_listener(hass: HomeAssistant) -> None:
+    """Recreating the client after the last entry unloads leaks no listeners."""
+    listeners = hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_CLOSE, 0)
+
+    for _ in range(3):
+        client = async_get_api_client(hass)
+        assert async_get_api_client(hass) is client
+        assert hass.bus.async_listeners()[EVENT_HOMEASSISTANT_CLOSE] == listeners + 1
+        await async_release_api_client(hass)
+
+    assert hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_CLOSE, 0) == listeners
+
+
+async def test_close_on_stop(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, payload: dict) -> None:
+    """The session is detached when Home Assistant closes."""
+    aioclient_mock.get(STATS_URL, json=payload)
+    client = async_get_api_client(hass)
+    await client.async_get_stats(API_KEY, PLAYER_ID)
+    session = client.session
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+
+    assert session.closed
+    # Releasing afterwards must not remove the listener a second time
+    await async_release_api_client(hass)
+
+
+async def test_quota_update_follows_breaker_update(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Quota listeners run after the breaker has seen the request's outcome."""
+    aioclient_mock.get(STATS_URL, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+    client = async_get_api_client(hass)
+    states: list[str] = []
+
+    @callback
+    def _quota_updated(key: str) -> None:
+        states.append(client.breaker(STATS_URL).state)
+
+    async_dispatcher_connect(hass, SIGNAL_QUOTA_UPDATED, _quota_updated)
+
+    for _ in range(3):
+        with pytest.raises(FortniteApiError):
+            await client.async_get_stats(API_KEY, PLAYER_ID)
+
+    assert states == [STATE_CLOSED, STATE_CLOSED, STATE_OPEN]
+    with pytest.raises(CircuitOpenError):
+        await client.async_get_stats(API_KEY, PLAYER_ID)
+    assert aioclient_mock.call_count == 3
+    assert client.quota.used(API_KEY) == 3
+    await async_release_api_client(hass)
+
+
+async def test_results_are_not_shared_across_own_keys(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, payload: dict
+) -> None:
+    """Without pooled keys, a response fetched with one key is not served to another."""
+    aioclient_mock.get(STATS_URL, json=payload)
+    client = async_get_api_client(hass)
+
+    await client.async_get_stats(API_KEY, PLAYER_ID)
+    await client.async_get_stats(API_KEY, PLAYER_ID.lower())
+    assert aioclient_mock.call_count == 1
+
+    await client.async_get_stats("other-key", PLAYER_ID)
+    assert aioclient_mock.call_count == 2
+    await async_release_api_client(hass)
+
+
+async def test_results_are_shared_across_pooled_keys(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, payload: dict
+) -> None:
+    """With pooled keys, every entry tracking the player shares one response."""
+    hass.data[DOMAIN] = {DATA_DOMAIN_CONFIG: {CONF_API_KEYS: ["pool-1", "pool-2"]}}
+    aioclient_mock.get(STATS_URL, json=payload)
+    client = async_get_api_client(hass)
+
+    await client.async_get_stats(API_KEY, PLAYER_ID)
+    await client.async_get_stats("other-key", PLAYER_ID)
+    assert aioclient_mock.call_count == 1
+
+    # A request pinned to its own key does not take the pooled answer
+    await client.async_get_stats(API_KEY, PLAYER_ID, pooled=False)
+    assert aioclient_mock.call_count == 2
+    await async_release_api_client(hass)
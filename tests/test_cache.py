@@ -0,0 +1,105 @@
+"""Tests for the single-flight response cache."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.fortnite.cache import SingleFlightCache
+
+
+async def test_concurrent_callers_share_one_request() -> None:
+    """Callers asking for the same key while a request runs await it together."""
+    responses = SingleFlightCache[int](ttl=60, max_entries=10)
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    first = asyncio.create_task(responses.async_get("a", fetch))
+    second = asyncio.create_task(responses.async_get("a", fetch))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(first, second) == [1, 1]
+    assert calls == 1
+
+
+async def test_results_expire(clock: list[float]) -> None:
+    """Results are served from the cache until the TTL runs out."""
+    responses = SingleFlightCache[str](ttl=60, max_entries=10)
+    values = iter(["old", "new"])
+
+    async def fetch() -> str:
+        return next(values)
+
+    assert await responses.async_get("a", fetch) == "old"
+    clock[0] += 59
+    assert await responses.async_get("a", fetch) == "old"
+    clock[0] += 1
+    assert await responses.async_get("a", fetch) == "new"
+
+
+async def test_callers_never_get_their_own_result_back(clock: list[float]) -> None:
+    """With newer_than, only results cached after the caller's last one are reused."""
+    responses = SingleFlightCache[str](ttl=60, max_entries=10)
+    values = iter(["first", "second", "third"])
+
+    async def fetch() -> str:
+        return next(values)
+
+    assert await responses.async_get("a", fetch) == "first"
+    received = clock[0]
+    clock[0] += 10
+    assert await responses.async_get("a", fetch, newer_than=received) == "second"
+
+    # Someone else fetched since our last result, so theirs is reused
+    clock[0] += 10
+    assert await responses.async_get("a", fetch, newer_than=received) == "second"
+
+
+async def test_bypassing_the_cache_refreshes_it() -> None:
+    """use_cache=False always fetches and stores the new result."""
+    responses = SingleFlightCache[str](ttl=60, max_entries=10)
+    values = iter(["old", "new"])
+
+    async def fetch() -> str:
+        return next(values)
+
+    await responses.async_get("a", fetch)
+    assert await responses.async_get("a", fetch, use_cache=False) == "new"
+    assert responses.peek("a") == "new"
+
+
+async def test_failures_and_rejected_results_are_not_cached() -> None:
+    """Errors and results refused by cache_if are fetched again."""
+    responses = SingleFlightCache[str](ttl=60, max_entries=10, cache_if=bool)
+
+    async def fail() -> str:
+        raise ValueError
+
+    async def empty() -> str:
+        return ""
+
+    with pytest.raises(ValueError):
+        await responses.async_get("a", fail)
+    await responses.async_get("a", empty)
+
+    assert responses.peek("a") is None
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    """The entry used longest ago goes first once the cache is full."""
+    responses = SingleFlightCache[int](ttl=60, max_entries=2)
+    responses.set("a", 1)
+    responses.set("b", 2)
+    responses.set("a", 1)
+    responses.set("c", 3)
+
+    assert responses.peek("a") == 1
+    assert responses.peek("b") is None
+    assert responses.peek("c") == 3
@@ -0,0 +1,93 @@
+"""Tests for the endpoint circuit breaker."""
+from __future__ import annotations
+
+from custom_components.fortnite.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+
+
+def test_opens_after_threshold(clock: list[float]) -> None:
+    """Consecutive failures open the breaker once the threshold is reached."""
+    breaker = CircuitBreaker("stats", failure_threshold=3, recovery_timeout=60)
+
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_in == 60
+    assert not breaker.allow_request()
+
+
+def test_success_resets_the_count(clock: list[float]) -> None:
+    """A success in between starts the count again."""
+    breaker = CircuitBreaker("stats", failure_threshold=2)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == STATE_CLOSED
+
+
+def test_retry_after_opens_at_once(clock: list[float]) -> None:
+    """A server Retry-After opens the breaker for exactly that long."""
+    breaker = CircuitBreaker("stats", failure_threshold=3)
+
+    breaker.record_failure(retry_after=12)
+
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_in == 12
+
+
+def test_half_open_lets_one_probe_through(clock: list[float]) -> None:
+    """After the open period one probe is allowed; its failure doubles the wait."""
+    breaker = CircuitBreaker("stats", failure_threshold=1, recovery_timeout=60)
+    breaker.record_failure()
+
+    clock[0] += 60
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_in == 120
+
+    clock[0] += 120
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow_request()
+
+
+def test_abandoned_probe_is_released(clock: list[float]) -> None:
+    """A probe whose request was cancelled frees the slot for the next one."""
+    breaker = CircuitBreaker("stats", failure_threshold=1, recovery_timeout=10)
+    breaker.record_failure()
+    clock[0] += 10
+
+    assert breaker.allow_request()
+    breaker.release()
+
+    assert breaker.allow_request()
+
+
+def test_recovery_timeout_is_capped(clock: list[float]) -> None:
+    """Repeated trips never wait longer than the maximum."""
+    breaker = CircuitBreaker(
+        "stats", failure_threshold=1, recovery_timeout=60, max_recovery_timeout=100
+    )
+
+    for _ in range(3):
+        breaker.record_failure()
+        clock[0] += breaker.retry_in
+        breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.retry_in == 100
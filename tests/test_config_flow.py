@@ -0,0 +1,88 @@
+"""Tests for the Fortnite Stats config flow."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.fortnite.api import StatsResponse
+from custom_components.fortnite.const import DEFAULT_INPUTS, DOMAIN
+
+from .conftest import API_KEY, PLAYER_ID
+
+
+async def _start_flow(hass: HomeAssistant, step: str) -> dict:
+    """Start a flow and pick an entry type from the menu."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] is FlowResultType.MENU
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": step}
+    )
+
+
+async def test_player_defaults_to_console_and_pc(hass: HomeAssistant, payload: dict) -> None:
+    """A player entry tracks Console and PC unless other inputs are selected."""
+    result = await _start_flow(hass, "player")
+    assert result["type"] is FlowResultType.FORM
+
+    with patch(
+        "custom_components.fortnite.api.FortniteApiClient.async_get_stats",
+        AsyncMock(return_value=StatsResponse(payload)),
+    ), patch("custom_components.fortnite.async_setup_entry", return_value=True):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"api_key": API_KEY, "player_id": PLAYER_ID}
+        )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"]["platforms"] == DEFAULT_INPUTS
+    assert result["data"]["game_modes"] == ["solo", "duo", "squad"]
+
+
+async def test_player_selected_inputs(hass: HomeAssistant, payload: dict) -> None:
+    """Selected inputs are stored, an empty selection is rejected."""
+    result = await _start_flow(hass, "player")
+    user_input = {"api_key": API_KEY, "player_id": PLAYER_ID, "platforms": []}
+
+    with patch(
+        "custom_components.fortnite.api.FortniteApiClient.async_get_stats",
+        AsyncMock(return_value=StatsResponse(payload)),
+    ), patch("custom_components.fortnite.async_setup_entry", return_value=True):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], user_input
+        )
+        assert result["type"] is FlowResultType.FORM
+        assert result["errors"] == {"platforms": "no_inputs"}
+
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {**user_input, "platforms": ["touch", "all"]}
+        )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"]["platforms"] == ["touch", "all"]
+
+
+async def test_roster_inputs(hass: HomeAssistant, payload: dict) -> None:
+    """A roster entry stores the selected inputs and the parsed players."""
+    result = await _start_flow(hass, "roster")
+
+    with patch(
+        "custom_components.fortnite.api.FortniteApiClient.async_get_stats",
+        AsyncMock(return_value=StatsResponse(payload)),
+    ), patch("custom_components.fortnite.async_setup_entry", return_value=True):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                "api_key": API_KEY,
+                "roster_name": "Club",
+                "players": "one, two\nOne",
+                "platforms": ["gamepad"],
+            },
+        )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"]["players"] == ["one", "two"]
+    assert result["data"]["platforms"] == ["gamepad"]
@@ -0,0 +1,376 @@
+"""Tests for the player coordinator."""
+from __future__ import annotations
+
+from copy import deepcopy
+from datetime import timedelta
+import time
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.fortnite.api import STATS_URL, FortniteApiError, StatsResponse
+from custom_components.fortnite.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+from custom_components.fortnite.const import (
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    CONF_POLLING_MODE,
+    DATA_DOMAIN_CONFIG,
+    DOMAIN,
+    EVENT_MATCH_COMPLETED,
+    POLL_JITTER,
+    POLLING_MODE_ADAPTIVE,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+)
+from custom_components.fortnite.coordinator import FortniteDataUpdateCoordinator
+
+from .conftest import ENTRY_DATA, PLAYER_ID
+
+
+def _client() -> MagicMock:
+    """Return a mock API client with a real circuit breaker."""
+    client = MagicMock()
+    client.breaker.return_value = CircuitBreaker(STATS_URL)
+    return client
+
+
+@pytest.fixture
+def coordinator(hass: HomeAssistant) -> FortniteDataUpdateCoordinator:
+    """Return a coordinator that does not poll."""
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    entry.add_to_hass(hass)
+    return FortniteDataUpdateCoordinator(hass, entry, _client(), update_interval=None)
+
+
+async def test_only_changed_contexts_are_updated(
+    coordinator: FortniteDataUpdateCoordinator,
+) -> None:
+    """Listeners are called only when their context changed."""
+    kills, wins, everything = MagicMock(), MagicMock(), MagicMock()
+    coordinator.async_add_listener(kills, ("gamepad", "solo", "kills"))
+    remove_wins = coordinator.async_add_listener(wins, ("gamepad", "solo", "wins"))
+    coordinator.async_add_listener(everything)
+    coordinator.async_update_listeners()
+    for listener in (kills, wins, everything):
+        listener.reset_mock()
+
+    coordinator._changed_contexts = {("gamepad", "solo", "kills")}
+    coordinator.async_update_listeners()
+
+    kills.assert_called_once()
+    wins.assert_not_called()
+    everything.assert_called_once()
+
+    remove_wins()
+    coordinator._changed_contexts = {("gamepad", "solo", "wins")}
+    coordinator.async_update_listeners()
+
+    wins.assert_not_called()
+    assert len(coordinator._context_listeners) == 2
+
+
+async def test_availability_change_updates_everything(
+    coordinator: FortniteDataUpdateCoordinator,
+) -> None:
+    """Every listener is called when the coordinator's availability flips."""
+    kills = MagicMock()
+    coordinator.async_add_listener(kills, ("gamepad", "solo", "kills"))
+    coordinator.async_update_listeners()
+    kills.reset_mock()
+
+    coordinator.last_update_success = False
+    coordinator._changed_contexts = set()
+    coordinator.async_update_listeners()
+
+    kills.assert_called_once()
+
+
+def _polling_coordinator(
+    hass: HomeAssistant, offset: float, **entry_kwargs: Any
+) -> FortniteDataUpdateCoordinator:
+    """Return a coordinator polling every 10 minutes at a phase."""
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA, **entry_kwargs)
+    entry.add_to_hass(hass)
+    coordinator = FortniteDataUpdateCoordinator(
+        hass, entry, _client(), update_interval=timedelta(minutes=10), poll_offset=offset
+    )
+    coordinator._async_update_data = AsyncMock(return_value={"player_id": PLAYER_ID})
+    return coordinator
+
+
+async def test_polls_are_aligned_to_the_phase(hass: HomeAssistant) -> None:
+    """The first listener arms the timer at the entry's phase plus jitter."""
+    coordinator = _polling_coordinator(hass, offset=42)
+    unsub = coordinator.async_add_listener(MagicMock())
+
+    assert coordinator._unsub_refresh is not None
+    delay = coordinator._next_poll - time.time()
+    assert 0 < delay <= 600 + POLL_JITTER
+    assert (coordinator._next_poll - 42) % 600 <= POLL_JITTER
+
+    unsub()
+    assert coordinator._unsub_refresh is None
+
+
+async def test_refresh_between_polls_keeps_the_due_poll(hass: HomeAssistant) -> None:
+    """A manual refresh does not push the next poll off the entry's phase."""
+    coordinator = _polling_coordinator(hass, offset=42)
+    coordinator.async_add_listener(MagicMock())
+    due = coordinator._next_poll
+
+    await coordinator.async_refresh()
+
+    assert coordinator._next_poll == due
+    assert coordinator._unsub_refresh is not None
+    await coordinator.async_shutdown()
+
+
+async def test_due_poll_moves_when_interval_shrinks(hass: HomeAssistant) -> None:
+    """A poll due further away than the new interval is realigned."""
+    coordinator = _polling_coordinator(hass, offset=0)
+    coordinator.async_add_listener(MagicMock())
+    coordinator._next_poll = time.time() + 3000
+
+    coordinator._schedule_refresh()
+
+    assert coordinator._next_poll - time.time() <= 600 + POLL_JITTER
+    await coordinator.async_shutdown()
+
+
+async def test_timer_poll_schedules_the_next_slot(hass: HomeAssistant) -> None:
+    """Once the due poll ran, the next one is one phase later."""
+    coordinator = _polling_coordinator(hass, offset=0)
+    coordinator.async_add_listener(MagicMock())
+    # The timer fires
+    coordinator._async_unsub_refresh()
+    await coordinator._handle_refresh_interval()
+
+    coordinator._async_update_data.assert_awaited_once()
+    assert coordinator._next_poll % 600 <= POLL_JITTER
+    assert coordinator._next_poll > time.time()
+    await coordinator.async_shutdown()
+
+
+async def test_no_polls_when_polling_is_disabled(hass: HomeAssistant) -> None:
+    """The entry's disable polling option is respected."""
+    coordinator = _polling_coordinator(hass, offset=0, pref_disable_polling=True)
+    coordinator.async_add_listener(MagicMock())
+
+    assert coordinator._unsub_refresh is None
+
+
+async def test_missing_input_is_served_stale(
+    coordinator: FortniteDataUpdateCoordinator, payload: dict
+) -> None:
+    """An input that had matches and comes back empty keeps its last data."""
+    coordinator.client.async_get_stats = AsyncMock(return_value=StatsResponse(payload))
+    await coordinator.async_refresh()
+    gamepad = coordinator.data["gamepad"]
+    assert not coordinator.input_stale("gamepad")
+
+    partial = deepcopy(payload)
+    partial["data"]["stats"]["gamepad"] = None
+    partial["data"]["stats"]["keyboardMouse"]["solo"]["matches"] = 7
+    coordinator.client.async_get_stats.return_value = StatsResponse(partial)
+    await coordinator.async_refresh()
+
+    assert coordinator.data["stale_inputs"] == ["gamepad"]
+    assert coordinator.data["gamepad"] == gamepad
+    assert coordinator.input_stale("gamepad")
+    assert not coordinator.input_stale("keyboardMouse")
+    fetched_at = coordinator.data_fetched_at(["gamepad", "keyboardMouse"])
+    assert fetched_at is not None
+    assert coordinator.data_fetched_at(["keyboardMouse"]) is None
+
+    # The fetch time stays put however many refreshes fail
+    coordinator.client.async_get_stats.side_effect = FortniteApiError("down")
+    for _ in range(2):
+        await coordinator.async_refresh()
+    coordinator.client.async_get_stats.side_effect = None
+    assert coordinator.data_fetched_at(["gamepad"]) == fetched_at
+    assert coordinator.data["keyboardMouse"]["solo"]["matches"] == 7
+    assert coordinator._unsub_revalidate is not None
+
+    coordinator.client.async_get_stats.return_value = StatsResponse(payload)
+    await coordinator.async_refresh()
+
+    assert coordinator.data["stale_inputs"] == []
+    assert coordinator._unsub_revalidate is None
+
+
+async def test_modes_never_played_are_not_stale(
+    coordinator: FortniteDataUpdateCoordinator, payload: dict
+) -> None:
+    """Null modes without previous matches are just not played yet."""
+    coordinator.client.async_get_stats = AsyncMock(return_value=StatsResponse(payload))
+    await coordinator.async_refresh()
+
+    update = deepcopy(payload)
+    update["data"]["stats"]["gamepad"]["solo"]["matches"] = 11
+    coordinator.client.async_get_stats.return_value = StatsResponse(update)
+    await coordinator.async_refresh()
+
+    # gamepad squad and keyboardMouse duo were null both times
+    assert coordinator.data["stale_inputs"] == []
+
+
+async def test_revalidation_keeps_the_due_poll(hass: HomeAssistant) -> None:
+    """Retrying a failed refresh does not push back the regular poll."""
+    coordinator = _polling_coordinator(hass, offset=0)
+    coordinator.async_add_listener(MagicMock())
+    await coordinator.async_refresh()
+    due = coordinator._next_poll
+
+    coordinator._async_update_data.side_effect = UpdateFailed("boom")
+    await coordinator.async_refresh()
+    coordinator._async_update_data.side_effect = None
+    await coordinator._async_revalidate(dt_util.utcnow())
+
+    assert coordinator._async_update_data.await_count == 3
+    assert coordinator._next_poll == due
+    await coordinator.async_shutdown()
+
+
+async def test_revalidation_waits_for_the_breaker(
+    coordinator: FortniteDataUpdateCoordinator, payload: dict
+) -> None:
+    """A failed refresh is retried once the open breaker lets a probe through."""
+    coordinator.client.async_get_stats = AsyncMock(return_value=StatsResponse(payload))
+    await coordinator.async_refresh()
+    assert coordinator.breaker_state == STATE_CLOSED
+
+    coordinator.client.breaker(STATS_URL).record_failure(retry_after=120)
+    coordinator.client.async_get_stats.side_effect = FortniteApiError("circuit open")
+    with patch(
+        "custom_components.fortnite.coordinator.async_call_later"
+    ) as async_call_later:
+        await coordinator.async_refresh()
+
+    assert coordinator.breaker_state == STATE_OPEN
+    assert async_call_later.call_args.args[1] == pytest.approx(120, abs=1)
+    assert coordinator.breaker_retry_in == pytest.approx(120, abs=1)
+
+
+async def test_match_events_follow_changed_counters(
+    hass: HomeAssistant, coordinator: FortniteDataUpdateCoordinator, payload: dict
+) -> None:
+    """A refresh with one more match fires one event."""
+    events = async_capture_events(hass, EVENT_MATCH_COMPLETED)
+    coordinator.client.async_get_stats = AsyncMock(return_value=StatsResponse(payload))
+    await coordinator.async_refresh()
+
+    coordinator.client.async_get_stats.return_value = StatsResponse(_one_more_match(payload))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    assert events[0].data["input"] == "gamepad"
+    assert events[0].data["game_mode"] == "solo"
+    assert events[0].data["player_id"] == PLAYER_ID
+
+
+async def test_no_match_events_across_a_restart(
+    hass: HomeAssistant, coordinator: FortniteDataUpdateCoordinator, payload: dict
+) -> None:
+    """Matches played while Home Assistant was down are not replayed."""
+    events = async_capture_events(hass, EVENT_MATCH_COMPLETED)
+    coordinator.client.async_get_stats = AsyncMock(return_value=StatsResponse(payload))
+    await coordinator.async_refresh()
+    coordinator._store.async_load = AsyncMock(return_value=coordinator._snapshot_data())
+
+    assert await coordinator.async_load_snapshot()
+    coordinator.client.async_get_stats.side_effect = FortniteApiError("down")
+    await coordinator.async_refresh()
+    coordinator.client.async_get_stats.side_effect = None
+    coordinator.client.async_get_stats.return_value = StatsResponse(_one_more_match(payload))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert not events
+
+    coordinator.client.async_get_stats.return_value = StatsResponse(
+        _one_more_match(_one_more_match(payload))
+    )
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    coordinator.async_cancel_revalidation()
+
+
+async def test_debounced_request_does_not_leak_its_priority(
+    coordinator: FortniteDataUpdateCoordinator, payload: dict
+) -> None:
+    """A user request folded into an earlier refresh leaves polls in the background."""
+    coordinator.client.async_get_stats = AsyncMock(return_value=StatsResponse(payload))
+    await coordinator.async_request_refresh()
+    assert (
+        coordinator.client.async_get_stats.call_args.kwargs["priority"]
+        == PRIORITY_INTERACTIVE
+    )
+
+    # Within the debouncer's cooldown, nothing is fetched right away
+    await coordinator.async_request_refresh()
+    assert coordinator.client.async_get_stats.await_count == 1
+
+    await coordinator.async_refresh()
+    assert (
+        coordinator.client.async_get_stats.call_args.kwargs["priority"]
+        == PRIORITY_BACKGROUND
+    )
+    await coordinator.async_shutdown()
+
+
+async def test_adaptive_interval_follows_activity(
+    hass: HomeAssistant, payload: dict
+) -> None:
+    """Idle refreshes back off up to the maximum, a new match polls at the minimum."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={**ENTRY_DATA, CONF_POLLING_MODE: POLLING_MODE_ADAPTIVE}
+    )
+    entry.add_to_hass(hass)
+    hass.data[DOMAIN] = {
+        DATA_DOMAIN_CONFIG: {
+            CONF_ADAPTIVE_MIN_INTERVAL: 60,
+            CONF_ADAPTIVE_MAX_INTERVAL: 1000,
+        }
+    }
+    client = _client()
+    client.async_get_stats = AsyncMock(return_value=StatsResponse(payload))
+    coordinator = FortniteDataUpdateCoordinator(hass, entry, client)
+
+    intervals = []
+    for _ in range(3):
+        await coordinator.async_refresh()
+        intervals.append(coordinator.update_interval.total_seconds())
+    assert intervals == [600, 1000, 1000]
+
+    client.async_get_stats.return_value = StatsResponse(_one_more_match(payload))
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+    # The daily quota still has the last word
+    with patch.object(coordinator.quota, "interval_floor", return_value=450.5):
+        await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=451)
+    await coordinator.async_shutdown()
+
+
+def _one_more_match(payload: dict) -> dict:
+    """Return the payload after one more gamepad solo match."""
+    update = deepcopy(payload)
+    solo = update["data"]["stats"]["gamepad"]["solo"]
+    solo["matches"] += 1
+    solo["kills"] += 2
+    solo["lastModified"] = f"{solo['lastModified']}-{solo['matches']}"
+    return update
@@ -0,0 +1,65 @@
+"""Tests for match inference."""
+from __future__ import annotations
+
+from custom_components.fortnite.events import infer_matches
+
+
+def _counters(**counters: int) -> dict[str, int]:
+    """Return transformed mode data with every counter at zero unless given."""
+    return {
+        "matches": 0,
+        "kills": 0,
+        "score": 0,
+        "minutes_played": 0,
+        "top1": 0,
+        "top3": 0,
+        "top5": 0,
+        "top6": 0,
+        "top10": 0,
+        "top12": 0,
+        "top25": 0,
+        **counters,
+    }
+
+
+def test_single_win() -> None:
+    """A won match counts for every placement counter."""
+    previous = _counters(matches=10, kills=20)
+    current = _counters(
+        matches=11, kills=25, score=300, minutes_played=20,
+        top1=1, top3=1, top5=1, top6=1, top10=1, top12=1, top25=1,
+    )
+
+    assert infer_matches(previous, current) == [
+        {
+            "match_index": 0,
+            "matches_in_interval": 1,
+            "won": True,
+            "placement": "top1",
+            "kills": 5,
+            "score": 300,
+            "minutes_played": 20,
+        }
+    ]
+
+
+def test_matches_in_one_interval_are_split() -> None:
+    """Several matches are ordered best first and share the counters evenly."""
+    current = _counters(matches=3, kills=7, score=100, minutes_played=30, top10=1, top25=2)
+
+    matches = infer_matches(_counters(), current)
+
+    assert [match["placement"] for match in matches] == ["top10", "top25", None]
+    assert [match["kills"] for match in matches] == [3, 2, 2]
+    assert [match["score"] for match in matches] == [34, 33, 33]
+    assert not any(match["won"] for match in matches)
+    assert {match["matches_in_interval"] for match in matches} == {3}
+
+
+def test_no_matches() -> None:
+    """Unchanged counters and stats resets yield nothing."""
+    counters = _counters(matches=5, kills=9)
+
+    assert infer_matches(counters, counters) == []
+    assert infer_matches(counters, _counters(matches=6, kills=2)) == []
+    assert infer_matches({}, _counters(kills=3)) == []
@@ -0,0 +1,148 @@
+"""Tests for the stats history export."""
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+import threading
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.fortnite.const import (
+    DOMAIN,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_PARQUET,
+    HISTORY_EXPORT_DIRECTORY,
+    SERVICE_EXPORT_HISTORY,
+)
+from custom_components.fortnite.export import export_history
+from custom_components.fortnite.services import async_setup_services
+from custom_components.fortnite.timeseries import StatsDatabase, async_get_stats_database
+
+
+def _fill(database: StatsDatabase) -> None:
+    """Store two changes for one player."""
+    zero = [0] * len(database.counters)
+    database.record("player", 0, {("gamepad", "solo"): zero})
+    database.record("player", 60, {("gamepad", "solo"): [1] * len(database.counters)})
+    database.record("player", 120, {("gamepad", "solo"): [3] * len(database.counters)})
+
+
+def test_export_csv(tmp_path: Path) -> None:
+    """Every change is written with an ISO timestamp."""
+    database = StatsDatabase(str(tmp_path / "stats.db"))
+    _fill(database)
+    path = tmp_path / "export.csv"
+
+    rows = export_history(database, str(path), EXPORT_FORMAT_CSV, 0, 1000)
+
+    with open(path, newline="", encoding="utf-8") as file:
+        lines = list(csv.reader(file))
+    assert rows == 2
+    assert lines[0] == ["player", "input", "mode", "timestamp", *database.counters]
+    assert lines[1][:4] == ["player", "gamepad", "solo", "1970-01-01T00:01:00+00:00"]
+    assert lines[2][4:] == ["2"] * len(database.counters)
+    assert not (tmp_path / "export.csv.partial").exists()
+    database.close()
+
+
+@pytest.mark.parametrize("directory", ["odd?name", "odd#name", "with space"])
+def test_export_from_unusual_paths(tmp_path: Path, directory: str) -> None:
+    """The read-only connection finds databases whose path needs URI escaping."""
+    (tmp_path / directory).mkdir()
+    database = StatsDatabase(str(tmp_path / directory / "stats.db"))
+    _fill(database)
+
+    rows = export_history(
+        database, str(tmp_path / "export.csv"), EXPORT_FORMAT_CSV, 0, 1000
+    )
+
+    assert rows == 2
+    database.close()
+
+
+def test_failed_export_leaves_no_file(tmp_path: Path) -> None:
+    """A failing export removes its partial file."""
+    database = StatsDatabase(str(tmp_path / "stats.db"))
+    _fill(database)
+    path = tmp_path / "missing" / "export.csv"
+
+    with pytest.raises(OSError):
+        export_history(database, str(path), EXPORT_FORMAT_CSV, 0, 1000)
+
+    assert not path.parent.exists()
+    database.close()
+
+
+async def test_export_service(hass: HomeAssistant, tmp_path: Path) -> None:
+    """The service writes to the export directory and reports the rows."""
+    hass.config.config_dir = str(tmp_path)
+    async_setup_services(hass)
+    database = async_get_stats_database(hass)
+    await hass.async_add_executor_job(_fill, database)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        {"filename": "history.csv"},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        "path": str(tmp_path / HISTORY_EXPORT_DIRECTORY / "history.csv"),
+        "rows": 2,
+    }
+    await hass.async_add_executor_job(database.close)
+
+
+async def test_export_service_looks_up_the_database_on_the_loop(
+    hass: HomeAssistant, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The database is created on the event loop, not in the export job."""
+    hass.config.config_dir = str(tmp_path)
+    async_setup_services(hass)
+    threads = []
+
+    def get_database(hass: HomeAssistant) -> StatsDatabase:
+        threads.append(threading.get_ident())
+        return async_get_stats_database(hass)
+
+    monkeypatch.setattr(
+        "custom_components.fortnite.services.async_get_stats_database", get_database
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        {"filename": "empty.csv"},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["rows"] == 0
+    assert threads == [threading.get_ident()]
+    await hass.async_add_executor_job(async_get_stats_database(hass).close)
+
+
+async def test_parquet_without_pyarrow(
+    hass: HomeAssistant, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Parquet is refused up front when pyarrow is missing."""
+    hass.config.config_dir = str(tmp_path)
+    async_setup_services(hass)
+    monkeypatch.setattr(
+        "custom_components.fortnite.services.find_spec", lambda name: None
+    )
+
+    with pytest.raises(HomeAssistantError, match="pyarrow"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_EXPORT_HISTORY,
+            {"format": EXPORT_FORMAT_PARQUET},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert not (tmp_path / HISTORY_EXPORT_DIRECTORY).exists()
@@ -0,0 +1,64 @@
+"""Tests for the bounded, deadline-limited request fan-out."""
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.fortnite.fetch import async_fetch_all
+
+
+async def test_results_and_errors_per_key() -> None:
+    """Every key gets its result or the exception it raised."""
+
+    async def ok() -> str:
+        return "ok"
+
+    async def fail() -> str:
+        raise ValueError("boom")
+
+    results = await async_fetch_all({"a": ok, "b": fail}, limit=2, deadline=1)
+
+    assert results["a"] == "ok"
+    assert isinstance(results["b"], ValueError)
+
+
+async def test_concurrency_is_limited() -> None:
+    """No more than `limit` fetchers run at once."""
+    running = peak = 0
+
+    async def fetch() -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0)
+        running -= 1
+
+    await async_fetch_all({key: fetch for key in range(10)}, limit=3, deadline=1)
+
+    assert peak == 3
+
+
+async def test_deadline_cancels_slow_fetchers() -> None:
+    """Fetchers still running at the deadline are cancelled and get a TimeoutError."""
+    cancelled = asyncio.Event()
+
+    async def fast() -> str:
+        return "fast"
+
+    async def slow() -> str:
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "slow"
+
+    results = await async_fetch_all({"fast": fast, "slow": slow}, limit=2, deadline=0.05)
+
+    assert results["fast"] == "fast"
+    assert isinstance(results["slow"], asyncio.TimeoutError)
+    assert cancelled.is_set()
+
+
+async def test_nothing_to_fetch() -> None:
+    """An empty fan-out returns at once."""
+    assert await async_fetch_all({}, limit=1, deadline=1) == {}
@@ -0,0 +1,103 @@
+"""Tests for the snapshot history and the rates derived from it."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.fortnite.history import PlayerHistory, SnapshotRing
+
+HOUR = 3600
+
+
+def _data(kills: int, matches: int, wins: int = 0) -> dict:
+    """Return transformed data with counters on gamepad solo only."""
+    return {"gamepad": {"solo": {"kills": kills, "matches": matches, "top1": wins}}}
+
+
+def test_ring_overwrites_the_oldest_row() -> None:
+    """A full ring drops its oldest row and keeps logical order."""
+    ring = SnapshotRing(width=2, capacity=3)
+    for step in range(5):
+        ring.append(float(step), [step, step * 10])
+
+    assert len(ring) == 3
+    assert [ring.timestamp(index) for index in range(3)] == [2.0, 3.0, 4.0]
+    assert list(ring.row(0)) == [2, 20]
+    assert ring.value(2, 1) == 40
+    assert ring.nbytes == 3 * 8 + 3 * 2 * 8
+    with pytest.raises(IndexError):
+        ring.row(3)
+
+
+def test_ring_index_at() -> None:
+    """index_at finds the newest row at or before a time."""
+    ring = SnapshotRing(width=1, capacity=4)
+    for timestamp in (10.0, 20.0, 30.0):
+        ring.append(timestamp, [0])
+
+    assert ring.index_at(5.0) is None
+    assert ring.index_at(10.0) == 0
+    assert ring.index_at(25.0) == 1
+    assert ring.index_at(99.0) == 2
+
+
+def test_record_skips_unchanged_snapshots() -> None:
+    """Only snapshots with a changed counter are stored."""
+    history = PlayerHistory()
+
+    assert history.record(0, _data(kills=1, matches=1))
+    assert not history.record(HOUR, _data(kills=1, matches=1))
+    assert history.record(HOUR, _data(kills=2, matches=2))
+    assert len(history.ring) == 2
+
+
+def test_history_fits_its_budget() -> None:
+    """The ring is sized from the memory budget."""
+    history = PlayerHistory(max_bytes=10_000)
+
+    assert history.ring.nbytes <= 10_000
+    assert history.ring.capacity >= 2
+
+
+def test_rates_over_the_window() -> None:
+    """Per-hour rates use the value at the start of the window."""
+    history = PlayerHistory()
+    history.record(0, _data(kills=10, matches=5))
+    history.record(12 * HOUR, _data(kills=20, matches=8))
+    history.record(30 * HOUR, _data(kills=44, matches=14, wins=3))
+
+    rates = history.rates(30 * HOUR, ["gamepad"], ["solo"], window=24 * HOUR)
+
+    # The window starts at 6h, when the counters were still those of 0h
+    assert rates["kills_per_hour"] == round(34 / 24, 2)
+    assert rates["matches_per_hour"] == round(9 / 24, 2)
+
+
+def test_rates_before_a_full_window() -> None:
+    """A history shorter than the window is rated over its own length."""
+    history = PlayerHistory()
+    history.record(0, _data(kills=0, matches=0))
+    history.record(2 * HOUR, _data(kills=6, matches=4))
+
+    rates = history.rates(4 * HOUR, ["gamepad", "touch"], ["solo", "duo"])
+
+    assert rates["kills_per_hour"] == 1.5
+    assert rates["matches_per_hour"] == 1.0
+
+
+def test_recent_win_rate() -> None:
+    """The win rate covers at least the last N matches, walking back as needed."""
+    history = PlayerHistory()
+    history.record(0, _data(kills=0, matches=0))
+    history.record(1, _data(kills=0, matches=10, wins=5))
+    history.record(2, _data(kills=0, matches=15, wins=6))
+    history.record(3, _data(kills=0, matches=20, wins=6))
+
+    rates = history.rates(3, ["gamepad"], ["solo"], recent_matches=8)
+
+    assert rates["recent_matches"] == 10
+    assert rates["recent_win_rate"] == 10.0
+
+
+def test_no_rates_without_history() -> None:
+    """An empty history has no rates."""
+    assert PlayerHistory().rates(0, ["gamepad"], ["solo"]) == {}
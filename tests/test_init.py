@@ -0,0 +1,175 @@
+"""Tests for setting up and running a Fortnite Stats entry."""
+from __future__ import annotations
+
+from copy import deepcopy
+from http import HTTPStatus
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, StateMachine
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_capture_events
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.fortnite.api import STATS_URL
+from custom_components.fortnite.const import (
+    DATA_API_CLIENT,
+    DOMAIN,
+    EVENT_MATCH_COMPLETED,
+)
+from custom_components.fortnite.coordinator import FortniteDataUpdateCoordinator
+
+from .conftest import setup_entry
+
+SOLO_KILLS = "sensor.fortnite_captain_crunch88_console_solo_eliminations"
+SQUAD_KILLS = "sensor.fortnite_captain_crunch88_pc_squad_eliminations"
+QUOTA = "sensor.fortnite_captain_crunch88_api_quota_remaining"
+
+
+async def _refresh(
+    hass: HomeAssistant, coordinator: FortniteDataUpdateCoordinator
+) -> list[str]:
+    """Refresh the coordinator, return the entity ids written."""
+    with patch.object(
+        StateMachine, "async_set", autospec=True, side_effect=StateMachine.async_set
+    ) as async_set:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    return [call.args[1] for call in async_set.call_args_list]
+
+
+def _one_more_match(payload: dict) -> dict:
+    """Return the payload after one more gamepad solo match."""
+    update = deepcopy(payload)
+    solo = update["data"]["stats"]["gamepad"]["solo"]
+    solo["matches"] += 1
+    solo["kills"] += 3
+    solo["lastModified"] = "2026-01-02T00:00:00Z"
+    return update
+
+
+async def test_setup_creates_sensors(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, payload: dict
+) -> None:
+    """Setting up an entry creates the player's sensors and the quota sensor."""
+    aioclient_mock.get(STATS_URL, json=payload)
+    entry = await setup_entry(hass)
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.states.get(SOLO_KILLS).state == "20"
+    assert hass.states.get(QUOTA).attributes["requests_today"] == 1
+    # 9 stats for the 4 played input/modes and the 6 aggregates, 3 rates and
+    # the quota sensor; the 2 input/modes never played start disabled
+    assert len(hass.states.async_entity_ids("sensor")) == (4 + 6) * 9 + 3 + 1
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_unchanged_refresh_writes_only_quota(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    payload: dict,
+) -> None:
+    """A refresh without new stats only updates the request count."""
+    aioclient_mock.get(STATS_URL, json=payload)
+    entry = await setup_entry(hass)
+
+    written = await _refresh(hass, hass.data[DOMAIN][entry.entry_id])
+
+    assert aioclient_mock.call_count == 2
+    assert written == [QUOTA]
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_changed_refresh_writes_states_and_fires_events(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    payload: dict,
+) -> None:
+    """New stats update the sensors that changed and fire a match event."""
+    aioclient_mock.get(STATS_URL, json=payload)
+    entry = await setup_entry(hass)
+    events = async_capture_events(hass, EVENT_MATCH_COMPLETED)
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(STATS_URL, json=_one_more_match(payload))
+
+    written = await _refresh(hass, hass.data[DOMAIN][entry.entry_id])
+
+    assert hass.states.get(SOLO_KILLS).state == "23"
+    assert SOLO_KILLS in written
+    assert SQUAD_KILLS not in written
+    assert len(events) == 1
+    assert events[0].data["kills"] == 3
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_entries_share_responses_but_never_their_own(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, payload: dict
+) -> None:
+    """A second entry reuses the first one's response; a repeated poll fetches again."""
+    aioclient_mock.get(STATS_URL, json=payload)
+    first = await setup_entry(hass)
+    second = await setup_entry(hass, aggregated_sensors=False)
+    assert aioclient_mock.call_count == 1
+
+    await _refresh(hass, hass.data[DOMAIN][first.entry_id])
+    assert aioclient_mock.call_count == 2
+
+    # The first entry fetched since the second one's last response
+    await _refresh(hass, hass.data[DOMAIN][second.entry_id])
+    assert aioclient_mock.call_count == 2
+    assert await hass.config_entries.async_unload(first.entry_id)
+    assert await hass.config_entries.async_unload(second.entry_id)
+
+
+async def test_failures_serve_stale_data_and_open_the_breaker(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    payload: dict,
+) -> None:
+    """Failed refreshes keep the last data, marked stale, and open the breaker."""
+    aioclient_mock.get(STATS_URL, json=payload)
+    entry = await setup_entry(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(STATS_URL, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    await _refresh(hass, coordinator)
+
+    state = hass.states.get(SOLO_KILLS)
+    assert state.state == "20"
+    assert state.attributes["stale"] is True
+    fetched_at = state.attributes["data_fetched_at"]
+    assert dt_util.parse_datetime(fetched_at) <= dt_util.utcnow()
+    assert hass.states.get(QUOTA).attributes["api_status"] == "closed"
+
+    for _ in range(2):
+        await _refresh(hass, coordinator)
+
+    assert aioclient_mock.call_count == 3
+    assert hass.states.get(QUOTA).attributes["api_status"] == "open"
+    assert hass.states.get(QUOTA).attributes["api_retry_in"] > 0
+
+    # Open breaker: no request goes out
+    await _refresh(hass, coordinator)
+    assert aioclient_mock.call_count == 3
+    state = hass.states.get(SOLO_KILLS)
+    assert state.attributes["stale"] is True
+    assert state.attributes["data_fetched_at"] == fetched_at
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_unload_releases_the_client(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker, payload: dict
+) -> None:
+    """The shared client is closed once the last entry is unloaded."""
+    aioclient_mock.get(STATS_URL, json=payload)
+    first = await setup_entry(hass)
+    second = await setup_entry(hass, player_id="Second_Player")
+    client = hass.data[DOMAIN][DATA_API_CLIENT]
+
+    assert await hass.config_entries.async_unload(first.entry_id)
+    assert hass.data[DOMAIN][DATA_API_CLIENT] is client
+
+    assert await hass.config_entries.async_unload(second.entry_id)
+    assert DATA_API_CLIENT not in hass.data[DOMAIN]
+    assert first.state is ConfigEntryState.NOT_LOADED
@@ -0,0 +1,98 @@
+"""Tests for the pool of API keys."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.fortnite.const import KEY_COOLDOWN, KEY_INVALID_COOLDOWN
+from custom_components.fortnite.key_pool import ApiKeyPool
+from custom_components.fortnite.quota import QuotaAccountant
+
+
+def _tick(clock: list[float], pool: ApiKeyPool, entry_key: str = "entry") -> str:
+    """Advance the clock a little and select a key."""
+    clock[0] += 1
+    return pool.select(entry_key)
+
+
+def test_inactive_pool_keeps_the_entry_key() -> None:
+    """Without pooled keys every request keeps its own key."""
+    pool = ApiKeyPool([])
+
+    assert not pool.active
+    assert pool.select("entry") == "entry"
+    pool.record_failure("entry", 429)
+    assert pool.select("entry") == "entry"
+
+
+def test_keys_rotate(clock: list[float]) -> None:
+    """Keys are used round robin while they are equally good, entry keys included."""
+    pool = ApiKeyPool(["a", "b"])
+
+    selected = [_tick(clock, pool) for _ in range(6)]
+
+    assert set(selected) == {"a", "b", "entry"}
+    assert selected[:3] == selected[3:]
+    assert pool.keys == ["a", "b", "entry"]
+
+
+def test_throttled_key_cools_down(clock: list[float]) -> None:
+    """A key answered 429 sits out, longer each time it keeps failing."""
+    pool = ApiKeyPool(["a", "b"])
+
+    pool.record_failure("a", 429)
+    assert "a" not in {_tick(clock, pool) for _ in range(4)}
+
+    # Back after the cooldown, but behind the keys that were not throttled
+    clock[0] += KEY_COOLDOWN
+    assert "a" not in {_tick(clock, pool) for _ in range(3)}
+    pool.record_failure("b", 401)
+    pool.record_failure("entry", 401)
+    assert _tick(clock, pool) == "a"
+
+    pool.record_failure("a", 429)
+    clock[0] += KEY_COOLDOWN
+    assert pool._health["a"].available_at > clock[0]
+
+    pool.record_success("a")
+    assert pool._health["a"].failures == 0
+
+
+def test_retry_after_extends_the_cooldown(clock: list[float]) -> None:
+    """The server's Retry-After wins over a shorter cooldown."""
+    pool = ApiKeyPool(["a", "b"])
+
+    pool.record_failure("a", 429, retry_after=KEY_COOLDOWN * 10)
+    clock[0] += KEY_COOLDOWN * 5
+
+    assert "a" not in {_tick(clock, pool) for _ in range(4)}
+
+
+def test_invalid_key_cools_down(clock: list[float]) -> None:
+    """A key answered 401 sits out the invalid key cooldown."""
+    pool = ApiKeyPool(["a", "b"])
+
+    pool.record_failure("b", 401)
+    clock[0] += KEY_INVALID_COOLDOWN - 10
+    assert "b" not in {_tick(clock, pool) for _ in range(4)}
+
+
+def test_all_keys_cooling_down(clock: list[float]) -> None:
+    """With every key out of rotation the one recovering first is used."""
+    pool = ApiKeyPool(["a"])
+    pool.select("entry")
+    pool.record_failure("a", 401)
+    pool.record_failure("entry", 429)
+
+    assert pool.select("entry") == "entry"
+
+
+async def test_key_with_most_quota_left_wins(hass: HomeAssistant, clock: list[float]) -> None:
+    """Keys are picked by the requests they have left today."""
+    quota = QuotaAccountant(hass, daily_quota=10)
+    pool = ApiKeyPool(["a", "b"], quota)
+    for _ in range(3):
+        quota.record("a")
+    quota.record("entry")
+
+    assert _tick(clock, pool) == "b"
+    assert quota.remaining("a") == 26
@@ -0,0 +1,117 @@
+"""Tests for the daily request budget."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.fortnite.quota import QuotaAccountant, quota_key
+
+from .conftest import API_KEY
+
+
+@pytest.fixture
+def now(freezer: FrozenDateTimeFactory) -> datetime:
+    """Freeze time at noon UTC."""
+    moment = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+    freezer.move_to(moment)
+    return moment
+
+
+async def test_counts_and_budget(hass: HomeAssistant, now: datetime) -> None:
+    """Requests are counted per key against the daily quota."""
+    quota = QuotaAccountant(hass, daily_quota=100)
+    for _ in range(3):
+        quota.record(API_KEY)
+
+    assert quota.used(API_KEY) == 3
+    assert quota.remaining(API_KEY) == 97
+    assert quota.used("other") == 0
+    assert quota.resets_at() == datetime(2026, 3, 2, tzinfo=timezone.utc)
+    assert quota_key(API_KEY) != API_KEY
+
+
+async def test_no_budget_without_quota(hass: HomeAssistant, now: datetime) -> None:
+    """Without a quota only counting happens."""
+    quota = QuotaAccountant(hass)
+    quota.track("entry", API_KEY, 2)
+    quota.record(API_KEY)
+
+    assert quota.remaining(API_KEY) is None
+    assert quota.key_remaining(API_KEY) is None
+    assert quota.interval_floor(API_KEY) == 0.0
+
+
+async def test_interval_floor(hass: HomeAssistant, now: datetime) -> None:
+    """Polls are spread so the players fit in what is left of the day."""
+    quota = QuotaAccountant(hass, daily_quota=100)
+    quota.track("one", API_KEY, 2)
+    quota.track("two", API_KEY, 1)
+    for _ in range(28):
+        quota.record(API_KEY)
+
+    # 3 players, 12 hours and 72 requests left: one poll per player every 30 minutes
+    assert quota.players(API_KEY) == 3
+    assert quota.interval_floor(API_KEY) == 1800
+
+    quota.untrack("two")
+    assert quota.interval_floor(API_KEY) == 1200
+
+
+async def test_spent_budget_waits_for_reset(hass: HomeAssistant, now: datetime) -> None:
+    """With nothing left, the floor is the time until the reset."""
+    quota = QuotaAccountant(hass, daily_quota=2)
+    quota.track("entry", API_KEY, 1)
+    quota.record(API_KEY)
+    quota.record(API_KEY)
+
+    assert quota.remaining(API_KEY) == 0
+    assert quota.interval_floor(API_KEY) == 12 * 3600
+
+
+async def test_pooled_keys_share_a_budget(hass: HomeAssistant, now: datetime) -> None:
+    """Pooled keys add up their quotas and count each other's requests."""
+    quota = QuotaAccountant(hass, daily_quota=10)
+    quota.pool(["a", "b"])
+    quota.record("a")
+    quota.record("b")
+    quota.record("b")
+
+    assert quota.used("a") == 3
+    assert quota.remaining("a") == 17
+    assert quota.key_remaining("b") == 8
+    assert quota.remaining("c") == 10
+
+
+async def test_counts_start_over_every_day(
+    hass: HomeAssistant, now: datetime, freezer: FrozenDateTimeFactory
+) -> None:
+    """A new UTC day resets the counts."""
+    quota = QuotaAccountant(hass, daily_quota=10)
+    quota.record(API_KEY)
+
+    freezer.move_to(datetime(2026, 3, 2, 0, 1, tzinfo=timezone.utc))
+
+    assert quota.used(API_KEY) == 0
+
+
+async def test_counts_survive_a_restart(
+    hass: HomeAssistant, now: datetime, freezer: FrozenDateTimeFactory, hass_storage: dict
+) -> None:
+    """Today's counts are saved and added back after a restart."""
+    quota = QuotaAccountant(hass, daily_quota=10)
+    await quota.async_load()
+    quota.record(API_KEY)
+    quota.record(API_KEY)
+    freezer.tick(60)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    restarted = QuotaAccountant(hass, daily_quota=10)
+    await restarted.async_load()
+    restarted.record(API_KEY)
+
+    assert restarted.used(API_KEY) == 3
@@ -0,0 +1,70 @@
+"""Tests for the domain-wide token bucket."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.fortnite.const import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from custom_components.fortnite.rate_limit import TokenBucket
+
+
+async def test_burst_is_served_immediately() -> None:
+    """Requests within the burst do not wait."""
+    bucket = TokenBucket(rate=0.001, burst=3)
+
+    for _ in range(3):
+        await asyncio.wait_for(bucket.acquire(), 0.1)
+
+    assert bucket.pending == 0
+
+
+async def test_waiters_are_served_by_priority() -> None:
+    """Interactive requests overtake queued background polls."""
+    bucket = TokenBucket(rate=100, burst=1)
+    await bucket.acquire()
+    served: list[str] = []
+
+    async def request(name: str, priority: int) -> None:
+        await bucket.acquire(priority)
+        served.append(name)
+
+    tasks = [
+        asyncio.create_task(request("poll-1", PRIORITY_BACKGROUND)),
+        asyncio.create_task(request("poll-2", PRIORITY_BACKGROUND)),
+        asyncio.create_task(request("refresh", PRIORITY_INTERACTIVE)),
+    ]
+    await asyncio.sleep(0)
+    assert bucket.pending == 3
+
+    await asyncio.wait_for(asyncio.gather(*tasks), 1)
+
+    assert served == ["refresh", "poll-1", "poll-2"]
+
+
+async def test_cancelled_waiter_does_not_take_a_token() -> None:
+    """A waiter that gave up is skipped when tokens are handed out."""
+    bucket = TokenBucket(rate=100, burst=1)
+    await bucket.acquire()
+    gone = asyncio.create_task(bucket.acquire())
+    waiting = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0)
+
+    gone.cancel()
+    await asyncio.wait_for(waiting, 1)
+
+    assert bucket.pending == 0
+
+
+async def test_cancel_fails_every_waiter() -> None:
+    """Cancelling the bucket releases queued requests with CancelledError."""
+    bucket = TokenBucket(rate=0.001, burst=1)
+    await bucket.acquire()
+    waiter = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0)
+
+    bucket.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert bucket.pending == 0
@@ -0,0 +1,173 @@
+"""Tests for roster entries tracking many players."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.fortnite.const import (
+    CONF_API_KEY,
+    CONF_COMPACT_ENTITIES,
+    CONF_ENTRY_TYPE,
+    CONF_PLAYERS,
+    CONF_ROSTER_NAME,
+    DATA_API_CLIENT,
+    DOMAIN,
+    ENTRY_TYPE_ROSTER,
+    ROSTER_SLICE_INTERVAL,
+    SNAPSHOT_SAVE_DELAY,
+)
+from custom_components.fortnite.coordinator import snapshot_storage_key
+from custom_components.fortnite.quota import async_get_quota_accountant
+from custom_components.fortnite.roster import FortniteRoster, parse_roster
+
+from .conftest import API_KEY
+
+PLAYERS = [f"Player{index:02d}" for index in range(20)]
+
+
+def _roster_entry(hass: HomeAssistant, players: list[str] = PLAYERS) -> MockConfigEntry:
+    """Add a roster entry with compact entities to hass."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Club",
+        data={
+            CONF_API_KEY: API_KEY,
+            CONF_ENTRY_TYPE: ENTRY_TYPE_ROSTER,
+            CONF_ROSTER_NAME: "Club",
+            CONF_PLAYERS: players,
+            CONF_COMPACT_ENTITIES: True,
+            "aggregated_sensors": False,
+            "platforms": ["gamepad", "keyboardMouse"],
+            "game_modes": ["solo", "duo", "squad"],
+        },
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+async def _setup_roster(hass: HomeAssistant, entry: MockConfigEntry) -> FortniteRoster:
+    """Set up a roster entry and wait for its background refresh."""
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    # Players without a snapshot are fetched by a background task
+    await asyncio.gather(*entry._background_tasks)
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+def _client(get_stats: AsyncMock) -> MagicMock:
+    """Return an API client answering with the given mock."""
+    client = MagicMock()
+    client.async_get_stats = get_stats
+    return client
+
+
+def _requested(mock_stats: AsyncMock) -> list[str]:
+    """Return the players requested since the mock was last reset."""
+    return [call.args[1] for call in mock_stats.call_args_list]
+
+
+def test_parse_roster() -> None:
+    """Names are split on lines, commas and semicolons, without duplicates."""
+    text = "Alpha, Bravo\n  alpha ;Charlie\n\n,"
+
+    assert parse_roster(text) == ["Alpha", "Bravo", "Charlie"]
+
+
+async def test_slices_rotate_over_the_roster(
+    hass: HomeAssistant, mock_stats: AsyncMock
+) -> None:
+    """Every tick refreshes the next slice, wrapping around after the last."""
+    roster = FortniteRoster(hass, _roster_entry(hass), _client(mock_stats))
+
+    slices = []
+    for _ in range(roster.slices + 1):
+        mock_stats.reset_mock()
+        await roster._async_refresh_slice(dt_util.utcnow())
+        slices.append(_requested(mock_stats))
+
+    assert roster.slices == 10
+    assert slices[0] == PLAYERS[0:2]
+    assert slices[9] == PLAYERS[18:20]
+    assert slices[10] == slices[0]
+    assert sorted(sum(slices[:10], [])) == PLAYERS
+
+
+async def test_ticks_are_skipped_when_quota_is_short(
+    hass: HomeAssistant, mock_stats: AsyncMock
+) -> None:
+    """With a quota floor twice the scan interval, every other tick is skipped."""
+    roster = FortniteRoster(hass, _roster_entry(hass), _client(mock_stats))
+
+    refreshed = []
+    with patch.object(roster.quota, "interval_floor", return_value=600):
+        for _ in range(4):
+            mock_stats.reset_mock()
+            await roster._async_refresh_slice(dt_util.utcnow())
+            refreshed.append(_requested(mock_stats))
+
+    assert refreshed == [PLAYERS[0:2], [], PLAYERS[2:4], []]
+
+
+async def test_players_without_snapshot_are_fetched_in_the_background(
+    hass: HomeAssistant,
+    mock_stats: AsyncMock,
+    freezer: FrozenDateTimeFactory,
+    hass_storage: dict,
+) -> None:
+    """Setup does not wait on the API; only players without a snapshot are fetched."""
+    players = ["Alpha", "Bravo", "Charlie"]
+    entry = _roster_entry(hass, players)
+    roster = await _setup_roster(hass, entry)
+
+    assert sorted(_requested(mock_stats)) == players
+    assert all(coordinator.data for coordinator in roster.coordinators.values())
+
+    # Persist the snapshots, then forget Bravo's
+    freezer.tick(SNAPSHOT_SAVE_DELAY + 1)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    del hass_storage[snapshot_storage_key(entry, "Bravo")]
+
+    mock_stats.reset_mock()
+    await _setup_roster(hass, entry)
+
+    assert _requested(mock_stats) == ["Bravo"]
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_unload_stops_the_roster(
+    hass: HomeAssistant, mock_stats: AsyncMock, freezer: FrozenDateTimeFactory
+) -> None:
+    """After unloading, no slice is refreshed and the players are no longer counted."""
+    entry = _roster_entry(hass)
+    await _setup_roster(hass, entry)
+    quota = async_get_quota_accountant(hass)
+    assert quota.players(API_KEY) == len(PLAYERS)
+
+    mock_stats.reset_mock()
+    freezer.tick(timedelta(seconds=ROSTER_SLICE_INTERVAL))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert _requested(mock_stats) == PLAYERS[0:2]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert entry.state is ConfigEntryState.NOT_LOADED
+    assert quota.players(API_KEY) == 0
+    assert DATA_API_CLIENT not in hass.data[DOMAIN]
+
+    mock_stats.reset_mock()
+    freezer.tick(timedelta(seconds=ROSTER_SLICE_INTERVAL))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert not mock_stats.called
@@ -0,0 +1,48 @@
+"""Tests for the poll scheduler spreading entries over the scan interval."""
+from __future__ import annotations
+
+import zlib
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.fortnite.scheduler import PollScheduler
+
+
+async def test_entries_are_spread_over_the_interval(hass: HomeAssistant) -> None:
+    """Each new entry takes the middle of the largest gap."""
+    scheduler = PollScheduler(hass, interval=300)
+
+    first = await scheduler.async_offset("a")
+    offsets = [first]
+    for entry_id in ("b", "c", "d"):
+        offsets.append(await scheduler.async_offset(entry_id))
+
+    assert first == zlib.crc32(b"a") % 300
+    relative = sorted((offset - first) % 300 for offset in offsets)
+    assert relative == [0, 75, 150, 225]
+
+
+async def test_offsets_are_kept_and_released(hass: HomeAssistant) -> None:
+    """An entry keeps its phase; a removed entry's gap is handed out again."""
+    scheduler = PollScheduler(hass, interval=300)
+    offsets = {entry_id: await scheduler.async_offset(entry_id) for entry_id in "ab"}
+
+    assert await scheduler.async_offset("b") == offsets["b"]
+
+    await scheduler.async_remove("b")
+    assert await scheduler.async_offset("c") == offsets["b"]
+
+
+async def test_offsets_survive_a_restart(hass: HomeAssistant, hass_storage: dict) -> None:
+    """Phases are loaded from storage instead of being assigned again."""
+    hass_storage["fortnite.schedule"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "fortnite.schedule",
+        "data": {"a": 10.0, "b": 20.0},
+    }
+    scheduler = PollScheduler(hass, interval=300)
+
+    assert await scheduler.async_offset("a") == 10.0
+    # The largest gap runs from 20 around to 10
+    assert await scheduler.async_offset("c") == 165.0
@@ -0,0 +1,176 @@
+"""Tests for the Fortnite Stats sensors."""
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.recorder import Recorder, get_instance, history
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity_platform import EntityPlatform
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.fortnite.api import STATS_URL, async_get_api_client
+from custom_components.fortnite.const import (
+    CONF_COMPACT_ENTITIES,
+    CONF_ENTITY_BATCH_SIZE,
+    CONF_LONG_TERM_STATISTICS,
+    DOMAIN,
+    SIGNAL_QUOTA_UPDATED,
+)
+from custom_components.fortnite.quota import quota_key
+
+from .conftest import API_KEY, setup_entry
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_db_url: str, enable_custom_integrations: None
+) -> None:
+    """Load the integration, preparing the recorder database before hass starts."""
+
+
+SOLO_KILLS = "sensor.fortnite_captain_crunch88_console_solo_eliminations"
+ALL_KILLS = "sensor.fortnite_captain_crunch88_all_platforms_all_modes_eliminations"
+KILLS_PER_HOUR = "sensor.fortnite_captain_crunch88_kills_per_hour"
+COMPACT_SOLO = "sensor.fortnite_captain_crunch88_console_solo"
+QUOTA = "sensor.fortnite_captain_crunch88_api_quota_remaining"
+
+
+async def test_sensors(hass: HomeAssistant, mock_stats: AsyncMock) -> None:
+    """Every sensor reads its value from the coordinator's data."""
+    entry = await setup_entry(hass)
+
+    state = hass.states.get(SOLO_KILLS)
+    assert state.state == "20"
+    assert state.attributes["platform"] == "gamepad"
+    assert state.attributes["game_mode"] == "solo"
+    assert state.attributes["stale"] is False
+
+    state = hass.states.get(ALL_KILLS)
+    assert state.state == "35"
+    assert state.attributes["platforms_included"] == ["gamepad", "keyboardMouse"]
+
+    assert hass.states.get(KILLS_PER_HOUR).attributes["player_id"] == "Captain_Crunch88"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_compact_sensors(hass: HomeAssistant, mock_stats: AsyncMock) -> None:
+    """Compact sensors show matches with every stat as attributes."""
+    entry = await setup_entry(hass, **{CONF_COMPACT_ENTITIES: True})
+
+    state = hass.states.get(COMPACT_SOLO)
+    assert state.state == "10"
+    assert state.attributes["eliminations"] == 20
+    assert hass.states.get(SOLO_KILLS) is None
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_entities_are_registered_in_batches(
+    hass: HomeAssistant, mock_stats: AsyncMock
+) -> None:
+    """Entities are added entity_batch_size at a time, the quota sensor last."""
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {CONF_ENTITY_BATCH_SIZE: 25}})
+    with patch.object(
+        EntityPlatform,
+        "async_add_entities",
+        autospec=True,
+        side_effect=EntityPlatform.async_add_entities,
+    ) as async_add_entities:
+        entry = await setup_entry(hass)
+
+    batches = [len(call.args[1]) for call in async_add_entities.call_args_list]
+    # 9 stats for 6 input/modes and 6 aggregates, 3 rates and the quota sensor
+    assert batches == [25, 25, 25, 25, 12]
+    assert async_add_entities.call_args.args[1][-1].entity_id == QUOTA
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_quota_sensor_shows_the_breaker_half_open(
+    hass: HomeAssistant, mock_stats: AsyncMock, freezer: FrozenDateTimeFactory
+) -> None:
+    """The API status leaves open when the breaker does, without new requests."""
+    entry = await setup_entry(hass)
+    async_get_api_client(hass).breaker(STATS_URL).record_failure(retry_after=30)
+    async_dispatcher_send(hass, SIGNAL_QUOTA_UPDATED, quota_key(API_KEY))
+    await hass.async_block_till_done()
+
+    state = hass.states.get(QUOTA)
+    assert state.attributes["api_status"] == "open"
+    assert state.attributes["api_retry_in"] == 30
+
+    freezer.tick(31)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(QUOTA)
+    assert state.attributes["api_status"] == "half_open"
+    assert state.attributes["api_retry_in"] is None
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_long_term_statistics_sensors(
+    recorder_mock: Recorder, hass: HomeAssistant, mock_stats: AsyncMock
+) -> None:
+    """Sensors recording long-term statistics keep their attributes out of the recorder."""
+    entry = await setup_entry(hass, **{CONF_LONG_TERM_STATISTICS: True})
+    await async_wait_recording_done(hass)
+
+    state = hass.states.get(SOLO_KILLS)
+    assert state.attributes["state_class"] == "total_increasing"
+    assert state.attributes["platform"] == "gamepad"
+    assert hass.states.get(KILLS_PER_HOUR).attributes["player_id"] == "Captain_Crunch88"
+
+    recorded = await _recorded_attributes(hass, SOLO_KILLS)
+    assert recorded["stale"] is False
+    assert recorded["state_class"] == "total_increasing"
+    assert "platform" not in recorded
+    assert "data_fetched_at" not in recorded
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_long_term_statistics_compact_sensors(
+    recorder_mock: Recorder, hass: HomeAssistant, mock_stats: AsyncMock
+) -> None:
+    """Compact sensors don't record their stats payload with long-term statistics."""
+    entry = await setup_entry(
+        hass, **{CONF_LONG_TERM_STATISTICS: True, CONF_COMPACT_ENTITIES: True}
+    )
+    await async_wait_recording_done(hass)
+
+    assert hass.states.get(COMPACT_SOLO).attributes["eliminations"] == 20
+    recorded = await _recorded_attributes(hass, COMPACT_SOLO)
+    assert "eliminations" not in recorded
+    assert "player_id" not in recorded
+    assert recorded["stale"] is False
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_detailed_history_records_attributes(
+    recorder_mock: Recorder, hass: HomeAssistant, mock_stats: AsyncMock
+) -> None:
+    """Without long-term statistics every attribute is recorded."""
+    entry = await setup_entry(hass)
+    await async_wait_recording_done(hass)
+
+    recorded = await _recorded_attributes(hass, SOLO_KILLS)
+    assert recorded["platform"] == "gamepad"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def _recorded_attributes(hass: HomeAssistant, entity_id: str) -> dict:
+    """Return the attributes of the last state the recorder wrote for an entity."""
+    states = await get_instance(hass).async_add_executor_job(
+        history.get_significant_states,
+        hass,
+        dt_util.utcnow() - timedelta(hours=1),
+        None,
+        [entity_id],
+    )
+    return dict(states[entity_id][-1].attributes)
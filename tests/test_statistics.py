@@ -0,0 +1,49 @@
+"""Tests for the hourly long-term statistics import."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.fortnite.statistics import async_import_statistics, statistic_id
+
+START = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _data(kills: int) -> dict:
+    """Return transformed data with one played input and mode."""
+    return {
+        "platforms": ["gamepad", "touch"],
+        "game_modes": ["solo"],
+        "gamepad": {"solo": {"kills": kills, "matches": 3}},
+        "touch": None,
+    }
+
+
+async def test_only_changed_counters_are_imported(hass: HomeAssistant) -> None:
+    """Every counter is imported once, then only the ones that changed."""
+    hass.config.components.add("recorder")
+    last_imported: dict[str, float] = {}
+
+    with patch(
+        "custom_components.fortnite.statistics.async_add_external_statistics"
+    ) as add_statistics:
+        assert async_import_statistics(hass, "Player", _data(5), START, last_imported) == 5
+        assert async_import_statistics(hass, "Player", _data(5), START, last_imported) == 0
+        add_statistics.reset_mock()
+        assert async_import_statistics(hass, "Player", _data(8), START, last_imported) == 1
+
+    metadata, rows = add_statistics.call_args.args[1:]
+    assert metadata["statistic_id"] == statistic_id("Player", "gamepad", "solo", "kills")
+    assert metadata["statistic_id"] == "fortnite:player_gamepad_solo_kills"
+    assert rows[0]["sum"] == 8
+    assert last_imported[metadata["statistic_id"]] == 8
+
+
+async def test_nothing_imported_without_recorder(hass: HomeAssistant) -> None:
+    """The import is skipped when the recorder is not loaded."""
+    last_imported: dict[str, float] = {}
+
+    assert async_import_statistics(hass, "Player", _data(5), START, last_imported) == 0
+    assert not last_imported
@@ -0,0 +1,123 @@
+"""Tests for the SQLite stats history."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.fortnite.timeseries import (
+    StatsDatabase,
+    async_get_stats_database,
+    async_record_stats,
+)
+
+COUNTERS = ["kills", "matches"]
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> Iterator[StatsDatabase]:
+    """Return an empty database tracking kills and matches."""
+    database = StatsDatabase(str(tmp_path / "stats.db"), COUNTERS)
+    yield database
+    database.close()
+
+
+def test_only_increases_are_stored(database: StatsDatabase) -> None:
+    """The first row is the baseline, later rows store the increase."""
+    assert database.record("Player", 0, {("gamepad", "solo"): [10, 5]}) == 0
+    assert database.record("Player", 60, {("gamepad", "solo"): [10, 5]}) == 0
+    assert database.record("Player", 120, {("gamepad", "solo"): [14, 6]}) == 1
+
+    assert database.query(0, 200) == {
+        "player": [{"start": 0, "end": 200, "kills": 4, "matches": 1}]
+    }
+
+
+def test_stats_reset_starts_a_new_baseline(database: StatsDatabase) -> None:
+    """A counter going down writes no negative delta."""
+    database.record("player", 0, {("gamepad", "solo"): [10, 5]})
+    assert database.record("player", 60, {("gamepad", "solo"): [0, 0]}) == 0
+    assert database.record("player", 120, {("gamepad", "solo"): [3, 1]}) == 1
+
+    assert database.query(0, 200)["player"][0]["kills"] == 3
+
+
+def test_older_snapshots_are_ignored(database: StatsDatabase) -> None:
+    """A snapshot older than the stored one is not applied."""
+    database.record("player", 100, {("gamepad", "solo"): [10, 5]})
+
+    assert database.record("player", 50, {("gamepad", "solo"): [20, 6]}) == 0
+    assert database.query(0, 200) == {}
+
+
+def test_query_buckets_and_filters(database: StatsDatabase) -> None:
+    """Increases are summed per bucket, filtered by player, input and mode."""
+    database.record("a", 0, {("gamepad", "solo"): [0, 0], ("touch", "duo"): [0, 0]})
+    database.record("b", 0, {("gamepad", "solo"): [0, 0]})
+    database.record("a", 10, {("gamepad", "solo"): [2, 1], ("touch", "duo"): [1, 1]})
+    database.record("a", 70, {("gamepad", "solo"): [5, 2]})
+    database.record("b", 70, {("gamepad", "solo"): [9, 9]})
+
+    result = database.query(0, 120, bucket=60, players=["A"], inputs=["gamepad"])
+
+    assert result == {
+        "a": [
+            {"start": 0, "end": 60, "kills": 2, "matches": 1},
+            {"start": 60, "end": 120, "kills": 3, "matches": 1},
+        ]
+    }
+    assert database.query(0, 120, modes=["duo"])["a"][0]["kills"] == 1
+
+
+def test_all_inputs_is_not_summed_with_the_inputs_it_totals(
+    database: StatsDatabase,
+) -> None:
+    """One match recorded under "all" and its real input counts once."""
+    baseline = {("all", "solo"): [0, 0], ("gamepad", "solo"): [0, 0]}
+    database.record("a", 0, baseline)
+    database.record("a", 60, {("all", "solo"): [3, 1], ("gamepad", "solo"): [3, 1]})
+    database.record("b", 0, {("all", "solo"): [0, 0]})
+    database.record("b", 60, {("all", "solo"): [2, 1]})
+
+    result = database.query(0, 120)
+    assert result["a"][0]["kills"] == 3
+    assert result["a"][0]["matches"] == 1
+    # Without another input on record, "all" is all there is
+    assert result["b"][0]["kills"] == 2
+
+    assert database.query(0, 120, inputs=["all", "gamepad"])["a"][0]["kills"] == 3
+    assert database.query(0, 120, inputs=["all"])["a"][0]["kills"] == 3
+    assert database.query(0, 120, inputs=["touch"]) == {}
+
+
+def test_iter_changes_in_chunks(database: StatsDatabase) -> None:
+    """Changes are read back in index order, a chunk at a time."""
+    database.record("a", 0, {("gamepad", "solo"): [0, 0]})
+    for step in range(1, 6):
+        database.record("a", step, {("gamepad", "solo"): [step, step]})
+
+    chunks = list(database.iter_changes(0, 10, chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[0][0] == ("a", "gamepad", "solo", 1.0, 1, 1)
+
+
+async def test_record_transformed_data(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Coordinator data is written for the configured inputs and modes."""
+    hass.config.config_dir = str(tmp_path)
+    data = {
+        "platforms": ["gamepad", "keyboardMouse"],
+        "game_modes": ["solo", "duo"],
+        "gamepad": {"solo": {"kills": 1, "matches": 1}, "duo": None},
+        "keyboardMouse": None,
+    }
+    await async_record_stats(hass, "player", 0, data)
+    data["gamepad"]["solo"] = {"kills": 3, "matches": 2}
+    await async_record_stats(hass, "player", 60, data)
+
+    database = async_get_stats_database(hass)
+    result = await hass.async_add_executor_job(database.query, 0, 100)
+    assert result["player"][0]["kills"] == 2
+    await hass.async_add_executor_job(database.close)